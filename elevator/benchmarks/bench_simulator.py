@@ -0,0 +1,317 @@
+"""
+Scaling benchmarks for the simulator hot paths
+
+Times simulate_elevator_system, LoadBalancer.assign_elevator, validate_config and
+parse_logs_to_csv as floors, elevators, capacity and passengers grow, and writes the
+results as JSON so runs can be compared across commits.
+
+    python -m benchmarks.bench_simulator --scale quick
+    python -m benchmarks.bench_simulator --scale full
+    python -m benchmarks.bench_simulator --compare old.json new.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from elevator.elevator_system.passenger import Passenger
+from elevator.elevator_system.simulate_elevator import (
+    ElevatorSimulation,
+    simulate_elevator_system,
+)
+from utils.get_logger import LOG_VERBOSITY, close_logger, get_logger
+from utils.summary_table import parse_logs_to_csv
+from utils.traffic_generator import generate_traffic
+from utils.utils import split_zones
+from run_config import simulation_config
+from validations.config_validation import validate_config
+
+logger = logging.getLogger("ElevatorLogger")
+
+# Cases grow from the sample config up to production sized towers
+BENCHMARK_CASES: Dict[str, List[Dict[str, Any]]] = {
+    "quick": [
+        {
+            "name": "sample",
+            "floors": 60,
+            "elevators": 3,
+            "capacity": 4,
+            "passengers": None,
+        },
+        {
+            "name": "60f_3e_1k",
+            "floors": 60,
+            "elevators": 3,
+            "capacity": 4,
+            "passengers": 1_000,
+            "rate": 0.05,
+        },
+        {
+            "name": "120f_8e_5k",
+            "floors": 120,
+            "elevators": 8,
+            "capacity": 8,
+            "passengers": 5_000,
+            "rate": 0.2,
+        },
+    ],
+    "full": [
+        {
+            "name": "200f_24e_100k",
+            "floors": 200,
+            "elevators": 24,
+            "capacity": 12,
+            "passengers": 100_000,
+            "rate": 1.0,
+        },
+        {
+            "name": "300f_32e_1m",
+            "floors": 300,
+            "elevators": 32,
+            "capacity": 16,
+            "passengers": 1_000_000,
+            "rate": 2.0,
+        },
+    ],
+}
+# Log parsing needs a full DEBUG log of the run, only done for cases up to this many passengers
+PARSE_LOGS_MAX_PASSENGERS = 5_000
+ASSIGN_CALLS = 2_000
+
+
+def build_case_config(case: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the simulation config of a benchmark case, the sample case is simulation_config itself
+    """
+    if case["passengers"] is None:
+        return dict(simulation_config)
+    zone_map = split_zones(1, case["floors"], case["elevators"])
+    requests = list(
+        generate_traffic(
+            case.get("pattern", "lunch"),
+            zone_map,
+            rate=case["rate"],
+            seed=case.get("seed", 1),
+            count=case["passengers"],
+        )
+    )
+    duration = requests[-1][0] + 1 if requests else 1
+    return {
+        "default_zone_mapping": zone_map,
+        "passenger_requests": requests,
+        "max_time": case.get("max_time", duration * 4),
+        "max_capacity": case["capacity"],
+        "time_advance": case.get("time_advance", "tick"),
+    }
+
+
+def bench_simulate(case: Dict[str, Any], sim_config: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    simulation = simulate_elevator_system(
+        sim_config["passenger_requests"],
+        sim_config["default_zone_mapping"],
+        sim_config["max_time"],
+        sim_config.get("time_advance", "tick"),
+        max_capacity=sim_config["max_capacity"],
+    )
+    seconds = time.perf_counter() - start
+    ticks = simulation.current_time + 1
+    served = sum(1 for p in simulation.passengers if p.exit_time is not None)
+    return {
+        "benchmark": "simulate_elevator_system",
+        "seconds": seconds,
+        "ticks": ticks,
+        "served": served,
+        "ticks_per_sec": ticks / seconds,
+        "passengers_per_sec": served / seconds,
+    }
+
+
+def bench_assign(case: Dict[str, Any], sim_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Time assign_elevator alone, against the state of a run half way through its requests
+    """
+    requests = sim_config["passenger_requests"]
+    simulation = ElevatorSimulation(
+        requests,
+        sim_config["default_zone_mapping"],
+        max_capacity=sim_config["max_capacity"],
+    )
+    halfway = requests[len(requests) // 2][0] if requests else 0
+    for current_time in range(halfway + 1):
+        simulation.tick(current_time)
+    probes = [Passenger(*req) for req in requests[: min(len(requests), 100)]]
+    for p in probes:
+        # Skip the one-off "No available elevator" debug log
+        p.no_assigned_elevator_logging = True
+
+    start = time.perf_counter()
+    for i in range(ASSIGN_CALLS):
+        simulation.load_balancer.assign_elevator(
+            probes[i % len(probes)], simulation.waiting_room
+        )
+    seconds = time.perf_counter() - start
+    return {
+        "benchmark": "assign_elevator",
+        "seconds": seconds,
+        "calls": ASSIGN_CALLS,
+        "waiting": len(simulation.waiting_room),
+        "calls_per_sec": ASSIGN_CALLS / seconds,
+    }
+
+
+def bench_validate(case: Dict[str, Any], sim_config: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    validate_config(sim_config)
+    seconds = time.perf_counter() - start
+    passengers = len(sim_config["passenger_requests"])
+    return {
+        "benchmark": "validate_config",
+        "seconds": seconds,
+        "passengers": passengers,
+        "passengers_per_sec": passengers / seconds,
+    }
+
+
+def bench_parse_logs(
+    case: Dict[str, Any], sim_config: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Time parse_logs_to_csv on the full log of the case, the run producing the log is not timed
+    """
+    if len(sim_config["passenger_requests"]) > PARSE_LOGS_MAX_PASSENGERS:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "simulation_logs.txt")
+        # parse_logs_to_csv only reads the event lines
+        get_logger(log_path=log_path, verbosity="events")
+        simulate_elevator_system(
+            sim_config["passenger_requests"],
+            sim_config["default_zone_mapping"],
+            sim_config["max_time"],
+            max_capacity=sim_config["max_capacity"],
+        )
+        close_logger()
+        logger.setLevel(LOG_VERBOSITY["off"])
+
+        start = time.perf_counter()
+        parse_logs_to_csv(
+            log_path, os.path.join(tmp, "summary.csv"), sim_config["passenger_requests"]
+        )
+        seconds = time.perf_counter() - start
+        log_bytes = os.path.getsize(log_path)
+    passengers = len(sim_config["passenger_requests"])
+    return {
+        "benchmark": "parse_logs_to_csv",
+        "seconds": seconds,
+        "log_bytes": log_bytes,
+        "passengers_per_sec": passengers / seconds,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scale: str) -> Dict[str, Any]:
+    """
+    Run every benchmark of the cases up to the given scale
+
+    :param scale: "quick" for the small cases, "full" to also run the production sized ones
+    :return: Run metadata and one result per benchmark and case
+    """
+    cases = BENCHMARK_CASES["quick"]
+    if scale == "full":
+        cases = cases + BENCHMARK_CASES["full"]
+
+    # Simulation logging is switched off while timing, only parse_logs_to_csv needs a log
+    close_logger()
+    logger.setLevel(LOG_VERBOSITY["off"])
+
+    results: List[Dict[str, Any]] = []
+    for case in cases:
+        sim_config = build_case_config(case)
+        case_info = {
+            "case": case["name"],
+            "floors": case["floors"],
+            "elevators": len(sim_config["default_zone_mapping"]),
+            "capacity": sim_config["max_capacity"],
+            "passengers": len(sim_config["passenger_requests"]),
+        }
+        for bench in (bench_validate, bench_assign, bench_simulate, bench_parse_logs):
+            result = bench(case, sim_config)
+            if result is None:
+                continue
+            result.update(case_info)
+            results.append(result)
+            print(
+                f"{case['name']:>16} {result['benchmark']:>26} {result['seconds']:10.4f}s"
+            )
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare_results(old_path: str, new_path: str) -> None:
+    """
+    Print the speedup of every benchmark present in both result files
+    """
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    old_seconds = {(r["benchmark"], r["case"]): r["seconds"] for r in old["results"]}
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for r in new["results"]:
+        key = (r["benchmark"], r["case"])
+        if key in old_seconds:
+            print(
+                f"{r['case']:>16} {r['benchmark']:>26} {old_seconds[key]:10.4f}s -> {r['seconds']:10.4f}s"
+                f"  x{old_seconds[key] / r['seconds']:.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Elevator simulator benchmarks")
+    parser.add_argument("--scale", choices=["quick", "full"], default="quick")
+    parser.add_argument("--output", help="JSON results path")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    report = run_benchmarks(args.scale)
+    output = args.output or os.path.join(
+        "benchmarks",
+        "results",
+        f"bench_{report['commit'] or 'local'}_{args.scale}.json",
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import csv
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from elevator.elevator_system.passenger import PassengerTable
+from elevator.elevator_system.shared_results import (
+    prepare_shared_results,
+    read_shared_table,
+    write_shared_table,
+)
+from elevator.elevator_system.simulate_elevator import simulate_elevator_system
+from utils.get_logger import close_logger, get_logger
+from utils.summary_table import summarize_passengers, summary_stats, write_summary_csv
+from utils.traffic_generator import generate_traffic
+from run_config import campus_config, run_config
+from validations.config_validation import validate_config
+
+logger = logging.getLogger("ElevatorLogger")
+
+RESULT_FIELDS = [
+    "building",
+    "elevators",
+    "passengers",
+    "served",
+    "wait_min",
+    "wait_max",
+    "wait_mean",
+    "total_min",
+    "total_max",
+    "total_mean",
+    "elapsed_seconds",
+    "error",
+]
+
+
+def building_requests(building: Dict[str, Any]):
+    """
+    Passenger requests of a building: its request file, its synthetic traffic or its request list
+    """
+    if building.get("passenger_requests_path") is not None:
+        return building["passenger_requests_path"]
+    if building.get("traffic"):
+        return generate_traffic(
+            zone_mapping=building["default_zone_mapping"], **building["traffic"]
+        )
+    return building["passenger_requests"]
+
+
+def run_building(
+    name: str, building: Dict[str, Any], campus: Dict[str, Any], output_dir: str
+) -> Dict[str, Any]:
+    """
+    Simulate a single building, runs inside a worker process
+    The passengers are handed back in a shared memory block, see shared_results.py
+
+    :param name: Building name
+    :param building: Building config, see campus_config in run_config
+    :param campus: Campus config, for the settings shared by every building
+    :param output_dir: Directory for the building logs
+    :return: Building name, shared memory block name (None on error), elapsed seconds and error
+    """
+    building_logger = get_logger(
+        log_path=os.path.join(output_dir, "logs", f"{name}.txt"),
+        verbosity=campus.get("log_verbosity", "off"),
+    )
+    result = {"building": name, "block": None, "elapsed_seconds": None, "error": None}
+    try:
+        sim_config = {
+            "passenger_requests": [],
+            "max_time": campus["max_time"],
+            "time_advance": campus.get("time_advance", "tick"),
+            **building,
+        }
+        validate_config(sim_config)
+
+        start = time.perf_counter()
+        simulation = simulate_elevator_system(
+            building_requests(sim_config),
+            sim_config["default_zone_mapping"],
+            sim_config["max_time"],
+            sim_config["time_advance"],
+            max_capacity=building.get("max_capacity"),
+            assignment=sim_config.get("assignment", "greedy"),
+        )
+        result["elapsed_seconds"] = round(time.perf_counter() - start, 4)
+        result["block"] = write_shared_table(simulation.passengers)
+    except Exception as e:
+        building_logger.exception(e)
+        result["error"] = repr(e)
+    finally:
+        close_logger()
+    return result
+
+
+def run_campus(
+    campus: Dict[str, Any], output_dir: str
+) -> Tuple[List[Dict[str, Any]], Dict[str, PassengerTable]]:
+    """
+    Simulate every building of the campus over a process pool, each worker returns its
+    passengers through shared memory, and write the merged results
+
+    Writes campus_results.csv (one row per building and a campus row) and
+    campus_summary.csv (every passenger, ids prefixed with the building name) to output_dir
+
+    :param campus: Campus configuration, see campus_config in run_config
+    :param output_dir: Directory for the results and the per building logs
+    :return: Rows of the results table and the passengers of each building
+    """
+    os.makedirs(os.path.join(output_dir, "logs"), exist_ok=True)
+    buildings = campus["buildings"]
+    logger.info("Simulating %s buildings", len(buildings))
+
+    prepare_shared_results()
+    rows: List[Dict[str, Any]] = []
+    tables: Dict[str, PassengerTable] = {}
+    with ProcessPoolExecutor(max_workers=campus.get("workers")) as executor:
+        results = executor.map(
+            run_building,
+            list(buildings),
+            list(buildings.values()),
+            [campus] * len(buildings),
+            [output_dir] * len(buildings),
+        )
+        for result in results:
+            row = {field: result.get(field) for field in RESULT_FIELDS}
+            zone_map = buildings[result["building"]]["default_zone_mapping"]
+            row["elevators"] = len(zone_map)
+            if result["block"] is not None:
+                table = tables[result["building"]] = read_shared_table(result["block"])
+                passenger_data = summarize_passengers(table)
+                row.update(summary_stats(passenger_data))
+                row["passengers"] = len(table)
+                row["served"] = sum(1 for t in table.exit_time if t >= 0)
+            rows.append(row)
+
+    campus_data: Dict[str, Dict[str, Any]] = {}
+    for name, table in tables.items():
+        for pid, pdata in summarize_passengers(table).items():
+            pdata["passenger_id"] = f"{name}/{pid}"
+            campus_data[pdata["passenger_id"]] = pdata
+    campus_row = {"building": "campus", "elevators": sum(r["elevators"] for r in rows)}
+    campus_row.update(
+        write_summary_csv(campus_data, os.path.join(output_dir, "campus_summary.csv"))
+    )
+    campus_row["passengers"] = len(campus_data)
+    campus_row["served"] = sum(r["served"] or 0 for r in rows)
+    rows.append(campus_row)
+
+    results_csv = os.path.join(output_dir, "campus_results.csv")
+    with open(results_csv, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+    logger.info("Campus results written to %s", results_csv)
+    return rows, tables
+
+
+def main():
+    output_dir = run_config["campus_output_dir"]
+    os.makedirs(output_dir, exist_ok=True)
+    campus_logger = get_logger(log_path=os.path.join(output_dir, "campus_logs.txt"))
+    try:
+        run_campus(campus_config, output_dir)
+    except Exception as e:
+        campus_logger.exception(e)
+    finally:
+        close_logger()
+
+
+if __name__ == "__main__":
+    main()
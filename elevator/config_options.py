@@ -0,0 +1,12 @@
+"""
+Allowed values of the simulation_config options, shared by the config validation and the modules
+implementing the options, so that validating a config does not import the engine or the output writers
+"""
+
+# "csv" writes the passenger summary CSV, "parquet" the typed passenger table (and telemetry)
+OUTPUT_FORMATS = ("csv", "parquet")
+# "home" parks idle elevators at the bottom of their zone, "demand" where the recent calls are
+PARKING_STRATEGIES = ("home", "demand")
+# "static" keeps the zones of the zone map (only expanded by Elevator.adjust_zone),
+# "adaptive" moves the zone boundaries with the recent demand
+ZONING_MODES = ("static", "adaptive")
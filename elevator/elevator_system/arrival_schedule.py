@@ -0,0 +1,119 @@
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from elevator.elevator_system.passenger import Passenger, PassengerTable
+
+
+class ArrivalSchedule:
+    def __init__(self, requests: Iterable[tuple]) -> None:
+        """
+        :param requests: A list of requests, sorted here once by time, or any other
+            iterable of requests already in time order, read lazily as time advances
+        """
+        # Every passenger read so far, one row each in request order
+        self.passengers: PassengerTable = PassengerTable()
+        # Rows sorted by arrival time
+        self.pending: array = array("q")
+        self.cursor: int = 0
+        self._stream: Optional[Iterator[tuple]] = None
+        self._lookahead: Optional[int] = None
+        # Requests read from the stream so far and the arrival time of the last one, the table also
+        # holds the passengers added by ElevatorSimulation.add_call
+        self.stream_rows: int = 0
+        self._stream_time: Optional[int] = None
+        # Set on a schedule restored from a checkpoint taken while its stream was still being read
+        self.stream_detached: bool = False
+
+        if isinstance(requests, (list, tuple)):
+            for req in requests:
+                self.passengers.add(*req)
+            # Stable sort keeps the request order for passengers arriving on the same tick
+            self.pending = array(
+                "q",
+                sorted(
+                    range(len(self.passengers)),
+                    key=self.passengers.arrival_time.__getitem__,
+                ),
+            )
+        else:
+            self._stream = iter(requests)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # Streams cannot be pickled, attach_stream reopens them at the same position
+        state["_stream"] = None
+        state["stream_detached"] = self._stream is not None
+        return state
+
+    def attach_stream(self, requests: Iterable[tuple]) -> None:
+        """
+        Continue reading a request stream after restoring a checkpoint
+
+        :param requests: The same requests the schedule was created with, the ones
+            already read before the checkpoint are skipped
+        """
+        self._stream = islice(iter(requests), self.stream_rows, None)
+        self.stream_detached = False
+
+    def _peek(self) -> Optional[int]:
+        """
+        Row of the next passenger not yet returned, reading one request ahead from a stream
+        """
+        if self._stream is None:
+            if self.cursor < len(self.pending):
+                return self.pending[self.cursor]
+            return None
+        if self._lookahead is None:
+            if self.stream_detached:
+                raise ValueError(
+                    "The request stream of a restored checkpoint must be attached before resuming"
+                )
+            req = next(self._stream, None)
+            if req is None:
+                self._stream = None
+                return None
+            if self._stream_time is not None and req[0] < self._stream_time:
+                raise ValueError(
+                    f"Passenger request {req[1]} is out of time order, request streams must be sorted by time"
+                )
+            self._stream_time = req[0]
+            self.stream_rows += 1
+            self._lookahead = self.passengers.add(*req)
+        return self._lookahead
+
+    def _pop(self) -> None:
+        if self._lookahead is not None:
+            self._lookahead = None
+        else:
+            self.cursor += 1
+
+    def pop_arrivals(self, current_time: int) -> List[Passenger]:
+        """
+        Return the passengers arriving at current_time and move the cursor past them
+        Passengers scheduled before current_time were never reached and are dropped, same as the tick loop
+
+        :param current_time: Time of the step
+        """
+        arrivals: List[Passenger] = []
+        arrival_times = self.passengers.arrival_time
+        row = self._peek()
+        while row is not None and arrival_times[row] <= current_time:
+            if arrival_times[row] == current_time:
+                arrivals.append(self.passengers.view(row))
+            self._pop()
+            row = self._peek()
+        return arrivals
+
+    def next_arrival_time(self) -> Optional[int]:
+        """
+        Arrival time of the next passenger not yet returned, None when the schedule is exhausted
+        """
+        row = self._peek()
+        return self.passengers.arrival_time[row] if row is not None else None
+
+    def exhausted(self) -> bool:
+        """
+        Checks whether every passenger has been returned
+        """
+        return self._peek() is None
@@ -0,0 +1,393 @@
+import logging
+from typing import Any, Dict, List, Set, Tuple
+
+from elevator.elevator_system.elevator import (
+    DOWN,
+    DROPPING_OFF,
+    IDLE,
+    LOADING,
+    MOVING_TO_PICKUP,
+    UP,
+    Elevator,
+    RouteQueue,
+)
+from elevator.elevator_system.load_balancer import LoadBalancer
+from elevator.elevator_system.passenger import Passenger, PassengerTable
+from elevator.elevator_system.waiting_room import WaitingRoom
+from elevator.run_config import simulation_config
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required by the batch engine
+    np = None
+
+logger = logging.getLogger("ElevatorLogger")
+
+
+class CarView:
+    """
+    Elevator-like view over one car of the batch engine
+
+    Exposes the attributes LoadBalancer and WaitingRoom read from an Elevator,
+    so assignment and zone logic run unchanged on top of the engine arrays
+    """
+
+    def __init__(
+        self,
+        engine: "BatchElevatorEngine",
+        idx: int,
+        eid: int,
+        zone_start: int,
+        zone_end: int,
+        capacity: int,
+    ) -> None:
+        self.engine: BatchElevatorEngine = engine
+        self.idx: int = idx
+        self.eid: int = eid
+        self.zone_start: int = zone_start
+        self.zone_end: int = zone_end
+        self.capacity: int = capacity
+        self.passengers: List[Passenger] = []
+
+    can_accept = Elevator.can_accept
+    adjust_zone = Elevator.adjust_zone
+
+    @property
+    def state(self) -> int:
+        return int(self.engine.state[self.idx])
+
+    @property
+    def direction(self) -> int:
+        return int(self.engine.direction[self.idx])
+
+    @property
+    def current_floor(self) -> int:
+        return int(self.engine.floor[self.idx]) + self.engine.base_floor
+
+    @property
+    def original_floor(self) -> int:
+        return int(self.engine.home[self.idx]) + self.engine.base_floor
+
+    @property
+    def pickups(self) -> RouteQueue:
+        return RouteQueue(self.engine.stops(self.engine.pickups, self.idx))
+
+    @property
+    def destinations(self) -> RouteQueue:
+        return RouteQueue(self.engine.stops(self.engine.destinations, self.idx))
+
+    def update_route(self, new_source: int, new_dest: int) -> None:
+        """
+        Same as Elevator.update_route, on the engine route bitmaps
+        """
+        engine = self.engine
+        if engine.state[self.idx] == IDLE:
+            engine.direction[self.idx] = (
+                UP if new_source >= self.current_floor else DOWN
+            )
+        if engine.direction[self.idx] != 0:
+            engine.pickups[self.idx, new_source - engine.base_floor] = True
+        engine.destinations[self.idx, new_dest - engine.base_floor] = True
+        if engine.pickups[self.idx].any():
+            engine.state[self.idx] = MOVING_TO_PICKUP
+
+
+class BatchBuilding:
+    def __init__(
+        self, bid: int, passengers: PassengerTable, cars: List[CarView]
+    ) -> None:
+        self.bid: int = bid
+        self.passengers: PassengerTable = passengers
+        self.cars: List[CarView] = cars
+        self.cars_by_eid: Dict[int, CarView] = {car.eid: car for car in cars}
+        self.waiting_room: WaitingRoom = WaitingRoom()
+        self.load_balancer: LoadBalancer = LoadBalancer(cars)
+        self.remaining: int = len(passengers)
+
+
+class BatchElevatorEngine:
+    """
+    Simulates many independent buildings at once
+
+    The car state of every building (floor, state code, direction, load, pickup and
+    destination stops) lives in flat NumPy arrays and every car is advanced with
+    vectorized operations on each tick, following the same rules as Elevator.move and
+    the boarding transitions of the simulation loop. Work that only concerns a few
+    passengers (assignment, boarding, drop-offs) runs per building in Python.
+    """
+
+    def __init__(self, buildings: List[Dict[str, Any]]) -> None:
+        """
+        :param buildings: One config per building, with the "default_zone_mapping" and
+            "passenger_requests" keys of simulation_config and an optional "max_capacity"
+        """
+        if np is None:
+            raise ImportError("numpy is required to use the batch elevator engine")
+
+        floors = [
+            floor
+            for building in buildings
+            for zone in building["default_zone_mapping"].values()
+            for floor in zone
+        ]
+        floors += [
+            floor
+            for building in buildings
+            for req in building["passenger_requests"]
+            for floor in req[2:]
+        ]
+        self.base_floor: int = min(floors) if floors else 0
+        num_floors = (max(floors) - self.base_floor + 1) if floors else 1
+
+        homes: List[int] = []
+        self.cars: List[CarView] = []
+        self.car_building: List[int] = []
+        self.buildings: List[BatchBuilding] = []
+        # (arrival time, building id, passenger row)
+        arrivals: List[Tuple[int, int, int]] = []
+        for bid, building in enumerate(buildings):
+            capacity = building.get("max_capacity", simulation_config["max_capacity"])
+            cars = []
+            for eid, zone in building["default_zone_mapping"].items():
+                car = CarView(self, len(self.cars), eid, zone[0], zone[-1], capacity)
+                homes.append(zone[0] - self.base_floor)
+                self.cars.append(car)
+                self.car_building.append(bid)
+                cars.append(car)
+            passengers = PassengerTable()
+            for req in building["passenger_requests"]:
+                arrivals.append((req[0], bid, passengers.add(*req)))
+            self.buildings.append(BatchBuilding(bid, passengers, cars))
+
+        num_cars = len(self.cars)
+        self.home = np.array(homes, dtype=np.int64)
+        self.floor = self.home.copy()
+        self.state = np.full(num_cars, IDLE, dtype=np.int8)
+        self.direction = np.zeros(num_cars, dtype=np.int8)
+        self.load = np.zeros(num_cars, dtype=np.int64)
+        self.waiting = np.zeros(num_cars, dtype=np.int64)
+        self.pickups = np.zeros((num_cars, num_floors), dtype=bool)
+        self.destinations = np.zeros((num_cars, num_floors), dtype=bool)
+        self.active = np.ones(num_cars, dtype=bool)
+
+        # Stable sort keeps the request order for passengers arriving on the same tick
+        arrivals.sort(key=lambda item: item[0])
+        self.arrivals: List[Tuple[int, int, int]] = arrivals
+        self.cursor: int = 0
+        self.unassigned_buildings: Set[int] = set()
+        self.active_buildings: int = len(self.buildings)
+        for building in self.buildings:
+            if building.remaining == 0:
+                self._finish(building)
+
+    def stops(self, bitmap: "np.ndarray", idx: int) -> List[int]:
+        """
+        Floors flagged for the car in a pickups/destinations bitmap, in ascending order
+        """
+        return (np.flatnonzero(bitmap[idx]) + self.base_floor).tolist()
+
+    def run(self, max_time: int) -> List[PassengerTable]:
+        """
+        Run every building until all its passengers have exited or max_time is reached
+
+        :param max_time: Max time for the simulation
+        :return: Passengers of each building, in request order
+        """
+        for current_time in range(max_time):
+            if not self.active_buildings:
+                break
+            self.step(current_time)
+        return [building.passengers for building in self.buildings]
+
+    def step(self, current_time: int) -> None:
+        """
+        Run a single time step for every building
+
+        :param current_time: Time of the step
+        """
+        self._arrive(current_time)
+        self._assign()
+        self._idle_pickups()
+        self._board(current_time)
+        self._move(current_time)
+
+    def _arrive(self, current_time: int) -> None:
+        arrivals = self.arrivals
+        while self.cursor < len(arrivals) and arrivals[self.cursor][0] <= current_time:
+            arrival_time, bid, row = arrivals[self.cursor]
+            self.cursor += 1
+            if arrival_time == current_time:
+                building = self.buildings[bid]
+                building.waiting_room.add(building.passengers.view(row))
+                self.unassigned_buildings.add(bid)
+
+    def _assign(self) -> None:
+        for bid in list(self.unassigned_buildings):
+            building = self.buildings[bid]
+            waiting_room = building.waiting_room
+            assigned_any = False
+            for passenger in waiting_room.unassigned():
+                car = building.load_balancer.assign_elevator(passenger, waiting_room)
+                if car:
+                    passenger.is_assigned = True
+                    passenger.assigned_elevator = car.eid
+                    waiting_room.assign(passenger, car.eid)
+                    car.update_route(passenger.source, passenger.dest)
+                    if self.state[car.idx] == IDLE:
+                        self.state[car.idx] = MOVING_TO_PICKUP
+                    self.waiting[car.idx] += 1
+                    assigned_any = True
+            if not waiting_room.unassigned_count():
+                self.unassigned_buildings.discard(bid)
+            # Zones only ever grow to cover waiting passengers, so they can only change
+            # after new assignments
+            if assigned_any:
+                zones_changed = False
+                for car in building.cars:
+                    zones_changed |= car.adjust_zone(waiting_room)
+                if zones_changed:
+                    building.load_balancer.rebuild_zones()
+
+    def _idle_pickups(self) -> None:
+        waiting_idle = np.flatnonzero(
+            self.active & (self.state == IDLE) & (self.waiting > 0)
+        )
+        for idx in waiting_idle.tolist():
+            car = self.cars[idx]
+            waiting_room = self.buildings[self.car_building[idx]].waiting_room
+            current_floor = car.current_floor
+            pickup_floor = waiting_room.nearest_source(car.eid, current_floor)
+            if not self.pickups[idx, pickup_floor - self.base_floor]:
+                self.pickups[idx, pickup_floor - self.base_floor] = True
+                if self.direction[idx] == 0:
+                    self.direction[idx] = UP if pickup_floor >= current_floor else DOWN
+            self.state[idx] = MOVING_TO_PICKUP
+
+    def _board(self, current_time: int) -> None:
+        loading = np.flatnonzero(self.active & (self.state == LOADING))
+        if not len(loading):
+            return
+        for idx in loading.tolist():
+            car = self.cars[idx]
+            waiting_room = self.buildings[self.car_building[idx]].waiting_room
+            boarding = waiting_room.board(
+                car.eid, car.current_floor, car.capacity - len(car.passengers)
+            )
+            for p in boarding:
+                p.board_time = current_time
+            car.passengers.extend(boarding)
+            self.waiting[idx] -= len(boarding)
+            self.load[idx] = len(car.passengers)
+
+        current = self.floor[loading]
+        pickups = self.pickups[loading]
+        destinations = self.destinations[loading]
+        has_pickups = pickups.any(axis=1)
+        has_destinations = destinations.any(axis=1)
+        dropping = ~has_pickups & (has_destinations | (self.load[loading] > 0))
+        # all(current < p for p in pickups) holds when the lowest stop is above the car,
+        # an empty destination list counts as above, same as all() on an empty list
+        pickup_direction = np.where(np.argmax(pickups, axis=1) > current, UP, DOWN)
+        destination_direction = np.where(
+            ~has_destinations | (np.argmax(destinations, axis=1) > current), UP, DOWN
+        )
+        self.state[loading] = np.where(
+            has_pickups, MOVING_TO_PICKUP, np.where(dropping, DROPPING_OFF, IDLE)
+        )
+        self.direction[loading] = np.where(
+            has_pickups,
+            pickup_direction,
+            np.where(dropping, destination_direction, self.direction[loading]),
+        )
+
+    def _move(self, current_time: int) -> None:
+        state = self.state.copy()
+        active = self.active
+        pickups = self.pickups
+        destinations = self.destinations
+        last = pickups.shape[1] - 1
+
+        has_pickups = pickups.any(axis=1)
+        has_destinations = destinations.any(axis=1)
+        lowest_pickup = np.argmax(pickups, axis=1)
+        highest_pickup = last - np.argmax(pickups[:, ::-1], axis=1)
+        lowest_destination = np.argmax(destinations, axis=1)
+        highest_destination = last - np.argmax(destinations[:, ::-1], axis=1)
+        up = self.direction == UP
+
+        pickup_target = np.where(
+            up | (has_destinations & (lowest_destination < lowest_pickup)),
+            highest_pickup,
+            lowest_pickup,
+        )
+        destination_target = np.where(up, lowest_destination, highest_destination)
+        target = np.where(
+            state == IDLE,
+            self.home,
+            np.where(state == MOVING_TO_PICKUP, pickup_target, destination_target),
+        )
+        travelling = active & (
+            (state == IDLE)
+            | ((state == MOVING_TO_PICKUP) & has_pickups)
+            | ((state == DROPPING_OFF) & has_destinations)
+        )
+        step = np.sign(target - self.floor) * travelling
+        self.floor += step
+        at_target = travelling & (step == 0)
+
+        arrived_pickup = np.flatnonzero(at_target & (state == MOVING_TO_PICKUP))
+        self.state[arrived_pickup] = LOADING
+        pickups[arrived_pickup, target[arrived_pickup]] = False
+
+        loading = active & (state == LOADING)
+        self.state[loading] = np.where(
+            has_destinations[loading],
+            DROPPING_OFF,
+            np.where(has_pickups[loading], MOVING_TO_PICKUP, IDLE),
+        )
+
+        emptied = active & (state == DROPPING_OFF) & ~has_destinations
+        self.state[emptied] = np.where(has_pickups[emptied], MOVING_TO_PICKUP, IDLE)
+        self.direction[emptied & ~has_pickups] = 0
+
+        arrived_destination = np.flatnonzero(at_target & (state == DROPPING_OFF))
+        destinations[arrived_destination, target[arrived_destination]] = False
+        for idx in arrived_destination.tolist():
+            self._drop_off(idx, current_time)
+
+    def _drop_off(self, idx: int, current_time: int) -> None:
+        car = self.cars[idx]
+        current_floor = car.current_floor
+        dropped = [p for p in car.passengers if p.dest == current_floor]
+        if not dropped:
+            return
+        for p in dropped:
+            p.exit_time = current_time
+        car.passengers = [p for p in car.passengers if p.dest != current_floor]
+        self.load[idx] = len(car.passengers)
+        building = self.buildings[self.car_building[idx]]
+        building.remaining -= len(dropped)
+        if building.remaining == 0:
+            self._finish(building)
+
+    def _finish(self, building: BatchBuilding) -> None:
+        """
+        A building stops as soon as all its passengers have exited, same as the single building loop
+        """
+        for car in building.cars:
+            self.active[car.idx] = False
+        self.active_buildings -= 1
+
+
+def simulate_buildings_batched(
+    buildings: List[Dict[str, Any]], max_time: int
+) -> List[PassengerTable]:
+    """
+    Function to simulate many independent buildings with the vectorized batch engine
+
+    :param buildings: One config per building, with the "default_zone_mapping" and
+        "passenger_requests" keys of simulation_config and an optional "max_capacity"
+    :param max_time: Max time for the simulation
+    :return: Passengers of each building with their assignment, boarding and exit times
+    """
+    return BatchElevatorEngine(buildings).run(max_time)
@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+
+class CallWindow:
+    """
+    Number of calls of every floor over a sliding window of ticks, replanned on a fixed schedule
+
+    Every call is counted by pickup floor, the counts are kept up to date as calls come in and age out.
+    Controllers that follow the demand (DemandParking, ZoneController) own one window each and recompute
+    their plan when replan_due says so, only if changed is set since their last plan.
+    """
+
+    def __init__(self, window: int, replan_every: int) -> None:
+        """
+        :param window: Number of ticks of calls the counts are kept over
+        :param replan_every: Number of ticks between two replans
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if replan_every <= 0:
+            raise ValueError("replan_every must be positive")
+        self.window: int = window
+        self.replan_every: int = replan_every
+        # (arrival time, pickup floor) of the calls in the window, oldest first
+        self.calls: Deque[Tuple[int, int]] = deque()
+        self.counts: Dict[int, int] = {}
+        # Time of the next replan, the event time advance stops there
+        self.next_replan: int = 0
+        # Set when the counts change, cleared by the owner once it replanned
+        self.changed: bool = False
+
+    def observe(self, current_time: int, floor: int) -> None:
+        """
+        Count a call made from floor at current_time
+        """
+        self.calls.append((current_time, floor))
+        self.counts[floor] = self.counts.get(floor, 0) + 1
+        self.changed = True
+
+    def expire(self, current_time: int) -> None:
+        """
+        Drop the calls that are out of the window at current_time
+        """
+        calls = self.calls
+        counts = self.counts
+        oldest = current_time - self.window
+        while calls and calls[0][0] <= oldest:
+            _, floor = calls.popleft()
+            counts[floor] -= 1
+            if not counts[floor]:
+                del counts[floor]
+            self.changed = True
+
+    def replan_due(self, current_time: int) -> bool:
+        """
+        True once per replan_every ticks (at the first call on or after every multiple), the expired
+        calls are dropped before returning
+        """
+        if current_time < self.next_replan:
+            return False
+        self.next_replan = (
+            current_time - current_time % self.replan_every + self.replan_every
+        )
+        self.expire(current_time)
+        return True
+
+    def rates(self) -> Dict[int, float]:
+        """
+        Calls per tick of every floor over the window
+        """
+        return {
+            floor: count / self.window for floor, count in sorted(self.counts.items())
+        }
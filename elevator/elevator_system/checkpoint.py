@@ -0,0 +1,170 @@
+import os
+import pickle
+import struct
+import zlib
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Union
+
+from elevator.elevator_system.events import EventSink
+from utils.request_file import read_request_file
+
+if TYPE_CHECKING:
+    from elevator.elevator_system.simulate_elevator import ElevatorSimulation
+
+# File header: magic bytes and format version, followed by the compressed engine state
+CHECKPOINT_MAGIC = b"ELVCKPT"
+# 2: the arrival schedule counts the rows read from its request stream
+CHECKPOINT_VERSION = 2
+_HEADER = struct.Struct(f"<{len(CHECKPOINT_MAGIC)}sH")
+
+
+def dumps_checkpoint(simulation: "ElevatorSimulation") -> bytes:
+    """
+    Compact binary snapshot of a simulation: the engine state, the next tick and how far
+    the request stream has been read
+
+    The event sink is not part of the snapshot.
+    """
+    payload = pickle.dumps(simulation, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION) + zlib.compress(payload)
+
+
+def loads_checkpoint(
+    data: bytes,
+    requests: Optional[Union[Iterable[tuple], str, os.PathLike]] = None,
+    event_sink: Optional[EventSink] = None,
+) -> "ElevatorSimulation":
+    """
+    Restore a simulation from dumps_checkpoint
+
+    :param data: Checkpoint bytes
+    :param requests: The requests, or request file, the simulation was created with. Only needed
+        when they were not all read at checkpoint time and did not come from a request file,
+        which is reopened
+    :param event_sink: Sink for the events of the resumed run
+    :return: The simulation, run continues from the checkpointed tick
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a simulation checkpoint")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("Not a simulation checkpoint")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Unsupported checkpoint version {version}, expected {CHECKPOINT_VERSION}"
+        )
+    simulation = pickle.loads(zlib.decompress(data[_HEADER.size :]))
+
+    if simulation.schedule.stream_detached:
+        if requests is None:
+            requests = simulation.requests_path
+        if isinstance(requests, (str, os.PathLike)):
+            requests = read_request_file(requests, simulation.zone_map)
+        if requests is None:
+            raise ValueError(
+                "The checkpoint was taken before every request was read, pass the requests to resume it"
+            )
+        simulation.schedule.attach_stream(requests)
+    simulation.event_sink = event_sink
+    return simulation
+
+
+def save_checkpoint(simulation: "ElevatorSimulation", path: str) -> None:
+    """
+    Write a checkpoint of the simulation to path
+
+    The file is written next to path and then renamed over it, so an interrupted save
+    leaves the previous checkpoint in place.
+    """
+    data = dumps_checkpoint(simulation)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(
+    path: str,
+    requests: Optional[Union[Iterable[tuple], str, os.PathLike]] = None,
+    event_sink: Optional[EventSink] = None,
+) -> "ElevatorSimulation":
+    """
+    Restore a simulation from a checkpoint file, see loads_checkpoint
+    """
+    with open(path, "rb") as f:
+        return loads_checkpoint(f.read(), requests, event_sink)
+
+
+def resume_simulation(
+    path: str,
+    max_time: int,
+    time_advance: str = "tick",
+    requests: Optional[Union[Iterable[tuple], str, os.PathLike]] = None,
+    event_sink: Optional[EventSink] = None,
+    checkpoint_every: Optional[int] = None,
+) -> "ElevatorSimulation":
+    """
+    Continue a checkpointed simulation until every passenger has exited or max_time is reached.
+    The result is the same as the uninterrupted run.
+
+    :param path: Checkpoint file
+    :param max_time: Max time for the simulation, counted from time 0
+    :param time_advance: "tick" or "event", see ElevatorSimulation.run
+    :param requests: The requests of the simulation, see loads_checkpoint
+    :param event_sink: Sink for the events of the resumed run
+    :param checkpoint_every: Keep checkpointing to path every this many ticks
+    :return: The simulation object after the run
+    """
+    simulation = load_checkpoint(path, requests, event_sink)
+    simulation.run(
+        max_time,
+        time_advance,
+        checkpoint_every,
+        path if checkpoint_every is not None else None,
+    )
+    return simulation
+
+
+def fork_simulations(
+    checkpoint: Union[bytes, str],
+    variants: List[Dict[str, object]],
+    requests: Optional[Callable[[], Iterable[tuple]]] = None,
+) -> List["ElevatorSimulation"]:
+    """
+    Run what-if variants from the same warm state, each on its own copy of the checkpoint
+
+    Each variant is a dict with:
+        max_time: Max time of the run (required)
+        time_advance: "tick" or "event", default "tick"
+        max_capacity: Capacity of every elevator from the fork on
+        configure: Callable applied to the restored simulation before it runs, for other changes
+        event_sink: Sink for the events of the variant
+
+    :param checkpoint: Checkpoint bytes or file path
+    :param variants: Variant dicts, run in order
+    :param requests: Returns a fresh iterable of the requests for every variant, only needed
+        when the checkpoint has unread requests that did not come from a request file
+    :return: The simulations after their runs, in the order of variants
+    """
+    if not isinstance(checkpoint, bytes):
+        with open(checkpoint, "rb") as f:
+            checkpoint = f.read()
+
+    simulations = []
+    for idx, variant in enumerate(variants):
+        if "max_time" not in variant:
+            raise ValueError(f"Variant {idx} has no max_time")
+        simulation = loads_checkpoint(
+            checkpoint,
+            requests() if requests is not None else None,
+            variant.get("event_sink"),
+        )
+        if variant.get("max_capacity") is not None:
+            for elevator in simulation.elevators:
+                elevator.capacity = variant["max_capacity"]
+        if variant.get("configure") is not None:
+            variant["configure"](simulation)
+        simulation.run(variant["max_time"], variant.get("time_advance", "tick"))
+        simulations.append(simulation)
+    return simulations
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from time import perf_counter
+from typing import Deque, Dict, List, Optional, Set
+
+from elevator.elevator_system.events import (
+    CallbackEventSink,
+    EventType,
+    SimulationEvent,
+)
+from elevator.elevator_system.journey_stats import percentile
+from elevator.elevator_system.simulate_elevator import ElevatorSimulation
+from validations.config_validation import validate_request
+
+logger = logging.getLogger("ElevatorLogger")
+
+
+class LatencyTracker:
+    """
+    Assignment latencies of the most recent calls, for p50/p99 reporting
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        """
+        :param window: Number of most recent latencies the percentiles are computed over
+        """
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count: int = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window in seconds, None before the first sample
+        """
+        return percentile(self.samples, pct)
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Plain dict of the metrics in milliseconds, e.g. to send them as JSON
+        """
+        p50 = self.percentile(50)
+        p99 = self.percentile(99)
+        return {
+            "assignments": self.count,
+            "window": len(self.samples),
+            "p50_ms": p50 * 1000 if p50 is not None else None,
+            "p99_ms": p99 * 1000 if p99 is not None else None,
+            "max_ms": max(self.samples) * 1000 if self.samples else None,
+        }
+
+
+class DispatchService:
+    """
+    Soft real-time dispatcher: the simulation advances one tick every tick_seconds of wall time
+    and passenger calls come in over a local TCP socket as JSON lines
+
+    Requests, one JSON object per line:
+        {"passenger_id": "p1", "source": 1, "destination": 12}  -> call an elevator
+        {"command": "metrics"}                                   -> latency metrics
+    Every call is answered once the load balancer assigns it, with the elevator, the tick of
+    the assignment and the latency from receiving the call to the assignment:
+        {"passenger_id": "p1", "elevator": 2, "time": 57, "latency_ms": 43.1}
+    Invalid calls are answered with {"error": "..."}. Connections stay open for any number of calls,
+    the answers of one connection come in assignment order.
+
+    Every call stays in simulation.passengers (and its id in the ids already used, passenger ids are
+    unique for the life of the service), including the passengers that exited: memory grows by about
+    170 bytes per call, e.g. 170 MB after a million calls. Restart the service to release it.
+    """
+
+    def __init__(
+        self,
+        zone_map: dict,
+        tick_seconds: float = 0.1,
+        max_capacity: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        latency_window: int = 10000,
+    ) -> None:
+        """
+        :param zone_map: Elevator id -> floors of its zone
+        :param tick_seconds: Wall time of one simulation tick
+        :param max_capacity: Elevator max capacity, defaults to simulation_config["max_capacity"]
+        :param host: Address to listen on
+        :param port: Port to listen on, 0 picks a free one (see self.port once started)
+        :param latency_window: Number of most recent latencies the percentiles are computed over
+        """
+        self.simulation: ElevatorSimulation = ElevatorSimulation(
+            [],
+            zone_map,
+            CallbackEventSink(self._on_event),
+            max_capacity,
+        )
+        self.all_floors: Set[int] = {
+            floor for zone in zone_map.values() for floor in zone
+        }
+        self.tick_seconds: float = tick_seconds
+        self.host: str = host
+        self.port: int = port
+        self.latency: LatencyTracker = LatencyTracker(latency_window)
+        self.current_time: int = 0
+        # Passenger id -> (receive time, future answered on assignment)
+        self._pending: Dict[str, tuple] = {}
+        # Ids of the accepted calls, a rejected call does not use up its id
+        self._seen_ids: Set[str] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ticker: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        # Open connections, closed on stop so their handlers end cleanly
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self) -> None:
+        """
+        Start listening and ticking, returns once the server is up
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._stopping = asyncio.Event()
+        self._ticker = asyncio.create_task(self._tick_loop())
+        logger.info(
+            "Dispatch service listening on %s:%s, tick %ss",
+            self.host,
+            self.port,
+            self.tick_seconds,
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop ticking and accepting calls, unanswered calls are cancelled and open
+        connections are closed
+        """
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+            self._ticker = None
+        if self._server is not None:
+            self._server.close()
+        for _, future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        for writer in self._connections.values():
+            writer.close()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        logger.info("Dispatch service stopped, latency: %s", self.latency.as_dict())
+
+    async def serve_forever(self) -> None:
+        """
+        Start the service if it is not running yet and serve until shutdown is called
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._stopping.wait()
+        finally:
+            await self.stop()
+
+    def shutdown(self) -> None:
+        """
+        Make serve_forever stop the service and return, e.g. from a signal handler
+        """
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _tick_loop(self) -> None:
+        """
+        Run one simulation tick every tick_seconds. Deadlines are fixed from the start time,
+        a slow tick shortens the next sleep instead of shifting every later tick.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            self.simulation.tick(self.current_time)
+            self.current_time += 1
+            deadline += self.tick_seconds
+            await asyncio.sleep(max(deadline - loop.time(), 0))
+
+    def call(self, pid: str, source: int, dest: int) -> asyncio.Future:
+        """
+        Register a passenger call for the next tick
+
+        :return: Future resolved with the answer dict once the call is assigned
+        :raises ValueError: With a message for the caller when the call is invalid
+        """
+        # Checked here, validate_request would point at the table row of the call
+        if not isinstance(pid, str):
+            raise ValueError("passenger_id must be a string")
+        if pid in self._seen_ids:
+            raise ValueError(f"Duplicate passenger id found: {pid}")
+        request = (self.current_time, pid, source, dest)
+        validate_request(request, len(self.simulation.passengers), self.all_floors)
+        self._seen_ids.add(pid)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[pid] = (perf_counter(), future)
+        self.simulation.add_call(*request)
+        return future
+
+    def _on_event(self, event: SimulationEvent) -> None:
+        if event.kind != EventType.ASSIGNED:
+            return
+        received, future = self._pending.pop(event.passenger, (None, None))
+        if future is None or future.done():
+            return
+        latency = perf_counter() - received
+        self.latency.record(latency)
+        future.set_result(
+            {
+                "passenger_id": event.passenger,
+                "elevator": event.elevator,
+                "time": event.time,
+                "latency_ms": latency * 1000,
+            }
+        )
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Answers are written by their own tasks, a caller waiting for an assignment does not
+        # hold up the next request on the same connection
+        answers: List[asyncio.Task] = []
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                answers.append(asyncio.create_task(self._answer(line, writer)))
+            if answers:
+                await asyncio.gather(*answers, return_exceptions=True)
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("Expected a JSON object")
+            if message.get("command") == "metrics":
+                answer = self.latency.as_dict()
+            else:
+                answer = await self.call(
+                    message.get("passenger_id"),
+                    message.get("source"),
+                    message.get("destination"),
+                )
+        except ValueError as e:
+            answer = {"error": str(e)}
+        if not writer.is_closing():
+            writer.write(json.dumps(answer).encode("utf-8") + b"\n")
+            await writer.drain()
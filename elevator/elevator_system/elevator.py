@@ -1,28 +1,138 @@
 import logging
-from typing import List, Optional, Deque
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional
 
 from elevator.elevator_system.passenger import Passenger
+from elevator.elevator_system.waiting_room import WaitingRoom
 from elevator.run_config import simulation_config
 
 logger = logging.getLogger("ElevatorLogger")
 
+# Elevator state codes
+IDLE, MOVING_TO_PICKUP, LOADING, DROPPING_OFF = 0, 1, 2, 3
+STATE_NAMES = ("idle", "moving_to_pickup", "loading", "dropping_off")
+# Elevator direction codes
+NO_DIRECTION, UP, DOWN = 0, 1, -1
+DIRECTION_NAMES = {NO_DIRECTION: None, UP: "up", DOWN: "down"}
+
+
+class RouteQueue:
+    """
+    Pickup or destination floors of an elevator, kept sorted with bisect
+
+    Floors are stored in ascending order, so lookups take O(log n), inserts and removals
+    O(n) (a route holds at most one entry per floor) and the lowest/highest stop is read
+    in O(1). The queue also remembers
+    the order the route was last sorted in (descending when the elevator was not
+    going up), which is the order it is iterated and printed in.
+    """
+
+    __slots__ = ("floors", "descending")
+
+    def __init__(self, floors: Iterable[int] = ()) -> None:
+        self.floors: List[int] = sorted(floors)
+        self.descending: bool = False
+
+    def add(self, floor: int, descending: bool) -> bool:
+        """
+        Add a floor that is not in the queue yet
+
+        :param floor: Floor to stop at
+        :param descending: Whether the route is now listed top down
+        :return: False if the floor was already in the queue, the order is then left as it was
+        """
+        floors = self.floors
+        idx = bisect_left(floors, floor)
+        if idx < len(floors) and floors[idx] == floor:
+            return False
+        floors.insert(idx, floor)
+        self.descending = descending
+        return True
+
+    def remove(self, floor: int) -> None:
+        floors = self.floors
+        idx = bisect_left(floors, floor)
+        if idx == len(floors) or floors[idx] != floor:
+            raise ValueError(f"Floor {floor} is not in the route")
+        del floors[idx]
+
+    def lowest(self) -> int:
+        if not self.floors:
+            raise ValueError("Route is empty")
+        return self.floors[0]
+
+    def highest(self) -> int:
+        if not self.floors:
+            raise ValueError("Route is empty")
+        return self.floors[-1]
+
+    def __contains__(self, floor: int) -> bool:
+        floors = self.floors
+        idx = bisect_left(floors, floor)
+        return idx < len(floors) and floors[idx] == floor
+
+    def __len__(self) -> int:
+        return len(self.floors)
+
+    def __bool__(self) -> bool:
+        return bool(self.floors)
+
+    def __iter__(self) -> Iterator[int]:
+        return reversed(self.floors) if self.descending else iter(self.floors)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
 
 class Elevator:
+    __slots__ = (
+        "eid",
+        "current_floor",
+        "original_floor",
+        "park_floor",
+        "zone_start",
+        "zone_end",
+        "capacity",
+        "pickups",
+        "destinations",
+        "direction",
+        "state",
+        "passengers",
+    )
+
     def __init__(
-        self, eid: int, current_floor: int, zone_start: int, zone_end: int
+        self,
+        eid: int,
+        current_floor: int,
+        zone_start: int,
+        zone_end: int,
+        capacity: Optional[int] = None,
     ) -> None:
         self.eid: int = eid
         self.current_floor: int = current_floor
         self.original_floor: int = current_floor
+        # Floor the elevator goes to when idle, the original floor unless a parking strategy moves it
+        self.park_floor: int = current_floor
         self.zone_start: int = zone_start
         self.zone_end: int = zone_end
-        self.capacity: int = simulation_config["max_capacity"]
-        self.pickups: List[int] = []
-        self.destinations: List[int] = []
-        self.direction: Optional[str] = None
-        self.state: str = "idle"
+        self.capacity: int = (
+            capacity if capacity is not None else simulation_config["max_capacity"]
+        )
+        self.pickups: RouteQueue = RouteQueue()
+        self.destinations: RouteQueue = RouteQueue()
+        # Direction and state codes, see DIRECTION_NAMES and STATE_NAMES
+        self.direction: int = NO_DIRECTION
+        self.state: int = IDLE
         self.passengers: List[Passenger] = []
 
+    @property
+    def state_name(self) -> str:
+        return STATE_NAMES[self.state]
+
+    @property
+    def direction_name(self) -> Optional[str]:
+        return DIRECTION_NAMES[self.direction]
+
     def can_accept(self) -> bool:
         """
         Checks the elevator capacity
@@ -34,99 +144,137 @@ class Elevator:
         Update the elevators route by adding a pickup floor and a destination
         If idle, set direction based on new_source relative to current_floor
         """
-        if self.state == "idle":
-            self.direction = "up" if new_source >= self.current_floor else "down"
-        # Only add pickup if it's in the direction of travel.
-        if self.direction == "up" and (
-            new_source >= self.current_floor or new_source < self.current_floor
-        ):
-            if new_source not in self.pickups:
-                self.pickups.append(new_source)
-                self.pickups.sort()
-        elif self.direction == "down" and (
-            new_source <= self.current_floor or new_source > self.current_floor
-        ):
-            if new_source not in self.pickups:
-                self.pickups.append(new_source)
-                self.pickups.sort(reverse=True)
-        else:
-            pass
-
-        if new_dest not in self.destinations:
-            self.destinations.append(new_dest)
-            (
-                self.destinations.sort()
-                if self.direction == "up"
-                else self.destinations.sort(reverse=True)
-            )
+        if self.state == IDLE:
+            self.direction = UP if new_source >= self.current_floor else DOWN
+        # Pickups are only added once the elevator has a direction of travel
+        if self.direction != NO_DIRECTION:
+            self.pickups.add(new_source, descending=self.direction == DOWN)
+        self.destinations.add(new_dest, descending=self.direction != UP)
 
         if self.pickups:
-            self.state = "moving_to_pickup"
+            self.state = MOVING_TO_PICKUP
 
-    def adjust_zone(self, waiting_passengers: Deque[Passenger]) -> None:
+    def adjust_zone(self, waiting_room: WaitingRoom) -> bool:
         """
         Adaptive Zones: Expand zone boundaries based on waiting passengers assigned to this elevator
+
+        :return: True if zone_start or zone_end changed
         """
-        for p in waiting_passengers:
-            if p.assigned_elevator == self.eid:
-                if p.source < self.zone_start:
-                    logger.info(
-                        f"Elevator {self.eid}: Expanding zone start from {self.zone_start} to {p.source}"
-                    )
-                    self.zone_start = p.source
-                if p.source > self.zone_end:
-                    logger.info(
-                        f"Elevator {self.eid}: Expanding zone end from {self.zone_end} to {p.source}"
-                    )
-                    self.zone_end = p.source
+        source_range = waiting_room.source_range(self.eid)
+        if source_range is None:
+            return False
+        changed = False
+        lowest, highest = source_range
+        if lowest < self.zone_start:
+            logger.info(
+                "Elevator %s: Expanding zone start from %s to %s",
+                self.eid,
+                self.zone_start,
+                lowest,
+            )
+            self.zone_start = lowest
+            changed = True
+        if highest > self.zone_end:
+            logger.info(
+                "Elevator %s: Expanding zone end from %s to %s",
+                self.eid,
+                self.zone_end,
+                highest,
+            )
+            self.zone_end = highest
+            changed = True
+        return changed
+
+    def next_target(self) -> Optional[int]:
+        """
+        Floor the elevator is travelling toward in its current state
+        "idle", the park floor (the original floor unless a parking strategy moved it)
+        "moving_to_pickup", the next pickup (based on sorted pickups)
+        "dropping_off", the next destination, None if no destinations are left
+        """
+        if self.state == IDLE:
+            return self.park_floor
+        if self.state == MOVING_TO_PICKUP:
+            if self.direction == UP:
+                return self.pickups.highest()
+            lowest_pickup = self.pickups.lowest()
+            return (
+                lowest_pickup
+                if not self.destinations.lowest() < lowest_pickup
+                else self.pickups.highest()
+            )
+        if self.state == DROPPING_OFF and self.destinations:
+            if self.direction == UP:
+                return self.destinations.lowest()
+            return self.destinations.highest()
+        return None
 
-    def move(self, current_time: int) -> None:
+    def ticks_to_next_event(self) -> Optional[int]:
+        """
+        Number of ticks the elevator will only travel before its state or route changes
+        0 means something happens on the next move, None means it will never change on its own
+        """
+        target = self.next_target()
+        if target is None:
+            return 0
+        distance = abs(self.current_floor - target)
+        if self.state == IDLE and distance == 0:
+            return None
+        return distance
+
+    def advance(self, steps: int) -> None:
+        """
+        Travel `steps` floors toward the next target in one go, equivalent to `steps` calls to move
+        Callers must ensure steps does not exceed ticks_to_next_event
+        """
+        target = self.next_target()
+        if steps <= 0 or target is None or target == self.current_floor:
+            return
+        if target < self.current_floor:
+            self.current_floor -= steps
+        else:
+            self.current_floor += steps
+
+    def move(self, current_time: int) -> List[Passenger]:
         """
         Move one step toward the next target
         "moving_to_pickup", move toward the next pickup (based on sorted pickups)
         "dropping_off", move toward the next destination (sorted)
+
+        :return: Passengers dropped off during this step
         """
-        if self.state == "idle":
-            # If idle, return to original floor.
-            if self.current_floor < self.original_floor:
+        dropped: List[Passenger] = []
+        if self.state == IDLE:
+            # If idle, go to the park floor
+            if self.current_floor < self.park_floor:
                 self.current_floor += 1
-            elif self.current_floor > self.original_floor:
+            elif self.current_floor > self.park_floor:
                 self.current_floor -= 1
-            return
+            return dropped
 
-        if self.state == "moving_to_pickup":
-            if self.direction == "up":
-                target = max(self.pickups)
-            else:
-                target = (
-                    min(self.pickups)
-                    if not min(self.destinations) < min(self.pickups)
-                    else max(self.pickups)
-                )
+        if self.state == MOVING_TO_PICKUP:
+            target = self.next_target()
             if self.current_floor < target:
                 self.current_floor += 1
             elif self.current_floor > target:
                 self.current_floor -= 1
             else:
-                self.state = "loading"
-                logger.info(f"Elevator {self.eid}: Arrived at Pickup floor {target}")
+                self.state = LOADING
+                logger.info("Elevator %s: Arrived at Pickup floor %s", self.eid, target)
                 self.pickups.remove(target)
-        elif self.state == "loading":
+        elif self.state == LOADING:
             # Boarding is handled in the simulation loop
             # After boarding, if there are remaining pickups, remain in moving_to_pickup
             # otherwise, switch to dropping_off if destinations exist.
             if self.destinations:
-                self.state = "dropping_off"
+                self.state = DROPPING_OFF
             elif self.pickups:
-                self.state = "moving_to_pickup"
+                self.state = MOVING_TO_PICKUP
             else:
-                self.state = "idle"
-        elif self.state == "dropping_off":
+                self.state = IDLE
+        elif self.state == DROPPING_OFF:
             if self.destinations:
-                if self.direction == "up":
-                    target = min(self.destinations)
-                else:
-                    target = max(self.destinations)
+                target = self.next_target()
                 if self.current_floor < target:
                     self.current_floor += 1
                 elif self.current_floor > target:
@@ -139,20 +287,26 @@ class Elevator:
                     for p in dropped:
                         p.exit_time = current_time
                         logger.info(
-                            f"[Time {current_time}] Passenger {p.id} exited at floor {self.current_floor}"
+                            "[Time %s] Passenger %s exited at floor %s",
+                            current_time,
+                            p.id,
+                            self.current_floor,
                         )
                     self.passengers = [
                         p for p in self.passengers if p.dest != self.current_floor
                     ]
                     logger.info(
-                        f"Elevator {self.eid}: Dropped off passengers at Floor {self.current_floor}"
+                        "Elevator %s: Dropped off passengers at Floor %s",
+                        self.eid,
+                        self.current_floor,
                     )
             else:
                 if self.pickups:
-                    self.state = "moving_to_pickup"
+                    self.state = MOVING_TO_PICKUP
                 else:
-                    self.state = "idle"
-                    self.direction = None
+                    self.state = IDLE
+                    self.direction = NO_DIRECTION
+        return dropped
 
     def __repr__(self) -> str:
         route_info = (
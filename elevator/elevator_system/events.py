@@ -0,0 +1,61 @@
+from enum import Enum
+from typing import Any, Callable, List, NamedTuple, Optional
+
+
+class EventType(str, Enum):
+    ASSIGNED = "assigned"
+    BOARDED = "boarded"
+    EXITED = "exited"
+    ZONE_EXPANDED = "zone_expanded"
+    ZONE_REBALANCED = "zone_rebalanced"
+    STATE_CHANGE = "state_change"
+
+
+class SimulationEvent(NamedTuple):
+    """
+    A single thing that happened during the simulation
+
+    previous/current hold the old and new state for STATE_CHANGE events,
+    and the old and new (zone_start, zone_end) for ZONE_EXPANDED and ZONE_REBALANCED events
+    """
+
+    time: int
+    kind: EventType
+    elevator: int
+    passenger: Optional[str] = None
+    floor: Optional[int] = None
+    previous: Any = None
+    current: Any = None
+
+
+class EventSink:
+    """
+    Receives simulation events as they happen, the base sink discards them
+    """
+
+    def emit(self, event: SimulationEvent) -> None:
+        pass
+
+
+class ListEventSink(EventSink):
+    """
+    Keeps every event in memory, in the order they were emitted
+    """
+
+    def __init__(self) -> None:
+        self.events: List[SimulationEvent] = []
+
+    def emit(self, event: SimulationEvent) -> None:
+        self.events.append(event)
+
+
+class CallbackEventSink(EventSink):
+    """
+    Forwards every event to a callable
+    """
+
+    def __init__(self, callback: Callable[[SimulationEvent], None]) -> None:
+        self.callback: Callable[[SimulationEvent], None] = callback
+
+    def emit(self, event: SimulationEvent) -> None:
+        self.callback(event)
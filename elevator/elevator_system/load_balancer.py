@@ -1,9 +1,11 @@
 import logging
-from typing import List, Optional, Deque
+from bisect import bisect_right
+from typing import List, Optional, Tuple
 
-from elevator.elevator_system.elevator import Elevator
+from elevator.elevator_system.elevator import DOWN, IDLE, MOVING_TO_PICKUP, UP, Elevator
 from elevator.elevator_system.elevator import Passenger
-from utils.utils import create_zones, find_zone_for_number
+from elevator.elevator_system.waiting_room import WaitingRoom
+from utils.utils import create_zones, min_cost_assignment
 
 logger = logging.getLogger("ElevatorLogger")
 
@@ -11,9 +13,63 @@ logger = logging.getLogger("ElevatorLogger")
 class LoadBalancer:
     def __init__(self, elevators: List[Elevator]) -> None:
         self.elevators: List[Elevator] = elevators
+        # Zone partition of the floors covered by all elevators, kept as sorted zone start floors
+        self.zone_starts: List[int] = []
+        self.zone_stop: int = 0
+        # Set once set_zones placed the boundaries, rebuild_zones then only widens the outer zones
+        self.custom_zones: bool = False
+        self.rebuild_zones()
+
+    def rebuild_zones(self) -> None:
+        """
+        Recompute the zone partition from the elevators zones
+        Needs to be called whenever an elevator zone_start or zone_end changes
+        The floors covered by all elevators are split in equal zones, unless set_zones placed the
+        boundaries: the inner boundaries are then kept and the outer zones grow to cover the elevators zones
+        """
+        if not self.elevators:
+            return
+        lowest = min(min(e.zone_start, e.zone_end) for e in self.elevators)
+        highest = max(max(e.zone_start, e.zone_end) for e in self.elevators)
+        if self.custom_zones:
+            self.zone_starts[0] = min(self.zone_starts[0], lowest)
+            self.zone_stop = max(self.zone_stop, highest + 1)
+            return
+        zones = create_zones(lowest, highest, len(self.elevators))
+        self.zone_starts = [r.start for r in zones.values()]
+        self.zone_stop = highest + 1
+
+    def set_zones(self, zone_starts: List[int], zone_stop: int) -> None:
+        """
+        Replace the equal zones with custom boundaries, one zone per elevator
+
+        :param zone_starts: First floor of every zone, ascending
+        :param zone_stop: Floor after the last floor of the last zone
+        """
+        if len(zone_starts) != len(self.elevators):
+            raise ValueError(
+                f"Expected {len(self.elevators)} zones, got {len(zone_starts)}"
+            )
+        bounds = list(zone_starts) + [zone_stop]
+        if any(start > stop for start, stop in zip(bounds, bounds[1:])):
+            raise ValueError(f"Zone boundaries must be ascending, got {bounds}")
+        self.zone_starts = list(zone_starts)
+        self.zone_stop = zone_stop
+        self.custom_zones = True
+
+    def zone_for_floor(self, floor: int) -> int:
+        """
+        Index of the zone covering the floor, -1 if the floor is outside every zone
+
+        :param floor: Floor to locate
+        """
+        if not self.zone_starts or not self.zone_starts[0] <= floor < self.zone_stop:
+            return -1
+        # Empty zones share their start with the next zone, bisect_right skips past them
+        return bisect_right(self.zone_starts, floor) - 1
 
     def assign_elevator(
-        self, passenger: Passenger, waiting_passengers: Deque[Passenger]
+        self, passenger: Passenger, waiting_room: WaitingRoom
     ) -> Optional[Elevator]:
         """
         Assign the best elevator to the passenger
@@ -21,54 +77,43 @@ class LoadBalancer:
         """
         best_elevator: Optional[Elevator] = None
         min_cost: float = float("inf")
-        total_range: list = []
-        for elevator in self.elevators:
-            total_range.append(elevator.zone_start)
-            total_range.append(elevator.zone_end)
-
-        zones_mapping = create_zones(
-            min(total_range), max(total_range), len(self.elevators)
-        )
+        zone_for_floor = self.zone_for_floor
+        # Passenger fields are reads from the passenger table, done once per call
+        source = passenger.source
+        source_zone = zone_for_floor(source)
+        dest_zone = zone_for_floor(passenger.dest)
 
         for elevator in self.elevators:
 
-            assigned_waiters = sum(
-                1 for p in waiting_passengers if p.assigned_elevator == elevator.eid
-            )
+            assigned_waiters = waiting_room.assigned_count(elevator.eid)
             if (len(elevator.passengers) + assigned_waiters) >= elevator.capacity:
                 continue
 
-            if elevator.state == "idle":
-                cost = abs(elevator.current_floor - passenger.source)
+            if elevator.state == IDLE:
+                cost = abs(elevator.current_floor - source)
 
-            elif elevator.state == "moving_to_pickup":
+            elif elevator.state == MOVING_TO_PICKUP:
 
-                if elevator.direction == "up" and (
-                    find_zone_for_number(max(elevator.destinations), zones_mapping)
-                    == find_zone_for_number(passenger.dest, zones_mapping)
+                if elevator.direction == UP and (
+                    zone_for_floor(elevator.destinations.highest()) == dest_zone
                 ):
                     if elevator.pickups:
-                        if find_zone_for_number(
-                            max(elevator.pickups), zones_mapping
-                        ) == find_zone_for_number(passenger.source, zones_mapping):
-                            cost = abs(elevator.current_floor - passenger.source)
+                        if zone_for_floor(elevator.pickups.highest()) == source_zone:
+                            cost = abs(elevator.current_floor - source)
                         else:
                             continue
                     else:
-                        cost = abs(elevator.current_floor - passenger.source)
-                elif elevator.direction == "down" and (
-                    find_zone_for_number(min(elevator.destinations), zones_mapping)
-                    == find_zone_for_number(passenger.dest, zones_mapping)
+                        cost = abs(elevator.current_floor - source)
+                elif elevator.direction == DOWN and (
+                    zone_for_floor(elevator.destinations.lowest()) == dest_zone
                 ):
                     if elevator.pickups:
-                        if find_zone_for_number(
-                            max(elevator.pickups), zones_mapping
-                        ) == find_zone_for_number(passenger.source, zones_mapping):
-                            cost = abs(elevator.current_floor - passenger.source)
+                        if zone_for_floor(elevator.pickups.highest()) == source_zone:
+                            cost = abs(elevator.current_floor - source)
                         else:
                             continue
                     else:
-                        cost = abs(elevator.current_floor - passenger.source)
+                        cost = abs(elevator.current_floor - source)
                 else:
                     continue
             else:
@@ -79,5 +124,96 @@ class LoadBalancer:
 
         if not best_elevator and not passenger.no_assigned_elevator_logging:
             passenger.no_assigned_elevator_logging = True
-            logger.debug(f"No available elevator for Passenger {passenger.id}")
+            logger.debug("No available elevator for Passenger %s", passenger.id)
         return best_elevator
+
+    def assign_batch(
+        self, passengers: List[Passenger], waiting_room: WaitingRoom
+    ) -> List[Tuple[Passenger, Elevator]]:
+        """
+        Assign waiting passengers together, at the lowest total distance between elevators and pickup floors
+        Same rules as assign_elevator, but capacity and route zones are read once per elevator instead
+        of once per passenger and elevator. An idle elevator takes a single passenger per call, its
+        direction and route zones are only known once it has one. When there are more passengers than
+        free places, the ones that have waited longest are matched.
+
+        :param passengers: Unassigned passengers, in arrival order
+        :param waiting_room: Waiting room, for the passengers already assigned to each elevator
+        :return: (passenger, elevator) pairs in the order of passengers
+        """
+        zone_for_floor = self.zone_for_floor
+        # (elevator, free places, destination zone and pickup zone a passenger must match)
+        # idle elevators have no zones to match
+        open_elevators: List[Tuple[Elevator, int, Optional[int], Optional[int]]] = []
+        for elevator in self.elevators:
+            free = (
+                elevator.capacity
+                - len(elevator.passengers)
+                - waiting_room.assigned_count(elevator.eid)
+            )
+            if free <= 0:
+                continue
+            if elevator.state == IDLE:
+                open_elevators.append((elevator, 1, None, None))
+            elif elevator.state == MOVING_TO_PICKUP:
+                if elevator.direction == UP:
+                    dest_zone = zone_for_floor(elevator.destinations.highest())
+                elif elevator.direction == DOWN:
+                    dest_zone = zone_for_floor(elevator.destinations.lowest())
+                else:
+                    continue
+                pickup_zone = None
+                if elevator.pickups:
+                    pickup_zone = zone_for_floor(elevator.pickups.highest())
+                open_elevators.append((elevator, free, dest_zone, pickup_zone))
+        if not open_elevators:
+            return []
+
+        free_places = sum(free for _, free, _, _ in open_elevators)
+        # Costs of the passengers that fit at least one elevator, None where they do not fit
+        candidates: List[Passenger] = []
+        costs: List[List[Optional[int]]] = []
+        for passenger in passengers:
+            source = passenger.source
+            source_zone = zone_for_floor(source)
+            dest_zone = zone_for_floor(passenger.dest)
+            row: List[Optional[int]] = []
+            fits = False
+            for elevator, _, needed_dest_zone, needed_pickup_zone in open_elevators:
+                if needed_dest_zone is None or (
+                    needed_dest_zone == dest_zone
+                    and (
+                        needed_pickup_zone is None or needed_pickup_zone == source_zone
+                    )
+                ):
+                    row.append(abs(elevator.current_floor - source))
+                    fits = True
+                else:
+                    row.append(None)
+            if fits:
+                candidates.append(passenger)
+                costs.append(row)
+                if len(candidates) == free_places:
+                    break
+        if not candidates:
+            return []
+
+        # One column per free place, capped at the number of candidates
+        columns = [
+            idx
+            for idx, (_, free, _, _) in enumerate(open_elevators)
+            for _ in range(min(free, len(candidates)))
+        ]
+        # Higher than any total of real costs, so that as many passengers as possible are matched
+        no_fit = (max(self.zone_stop, 1) + 1) * (len(candidates) + 1)
+        matrix = [
+            [no_fit if row[idx] is None else row[idx] for idx in columns]
+            for row in costs
+        ]
+        pairs: List[Tuple[Passenger, Elevator]] = []
+        matched = min_cost_assignment(matrix)
+        for passenger, row, column in zip(candidates, costs, matched):
+            idx = columns[column]
+            if row[idx] is not None:
+                pairs.append((passenger, open_elevators[idx][0]))
+        return pairs
@@ -0,0 +1,128 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from elevator.config_options import PARKING_STRATEGIES
+from elevator.elevator_system.call_window import CallWindow
+from elevator.elevator_system.elevator import IDLE, Elevator
+
+logger = logging.getLogger("ElevatorLogger")
+
+
+def demand_quantile_floors(
+    floors: Sequence[int], weights: Sequence[int], k: int
+) -> List[int]:
+    """
+    Floors for k elevators so that each one covers the same share of the expected calls
+
+    Elevator i parks at the weighted (2i + 1) / 2k quantile of the call floors, so elevators gather
+    where the calls concentrate: during up peak most of them wait at the lobby, where a single
+    elevator could only take part of a burst. Takes O(n + k) for n call floors.
+
+    :param floors: Distinct call floors, ascending
+    :param weights: Number of calls of each floor, not all 0
+    :param k: Number of elevators
+    :return: k floors, ascending
+    """
+    total = sum(weights)
+    spots: List[int] = []
+    idx = 0
+    seen = weights[0]
+    for i in range(k):
+        # Compared times 2k to stay in integers
+        target = total * (2 * i + 1)
+        while 2 * k * seen < target:
+            idx += 1
+            seen += weights[idx]
+        spots.append(floors[idx])
+    return spots
+
+
+class DemandParking:
+    """
+    Parks idle elevators where the calls of the recent past came from
+
+    The calls are counted in a CallWindow. Every replan_every ticks, if the counts or the set of idle
+    elevators changed, the idle elevators are spread over the call floors (demand_quantile_floors),
+    matched in floor order so that elevators never cross to reach them.
+    Elevators that are busy keep their park floor until the next replan. With no calls in the window,
+    elevators go back to their original floor.
+    """
+
+    def __init__(self, window: int = 600, replan_every: int = 30) -> None:
+        """
+        :param window: Number of ticks of calls the park floors follow
+        :param replan_every: Number of ticks between two park floor updates
+        """
+        self.demand: CallWindow = CallWindow(window, replan_every)
+        self.replans: int = 0
+        self._idle: Tuple[int, ...] = ()
+
+    @property
+    def next_replan(self) -> int:
+        return self.demand.next_replan
+
+    def observe(self, current_time: int, floor: int) -> None:
+        """
+        Count a call made from floor at current_time
+        """
+        self.demand.observe(current_time, floor)
+
+    def update(self, current_time: int, elevators: List[Elevator]) -> None:
+        """
+        Update the park floors of the idle elevators when a replan is due
+        """
+        demand = self.demand
+        if not demand.replan_due(current_time):
+            return
+        idle = [e for e in elevators if e.state == IDLE]
+        idle_ids = tuple(e.eid for e in idle)
+        if not demand.changed and idle_ids == self._idle:
+            return
+        demand.changed = False
+        self._idle = idle_ids
+        if not idle:
+            return
+        self.replans += 1
+        counts = demand.counts
+        if not counts:
+            for elevator in idle:
+                elevator.park_floor = elevator.original_floor
+            return
+
+        floors = sorted(counts)
+        spots = demand_quantile_floors(floors, [counts[f] for f in floors], len(idle))
+        idle.sort(key=lambda e: (e.current_floor, e.eid))
+        for elevator, floor in zip(idle, spots):
+            if elevator.park_floor != floor:
+                logger.info(
+                    "Elevator %s: Parking at floor %s instead of %s",
+                    elevator.eid,
+                    floor,
+                    elevator.park_floor,
+                )
+                elevator.park_floor = floor
+
+    def call_rates(self) -> Dict[int, float]:
+        """
+        Calls per tick of every floor over the window
+        """
+        return self.demand.rates()
+
+
+def create_parking(
+    strategy: str, window: int = 600, replan_every: int = 30
+) -> Optional[DemandParking]:
+    """
+    Parking strategy for ElevatorSimulation, None for "home"
+
+    :param strategy: One of PARKING_STRATEGIES
+    :param window: See CallWindow
+    :param replan_every: See CallWindow
+    """
+    if strategy not in PARKING_STRATEGIES:
+        raise ValueError(
+            f"parking must be one of {PARKING_STRATEGIES}, got {strategy!r}"
+        )
+    if strategy == "home":
+        return None
+    return DemandParking(window, replan_every)
@@ -1,17 +1,162 @@
-from typing import Optional
+from array import array
+from typing import Iterator, List, Optional
+
+# Sentinel of the board and exit time columns for passengers that have not boarded or exited yet
+NOT_SET = -1
+# Bits of the flags column
+ASSIGNED = 1
+NO_ELEVATOR_LOGGED = 2
+
+
+class PassengerTable:
+    """
+    Struct-of-arrays store of every passenger of a run, one row per passenger
+
+    Each field is a typed array indexed by the row id the passenger got when it was added,
+    so a passenger costs a few machine words instead of a full object. Passenger objects are
+    thin views over a row, created when needed.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.arrival_time: array = array("q")
+        self.source: array = array("q")
+        self.dest: array = array("q")
+        self.board_time: array = array("q")
+        self.exit_time: array = array("q")
+        self.assigned_elevator: array = array("q")
+        self.flags: array = array("B")
+
+    def add(self, arrival_time: int, pid: str, source: int, dest: int) -> int:
+        """
+        Add a passenger and return its row id
+        """
+        self.ids.append(pid)
+        self.arrival_time.append(arrival_time)
+        self.source.append(source)
+        self.dest.append(dest)
+        self.board_time.append(NOT_SET)
+        self.exit_time.append(NOT_SET)
+        self.assigned_elevator.append(0)
+        self.flags.append(0)
+        return len(self.ids) - 1
+
+    def view(self, row: int) -> "Passenger":
+        """
+        Passenger view over a row
+        """
+        passenger = Passenger.__new__(Passenger)
+        passenger.table = self
+        passenger.row = row
+        return passenger
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> "Passenger":
+        if row < 0:
+            row += len(self.ids)
+        if not 0 <= row < len(self.ids):
+            raise IndexError("passenger row out of range")
+        return self.view(row)
+
+    def __iter__(self) -> Iterator["Passenger"]:
+        """
+        Views over every passenger, in row (request) order
+        """
+        return map(self.view, range(len(self.ids)))
 
 
 class Passenger:
+    """
+    A passenger, stored as one row of a PassengerTable
+
+    Passenger(arrival_time, pid, source, dest) creates a standalone passenger in a table of its own
+    """
+
+    __slots__ = ("table", "row")
+
     def __init__(self, arrival_time: int, pid: str, source: int, dest: int) -> None:
-        self.arrival_time: int = arrival_time
-        self.id: str = pid
-        self.source: int = source
-        self.dest: int = dest
-        self.board_time: Optional[int] = None
-        self.exit_time: Optional[int] = None
-        self.is_assigned: bool = False
-        self.assigned_elevator: Optional[int] = None
-        self.no_assigned_elevator_logging: bool = False
+        self.table: PassengerTable = PassengerTable()
+        self.row: int = self.table.add(arrival_time, pid, source, dest)
+
+    @property
+    def id(self) -> str:
+        return self.table.ids[self.row]
+
+    @property
+    def arrival_time(self) -> int:
+        return self.table.arrival_time[self.row]
+
+    @property
+    def source(self) -> int:
+        return self.table.source[self.row]
+
+    @property
+    def dest(self) -> int:
+        return self.table.dest[self.row]
+
+    @property
+    def board_time(self) -> Optional[int]:
+        value = self.table.board_time[self.row]
+        return None if value == NOT_SET else value
+
+    @board_time.setter
+    def board_time(self, value: Optional[int]) -> None:
+        self.table.board_time[self.row] = NOT_SET if value is None else value
+
+    @property
+    def exit_time(self) -> Optional[int]:
+        value = self.table.exit_time[self.row]
+        return None if value == NOT_SET else value
+
+    @exit_time.setter
+    def exit_time(self, value: Optional[int]) -> None:
+        self.table.exit_time[self.row] = NOT_SET if value is None else value
+
+    @property
+    def is_assigned(self) -> bool:
+        return bool(self.table.flags[self.row] & ASSIGNED)
+
+    @is_assigned.setter
+    def is_assigned(self, value: bool) -> None:
+        self._set_flag(ASSIGNED, value)
+
+    @property
+    def assigned_elevator(self) -> Optional[int]:
+        if not self.table.flags[self.row] & ASSIGNED:
+            return None
+        return self.table.assigned_elevator[self.row]
+
+    @assigned_elevator.setter
+    def assigned_elevator(self, eid: Optional[int]) -> None:
+        if eid is None:
+            self._set_flag(ASSIGNED, False)
+        else:
+            self.table.assigned_elevator[self.row] = eid
+            self._set_flag(ASSIGNED, True)
+
+    @property
+    def no_assigned_elevator_logging(self) -> bool:
+        return bool(self.table.flags[self.row] & NO_ELEVATOR_LOGGED)
+
+    @no_assigned_elevator_logging.setter
+    def no_assigned_elevator_logging(self, value: bool) -> None:
+        self._set_flag(NO_ELEVATOR_LOGGED, value)
+
+    def _set_flag(self, flag: int, value: bool) -> None:
+        if value:
+            self.table.flags[self.row] |= flag
+        else:
+            self.table.flags[self.row] &= ~flag & 0xFF
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Passenger):
+            return NotImplemented
+        return self.table is other.table and self.row == other.row
+
+    def __hash__(self) -> int:
+        return hash(self.row)
 
     def __repr__(self) -> str:
         return f"Passenger {self.id} ({self.source}->{self.dest})"
@@ -0,0 +1,107 @@
+from typing import Dict, List
+
+# Phases of a simulation tick, in the order they run
+TICK_PHASES = (
+    "arrivals",
+    "assignment",
+    "adjust_zone",
+    "idle_pickup",
+    "boarding",
+    "move",
+)
+# Event mode also spends time moving elevators across skipped ticks
+ADVANCE_PHASE = "advance"
+
+
+class PhaseTiming:
+    """
+    Wall time and call count of one phase across a run
+    """
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        # Seconds spent in the phase over the run, and in its slowest tick
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        """
+        Average seconds per call, i.e. per tick for the tick phases
+        """
+        return self.total / self.calls if self.calls else 0.0
+
+
+class SimulationStats:
+    """
+    Per-phase timings and assignment counters of a profiled run
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, PhaseTiming] = {
+            phase: PhaseTiming() for phase in TICK_PHASES + (ADVANCE_PHASE,)
+        }
+        self.ticks: int = 0
+        # Ticks jumped over by event mode without running the phases
+        self.skipped_ticks: int = 0
+        self.assignments: int = 0
+        # Assignment attempts where no elevator could take the passenger ("No available elevator")
+        self.failed_assignments: int = 0
+
+    @property
+    def assignment_attempts(self) -> int:
+        return self.assignments + self.failed_assignments
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(timing.total for timing in self.phases.values())
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Plain dict of the stats, e.g. to write them out as JSON
+        """
+        return {
+            "ticks": self.ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "assignments": self.assignments,
+            "failed_assignments": self.failed_assignments,
+            "total_seconds": self.total_seconds,
+            "phases": {
+                phase: {
+                    "calls": timing.calls,
+                    "total": timing.total,
+                    "mean": timing.mean,
+                    "max": timing.max,
+                }
+                for phase, timing in self.phases.items()
+            },
+        }
+
+    def report(self) -> str:
+        """
+        Table of the phases sorted by total time, slowest first
+        """
+        total = self.total_seconds or 1.0
+        lines: List[str] = [
+            f"Ticks: {self.ticks} (skipped {self.skipped_ticks}), assignments: {self.assignments}, "
+            f"failed assignment attempts: {self.failed_assignments}",
+            f"{'phase':<12} {'calls':>9} {'total s':>10} {'share':>7} {'mean us':>10} {'max us':>10}",
+        ]
+        for phase, timing in sorted(
+            self.phases.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            if not timing.calls:
+                continue
+            lines.append(
+                f"{phase:<12} {timing.calls:>9} {timing.total:>10.4f} {timing.total / total:>7.1%} "
+                f"{timing.mean * 1e6:>10.1f} {timing.max * 1e6:>10.1f}"
+            )
+        return "\n".join(lines)
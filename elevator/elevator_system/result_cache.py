@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from elevator.elevator_system.journey_stats import JourneyStats
+from elevator.elevator_system.passenger import PassengerTable
+from elevator.run_config import simulation_config
+
+logger = logging.getLogger("ElevatorLogger")
+
+# Version of the simulation results, part of every fingerprint. Bump it whenever a change to the
+# engine (assignment, routing, traffic generator...) changes the results of the same config,
+# entries of the previous version are then never read and age out of the cache
+ENGINE_VERSION = "1"
+
+# File header: magic bytes and format version, followed by the compressed result
+RESULT_MAGIC = b"ELVRES"
+RESULT_FORMAT_VERSION = 1
+_HEADER = struct.Struct(f"<{len(RESULT_MAGIC)}sH")
+RESULT_SUFFIX = ".res"
+
+_READ_CHUNK = 1 << 20
+
+
+class CachedResult(NamedTuple):
+    """
+    Results of a simulation run as kept in the cache
+    """
+
+    passengers: PassengerTable
+    # Overall wait/total time stats, see utils/summary_table.py summary_stats
+    stats: Dict[str, float]
+    journey_stats: Optional[JourneyStats] = None
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_fingerprint(sim_config: Dict[str, Any]) -> str:
+    """
+    Content address of the results of a validated simulation config
+
+    Covers everything the results depend on: ENGINE_VERSION, the zone mapping, max_time, max_capacity,
+    time_advance, assignment, parking, zoning, the journey_stats settings and the requests. Requests are taken the way
+    main.py picks them: the traffic settings when traffic is set, else the contents (not the path)
+    of passenger_requests_path, else the passenger_requests list. Missing optional keys hash the same
+    as their defaults, and keys that do not change the results (log_verbosity, profile...) are left out.
+
+    :param sim_config: Simulation config, see validate_config
+    :return: sha256 hex digest
+    """
+    if sim_config.get("traffic"):
+        requests: Tuple[str, Any] = ("traffic", sim_config["traffic"])
+    elif sim_config.get("passenger_requests_path") is not None:
+        requests = ("file", _file_digest(sim_config["passenger_requests_path"]))
+    else:
+        requests = ("list", sim_config["passenger_requests"])
+    max_capacity = sim_config.get("max_capacity")
+    journey_stats = sim_config.get("journey_stats", False)
+    parking = sim_config.get("parking", "home")
+    zoning = sim_config.get("zoning", "static")
+    payload = {
+        "engine_version": ENGINE_VERSION,
+        "default_zone_mapping": sorted(sim_config["default_zone_mapping"].items()),
+        "max_time": sim_config["max_time"],
+        "max_capacity": (
+            simulation_config["max_capacity"] if max_capacity is None else max_capacity
+        ),
+        "time_advance": sim_config.get("time_advance", "tick"),
+        "assignment": sim_config.get("assignment", "greedy"),
+        "parking": (
+            (
+                parking,
+                sim_config.get("parking_window", 600),
+                sim_config.get("parking_replan_every", 30),
+            )
+            if parking != "home"
+            else parking
+        ),
+        "zoning": (
+            (
+                zoning,
+                sim_config.get("zoning_window", 900),
+                sim_config.get("zoning_replan_every", 60),
+            )
+            if zoning != "static"
+            else zoning
+        ),
+        "journey_stats": journey_stats,
+        "journey_stats_floor_band": (
+            sim_config.get("journey_stats_floor_band", 10) if journey_stats else None
+        ),
+        "requests": requests,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def dumps_result(result: CachedResult) -> bytes:
+    payload = pickle.dumps(tuple(result), protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(RESULT_MAGIC, RESULT_FORMAT_VERSION) + zlib.compress(payload)
+
+
+def loads_result(data: bytes) -> CachedResult:
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a cached simulation result")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != RESULT_MAGIC:
+        raise ValueError("Not a cached simulation result")
+    if version != RESULT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported result format version {version}, expected {RESULT_FORMAT_VERSION}"
+        )
+    return CachedResult(*pickle.loads(zlib.decompress(data[_HEADER.size :])))
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of simulation results, one file per config fingerprint
+
+    Entries are compressed results written atomically (temporary file then rename), so processes
+    sharing the directory never read a partial entry. The modification time of an entry is its
+    last use: reading an entry touches it, and writing one evicts the least recently used entries
+    until the directory fits in max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        """
+        :param directory: Cache directory, created if needed
+        :param max_bytes: Size budget of all the entries together
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + RESULT_SUFFIX)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """
+        Cached result of a fingerprint, None on a miss. Unreadable entries are removed and count as misses.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            result = loads_result(data)
+        except Exception as e:
+            logger.warning("Dropping unreadable cache entry %s: %r", path, e)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # evicted by another process meanwhile
+            pass
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        """
+        Store the result of a fingerprint and evict least recently used entries over the budget
+        """
+        data = dumps_result(result)
+        if len(data) > self.max_bytes:
+            logger.warning(
+                "Result of %s takes %s bytes, more than the cache budget, not cached",
+                key,
+                len(data),
+            )
+            return
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """
+        (last use, size, path) of every entry, least recently used first
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(RESULT_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove least recently used entries until the cache fits in max_bytes
+
+        :param keep: Entry that is never removed, the one just written
+        :return: Number of entries removed
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("Evicted %s result cache entries", removed)
+        return removed
+
+    def clear(self) -> None:
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
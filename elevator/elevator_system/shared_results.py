@@ -0,0 +1,102 @@
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from elevator.elevator_system.passenger import PassengerTable
+
+# int64 columns of a shared passenger table, in block order
+SHARED_COLUMNS = (
+    "arrival_time",
+    "source",
+    "dest",
+    "board_time",
+    "exit_time",
+    "assigned_elevator",
+    "flags",
+)
+# Block header: number of rows and size of the utf-8 passenger id blob
+_HEADER_ITEMS = 2
+_ITEM_SIZE = array("q").itemsize
+
+
+def prepare_shared_results() -> None:
+    """
+    Start the shared memory tracker in the parent before worker processes are created, so
+    that blocks created by workers and unlinked by the parent are tracked in one place
+    """
+    resource_tracker.ensure_running()
+
+
+def write_shared_table(table: PassengerTable) -> str:
+    """
+    Copy a passenger table into a new shared memory block, for a worker process to hand its
+    results to the parent without pickling them. The block is left for read_shared_table to unlink.
+
+    Layout, int64 unless noted: rows, id blob size, one column of rows values per SHARED_COLUMNS,
+    rows + 1 id offsets, then the utf-8 id blob (bytes)
+
+    :param table: Passengers to copy
+    :return: Name of the block
+    """
+    rows = len(table)
+    encoded = [pid.encode("utf-8") for pid in table.ids]
+    offsets = array("q", [0])
+    for pid in encoded:
+        offsets.append(offsets[-1] + len(pid))
+    blob = b"".join(encoded)
+    items = _HEADER_ITEMS + rows * len(SHARED_COLUMNS) + rows + 1
+    block = SharedMemory(create=True, size=items * _ITEM_SIZE + max(len(blob), 1))
+    try:
+        buf = block.buf
+        with buf[: _HEADER_ITEMS * _ITEM_SIZE].cast("q") as header:
+            header[0] = rows
+            header[1] = len(blob)
+        start = _HEADER_ITEMS * _ITEM_SIZE
+        for column in SHARED_COLUMNS:
+            values = getattr(table, column)
+            if values.typecode != "q":
+                values = array("q", values)
+            with buf[start : start + rows * _ITEM_SIZE].cast("q") as cells:
+                cells[:] = values
+            start += rows * _ITEM_SIZE
+        with buf[start : start + (rows + 1) * _ITEM_SIZE].cast("q") as cells:
+            cells[:] = offsets
+        start += (rows + 1) * _ITEM_SIZE
+        buf[start : start + len(blob)] = blob
+        del buf
+        return block.name
+    finally:
+        block.close()
+
+
+def read_shared_table(name: str) -> PassengerTable:
+    """
+    Copy a block written by write_shared_table back into a passenger table and free the block
+    """
+    block = SharedMemory(name=name)
+    try:
+        buf = block.buf
+        with buf[: _HEADER_ITEMS * _ITEM_SIZE].cast("q") as header:
+            rows, blob_size = header[0], header[1]
+        table = PassengerTable()
+        start = _HEADER_ITEMS * _ITEM_SIZE
+        column_size = rows * _ITEM_SIZE
+        for column in SHARED_COLUMNS:
+            values = array("q")
+            values.frombytes(buf[start : start + column_size])
+            if getattr(table, column).typecode != "q":
+                values = array(getattr(table, column).typecode, values)
+            setattr(table, column, values)
+            start += column_size
+        offsets = array("q")
+        offsets.frombytes(buf[start : start + column_size + _ITEM_SIZE])
+        start += column_size + _ITEM_SIZE
+        blob = bytes(buf[start : start + blob_size])
+        del buf
+        table.ids = [
+            blob[offsets[row] : offsets[row + 1]].decode("utf-8") for row in range(rows)
+        ]
+        return table
+    finally:
+        block.close()
+        block.unlink()
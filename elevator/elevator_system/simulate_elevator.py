@@ -1,120 +1,620 @@
 import logging
-from collections import deque
-from typing import List, Optional, Deque
-from elevator.elevator_system.passenger import Passenger
-from elevator.elevator_system.elevator import Elevator
+import os
+from time import perf_counter
+from typing import Iterable, List, Optional, Tuple, Union
+from elevator.elevator_system.passenger import Passenger, PassengerTable
+from elevator.elevator_system.events import EventSink, EventType, SimulationEvent
+from elevator.elevator_system.arrival_schedule import ArrivalSchedule
+from elevator.elevator_system.waiting_room import WaitingRoom
+from elevator.elevator_system.elevator import (
+    DOWN,
+    DROPPING_OFF,
+    IDLE,
+    LOADING,
+    MOVING_TO_PICKUP,
+    NO_DIRECTION,
+    STATE_NAMES,
+    UP,
+    Elevator,
+)
 from elevator.elevator_system.load_balancer import LoadBalancer
+from elevator.elevator_system.parking import DemandParking
+from elevator.elevator_system.zoning import ZoneController
+from elevator.elevator_system.checkpoint import save_checkpoint
+from elevator.elevator_system.journey_stats import JourneyStats
+from elevator.elevator_system.profiling import ADVANCE_PHASE, SimulationStats
+from elevator.elevator_system.telemetry import TelemetrySink
+from utils.request_file import read_request_file
 
 logger = logging.getLogger("ElevatorLogger")
 
+TIME_ADVANCE_MODES = ("tick", "event")
+# "greedy" assigns waiting passengers one by one, "batch" matches them all together
+ASSIGNMENT_MODES = ("greedy", "batch")
 
-def simulate_elevator_system(
-    requests: List[tuple], zone_map: dict, max_time: int
-) -> None:
-    """
-    Function to simulate elevator system
 
-    :param requests: Passenger requests, details are extracted from run_config
-    :param zone_map: Zone map for the elevators
-    :param max_time: Max time for the simulation
-    """
-    passengers: List[Passenger] = [Passenger(*req) for req in requests]
-    waiting_passengers: Deque[Passenger] = deque()
-
-    elevators: List[Elevator] = [
-        Elevator(eid, zone[0], zone[0], zone[-1]) for eid, zone in zone_map.items()
-    ]
-    load_balancer: LoadBalancer = LoadBalancer(elevators)
-
-    for current_time in range(max_time):
-        logger.info(f"Time {current_time}: {', '.join(map(str, elevators))}")
-        new_arrivals = [p for p in passengers if p.arrival_time == current_time]
-        waiting_passengers.extend(new_arrivals)
-        for passenger in list(waiting_passengers):
-            if not passenger.is_assigned:
-                assigned_elevator = load_balancer.assign_elevator(
-                    passenger, waiting_passengers
+class ElevatorSimulation:
+    def __init__(
+        self,
+        requests: Union[Iterable[tuple], str, os.PathLike],
+        zone_map: dict,
+        event_sink: Optional[EventSink] = None,
+        max_capacity: Optional[int] = None,
+        profile: bool = False,
+        assignment: str = "greedy",
+        journey_stats: Optional[JourneyStats] = None,
+        telemetry: Optional[TelemetrySink] = None,
+        parking: Optional[DemandParking] = None,
+        zoning: Optional[ZoneController] = None,
+    ) -> None:
+        if assignment not in ASSIGNMENT_MODES:
+            raise ValueError(
+                f"assignment must be one of {ASSIGNMENT_MODES}, got {assignment!r}"
+            )
+        # A request file can be reopened when resuming from a checkpoint, other streams are passed again
+        self.requests_path: Optional[str] = None
+        self.zone_map: dict = zone_map
+        if isinstance(requests, (str, os.PathLike)):
+            self.requests_path = os.fspath(requests)
+            requests = read_request_file(requests, zone_map)
+        self.schedule: ArrivalSchedule = ArrivalSchedule(requests)
+        # Every passenger read so far in request order, grows as a request stream is consumed
+        self.passengers: PassengerTable = self.schedule.passengers
+        self.waiting_room: WaitingRoom = WaitingRoom()
+
+        self.elevators: List[Elevator] = [
+            Elevator(eid, zone[0], zone[0], zone[-1], max_capacity)
+            for eid, zone in zone_map.items()
+        ]
+        self.load_balancer: LoadBalancer = LoadBalancer(self.elevators)
+        self.assignment: str = assignment
+        self.assignments: int = 0
+        # Assignment attempts that found no available elevator
+        self.failed_assignments: int = 0
+        # Passengers that have arrived and not exited yet
+        self.in_system: int = 0
+        # Time of the last simulated tick, -1 before the first one
+        self.current_time: int = -1
+        # Time of the next tick to simulate, run continues from there
+        self.next_time: int = 0
+        self.event_sink: Optional[EventSink] = event_sink
+        self._states: List[int] = [e.state for e in self.elevators]
+        # Per-phase timings, only collected when profiling is on
+        self.stats: Optional[SimulationStats] = SimulationStats() if profile else None
+        # Wait and journey time percentiles, updated as passengers board and exit when set
+        self.journey_stats: Optional[JourneyStats] = journey_stats
+        # Records the status of every elevator at the end of every tick when set
+        self.telemetry: Optional[TelemetrySink] = telemetry
+        # Moves the park floors of idle elevators toward the recent calls when set
+        self.parking: Optional[DemandParking] = parking
+        # Rebalances the elevator zones with the recent demand when set
+        self.zoning: Optional[ZoneController] = zoning
+        self.checkpoint_every: Optional[int] = None
+        self.checkpoint_path: Optional[str] = None
+        self._next_checkpoint: int = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # Sinks and telemetry writers usually hold open files or callbacks, a resumed run gets its own
+        state["event_sink"] = None
+        state["telemetry"] = None
+        return state
+
+    def tick(self, current_time: int) -> None:
+        """
+        Run a single time step of the simulation
+
+        :param current_time: Time of the step
+        """
+        self.current_time = current_time
+        if self.stats is not None:
+            self._profiled_tick(current_time)
+            return
+
+        self._log_snapshot(current_time)
+        self._arrivals(current_time)
+        if self.assignment == "batch":
+            self._assign_batch(current_time)
+        else:
+            self._assign(current_time)
+        self._adjust_zones(current_time)
+        self._idle_pickups(current_time)
+        self._board(current_time)
+        self._move(current_time)
+        if self.telemetry is not None:
+            self.telemetry.record(current_time, self.elevators, self.waiting_room)
+
+    def _profiled_tick(self, current_time: int) -> None:
+        """
+        Same as tick, timing every phase into self.stats
+        """
+        stats = self.stats
+        phases = stats.phases
+        clock = perf_counter
+
+        started = clock()
+        self._log_snapshot(current_time)
+        self._arrivals(current_time)
+        now = clock()
+        phases["arrivals"].record(now - started)
+        for phase, step in (
+            (
+                "assignment",
+                self._assign_batch if self.assignment == "batch" else self._assign,
+            ),
+            ("adjust_zone", self._adjust_zones),
+            ("idle_pickup", self._idle_pickups),
+            ("boarding", self._board),
+            ("move", self._move),
+        ):
+            started = now
+            step(current_time)
+            now = clock()
+            phases[phase].record(now - started)
+        if self.telemetry is not None:
+            self.telemetry.record(current_time, self.elevators, self.waiting_room)
+
+        stats.ticks += 1
+        stats.assignments = self.assignments
+        stats.failed_assignments = self.failed_assignments
+
+    def _log_snapshot(self, current_time: int) -> None:
+        """
+        Log the status of every elevator, only built at trace verbosity (DEBUG)
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Time %s: %s", current_time, ", ".join(map(str, self.elevators))
+            )
+
+    def _arrivals(self, current_time: int) -> None:
+        waiting_room = self.waiting_room
+        parking = self.parking
+        zoning = self.zoning
+        for passenger in self.schedule.pop_arrivals(current_time):
+            waiting_room.add(passenger)
+            self.in_system += 1
+            if parking is not None:
+                parking.observe(current_time, passenger.source)
+            if zoning is not None:
+                zoning.observe(current_time, passenger.source)
+        if parking is not None:
+            parking.update(current_time, self.elevators)
+
+    def add_call(
+        self, arrival_time: int, pid: str, source: int, dest: int
+    ) -> Passenger:
+        """
+        Put a passenger in the waiting room right away, for callers that arrive while the
+        simulation runs instead of through the request schedule. It is assigned on the next tick.
+
+        :param arrival_time: Time of the call, normally the next tick
+        :param pid: Passenger id
+        :param source: Pickup floor
+        :param dest: Destination floor
+        :return: The passenger
+        """
+        passenger = self.passengers.view(
+            self.passengers.add(arrival_time, pid, source, dest)
+        )
+        self.waiting_room.add(passenger)
+        self.in_system += 1
+        if self.parking is not None:
+            self.parking.observe(arrival_time, source)
+        if self.zoning is not None:
+            self.zoning.observe(arrival_time, source)
+        return passenger
+
+    def _assign(self, current_time: int) -> None:
+        waiting_room = self.waiting_room
+        for passenger in waiting_room.unassigned():
+            assigned_elevator = self.load_balancer.assign_elevator(
+                passenger, waiting_room
+            )
+            if assigned_elevator:
+                self._apply_assignment(passenger, assigned_elevator, current_time)
+            else:
+                self.failed_assignments += 1
+        if self.event_sink is not None:
+            self._emit_state_changes(current_time)
+
+    def _assign_batch(self, current_time: int) -> None:
+        """
+        Assign the waiting passengers with LoadBalancer.assign_batch, until no more of them fit
+        Elevators that were idle get their direction from their first passenger, a second round
+        then fills them with passengers going the same way
+        """
+        waiting_room = self.waiting_room
+        load_balancer = self.load_balancer
+        pairs = load_balancer.assign_batch(waiting_room.unassigned(), waiting_room)
+        while pairs:
+            for passenger, elevator in pairs:
+                self._apply_assignment(passenger, elevator, current_time)
+            pairs = load_balancer.assign_batch(waiting_room.unassigned(), waiting_room)
+
+        unassigned = waiting_room.unassigned_count()
+        self.failed_assignments += unassigned
+        if unassigned and logger.isEnabledFor(logging.DEBUG):
+            for passenger in waiting_room.unassigned():
+                if not passenger.no_assigned_elevator_logging:
+                    passenger.no_assigned_elevator_logging = True
+                    logger.debug("No available elevator for Passenger %s", passenger.id)
+        if self.event_sink is not None:
+            self._emit_state_changes(current_time)
+
+    def _apply_assignment(
+        self, passenger: Passenger, elevator: Elevator, current_time: int
+    ) -> None:
+        passenger.is_assigned = True
+        passenger.assigned_elevator = elevator.eid
+        self.waiting_room.assign(passenger, elevator.eid)
+        elevator.update_route(passenger.source, passenger.dest)
+        if elevator.state == IDLE:
+            elevator.state = MOVING_TO_PICKUP
+        self.assignments += 1
+        logger.info(
+            "Time %s: Passenger %s assigned to Elevator %s",
+            current_time,
+            passenger.id,
+            elevator.eid,
+        )
+        if self.event_sink is not None:
+            self.event_sink.emit(
+                SimulationEvent(
+                    current_time,
+                    EventType.ASSIGNED,
+                    elevator.eid,
+                    passenger.id,
+                    passenger.source,
                 )
-                if assigned_elevator:
-                    passenger.is_assigned = True
-                    passenger.assigned_elevator = assigned_elevator.eid
-                    assigned_elevator.update_route(passenger.source, passenger.dest)
-                    if assigned_elevator.state == "idle":
-                        assigned_elevator.state = "moving_to_pickup"
-                    logger.info(
-                        f"Time {current_time}: Passenger {passenger.id} assigned to Elevator {assigned_elevator.eid}"
-                    )
+            )
 
-        for elevator in elevators:
-            elevator.adjust_zone(waiting_passengers)
-
-        for elevator in elevators:
-            if elevator.state == "idle":
-                assigned_waiters = [
-                    p
-                    for p in waiting_passengers
-                    if p.is_assigned and p.assigned_elevator == elevator.eid
-                ]
-                if assigned_waiters:
-                    pickup_floor = min(
-                        [p.source for p in assigned_waiters],
-                        key=lambda s: abs(elevator.current_floor - s),
+    def _adjust_zones(self, current_time: int) -> None:
+        sink = self.event_sink
+        zones_changed = False
+        if self.zoning is not None:
+            for elevator, previous_zone in self.zoning.update(
+                current_time,
+                self.elevators,
+                self.load_balancer,
+                park=self.parking is None,
+            ):
+                if sink is not None:
+                    sink.emit(
+                        SimulationEvent(
+                            current_time,
+                            EventType.ZONE_REBALANCED,
+                            elevator.eid,
+                            previous=previous_zone,
+                            current=(elevator.zone_start, elevator.zone_end),
+                        )
                     )
-                    if pickup_floor not in elevator.pickups:
-                        elevator.pickups.append(pickup_floor)
+        for elevator in self.elevators:
+            previous_zone = (elevator.zone_start, elevator.zone_end)
+            if elevator.adjust_zone(self.waiting_room):
+                zones_changed = True
+                if sink is not None:
+                    sink.emit(
+                        SimulationEvent(
+                            current_time,
+                            EventType.ZONE_EXPANDED,
+                            elevator.eid,
+                            previous=previous_zone,
+                            current=(elevator.zone_start, elevator.zone_end),
+                        )
+                    )
+        if zones_changed:
+            self.load_balancer.rebuild_zones()
 
-                        if elevator.direction is None:
+    def _idle_pickups(self, current_time: int) -> None:
+        waiting_room = self.waiting_room
+        for elevator in self.elevators:
+            if elevator.state == IDLE:
+                pickup_floor = waiting_room.nearest_source(
+                    elevator.eid, elevator.current_floor
+                )
+                if pickup_floor is not None:
+                    if pickup_floor not in elevator.pickups:
+                        if elevator.direction == NO_DIRECTION:
                             elevator.direction = (
-                                "up"
-                                if pickup_floor >= elevator.current_floor
-                                else "down"
+                                UP if pickup_floor >= elevator.current_floor else DOWN
                             )
-                        (
-                            elevator.pickups.sort()
-                            if elevator.direction == "up"
-                            else elevator.pickups.sort(reverse=True)
+                        elevator.pickups.add(
+                            pickup_floor, descending=elevator.direction != UP
                         )
-                    elevator.state = "moving_to_pickup"
+                    elevator.state = MOVING_TO_PICKUP
                     logger.info(
-                        f"Time {current_time}: Elevator {elevator.eid} switching to pickup mode with next pickup floor {pickup_floor}."
+                        "Time %s: Elevator %s switching to pickup mode with next pickup floor %s.",
+                        current_time,
+                        elevator.eid,
+                        pickup_floor,
                     )
+        if self.event_sink is not None:
+            self._emit_state_changes(current_time)
 
-        for elevator in elevators:
-            if elevator.state == "loading":
-                boarding = [
-                    p
-                    for p in waiting_passengers
-                    if p.source == elevator.current_floor
-                    and p.assigned_elevator == elevator.eid
-                ]
+    def _board(self, current_time: int) -> None:
+        waiting_room = self.waiting_room
+        sink = self.event_sink
+        journey_stats = self.journey_stats
+        for elevator in self.elevators:
+            if elevator.state == LOADING:
                 available = elevator.capacity - len(elevator.passengers)
-                for p in boarding[:available]:
-                    waiting_passengers.remove(p)
+                for p in waiting_room.board(
+                    elevator.eid, elevator.current_floor, available
+                ):
                     elevator.passengers.append(p)
                     p.board_time = current_time
+                    if journey_stats is not None:
+                        journey_stats.boarded(
+                            elevator.eid, p.source, current_time - p.arrival_time
+                        )
                     logger.info(
-                        f"Time {current_time}: Passenger {p.id} boarded Elevator {elevator.eid}"
+                        "Time %s: Passenger %s boarded Elevator %s",
+                        current_time,
+                        p.id,
+                        elevator.eid,
                     )
+                    if sink is not None:
+                        sink.emit(
+                            SimulationEvent(
+                                current_time,
+                                EventType.BOARDED,
+                                elevator.eid,
+                                p.id,
+                                elevator.current_floor,
+                            )
+                        )
 
                 if elevator.pickups:
 
-                    elevator.state = "moving_to_pickup"
-                    if all(elevator.current_floor < p for p in elevator.pickups):
-                        elevator.direction = "up"
+                    elevator.state = MOVING_TO_PICKUP
+                    if elevator.current_floor < elevator.pickups.lowest():
+                        elevator.direction = UP
                     else:
-                        elevator.direction = "down"
+                        elevator.direction = DOWN
                 elif elevator.destinations or elevator.passengers:
 
-                    elevator.state = "dropping_off"
-                    if all(elevator.current_floor < d for d in elevator.destinations):
-                        elevator.direction = "up"
+                    elevator.state = DROPPING_OFF
+                    destinations = elevator.destinations
+                    if (
+                        not destinations
+                        or elevator.current_floor < destinations.lowest()
+                    ):
+                        elevator.direction = UP
                     else:
-                        elevator.direction = "down"
+                        elevator.direction = DOWN
                 else:
-                    elevator.state = "idle"
+                    elevator.state = IDLE
+        if sink is not None:
+            self._emit_state_changes(current_time)
+
+    def _move(self, current_time: int) -> None:
+        sink = self.event_sink
+        journey_stats = self.journey_stats
+        for elevator in self.elevators:
+            dropped = elevator.move(current_time)
+            self.in_system -= len(dropped)
+            if journey_stats is not None:
+                for p in dropped:
+                    journey_stats.exited(
+                        elevator.eid, p.source, current_time - p.arrival_time
+                    )
+            if sink is not None:
+                for p in dropped:
+                    sink.emit(
+                        SimulationEvent(
+                            current_time, EventType.EXITED, elevator.eid, p.id, p.dest
+                        )
+                    )
+        if sink is not None:
+            self._emit_state_changes(current_time)
+
+    def _emit_state_changes(self, current_time: int) -> None:
+        """
+        Emit a STATE_CHANGE event for every elevator whose state changed since the last call
+        Each phase of a tick changes an elevator state at most once, so calling this after
+        every phase reports every transition
+        """
+        for idx, elevator in enumerate(self.elevators):
+            previous = self._states[idx]
+            if elevator.state != previous:
+                self._states[idx] = elevator.state
+                self.event_sink.emit(
+                    SimulationEvent(
+                        current_time,
+                        EventType.STATE_CHANGE,
+                        elevator.eid,
+                        floor=elevator.current_floor,
+                        previous=STATE_NAMES[previous],
+                        current=STATE_NAMES[elevator.state],
+                    )
+                )
+
+    def is_complete(self) -> bool:
+        """
+        Checks whether every passenger has reached their destination
+        """
+        return self.in_system == 0 and self.schedule.exhausted()
+
+    def run(
+        self,
+        max_time: int,
+        time_advance: str = "tick",
+        checkpoint_every: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+    ) -> Optional[SimulationStats]:
+        """
+        Run the simulation until every passenger has exited or max_time is reached
+        A simulation stopped at max_time, or restored from a checkpoint, continues from
+        where it stopped when run again
+
+        :param max_time: Max time for the simulation
+        :param time_advance: "tick" steps through every time unit, "event" jumps straight
+            to the next time at which something other than elevator travel happens
+        :param checkpoint_every: Save a checkpoint to checkpoint_path every this many simulated ticks
+        :param checkpoint_path: Checkpoint file, overwritten by every new checkpoint
+        :return: The per-phase stats of the run when profiling is on, else None
+        """
+        if checkpoint_every is not None and (
+            checkpoint_every <= 0 or checkpoint_path is None
+        ):
+            raise ValueError(
+                "checkpoint_every must be positive and needs a checkpoint_path"
+            )
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_path = checkpoint_path
+        if checkpoint_every is not None:
+            self._next_checkpoint = self.next_time + checkpoint_every
 
-        for elevator in elevators:
-            elevator.move(current_time)
+        if time_advance == "tick":
+            for current_time in range(self.next_time, max_time):
+                self.tick(current_time)
+                self.next_time = current_time + 1
+                if self.is_complete():
+                    break
+                self._maybe_checkpoint()
+        elif time_advance == "event":
+            self._run_events(max_time)
+        else:
+            raise ValueError(
+                f"time_advance must be one of {TIME_ADVANCE_MODES}, got {time_advance!r}"
+            )
+        return self.stats
 
-        if all(p.exit_time is not None for p in passengers):
-            break
+    def _run_events(self, max_time: int) -> None:
+        """
+        Discrete-event driver, produces the same boarding and exit times as the tick driver
+
+        A tick that changes nothing but elevator floors is followed by ticks that only move
+        elevators, until the next arrival or until a car reaches its next target. Those ticks
+        are skipped by moving every elevator the whole distance at once.
+        """
+        current_time = self.next_time
+        while current_time < max_time:
+            before = self._route_signature()
+            self.tick(current_time)
+            self.next_time = current_time + 1
+            if self.is_complete():
+                break
+            next_time = current_time + 1
+            if self._route_signature() == before and not any(
+                e.state == LOADING for e in self.elevators
+            ):
+                started = perf_counter() if self.stats is not None else 0.0
+                next_time = self._next_event_time(current_time, max_time)
+                for elevator in self.elevators:
+                    elevator.advance(next_time - current_time - 1)
+                if self.telemetry is not None and next_time - current_time > 1:
+                    # Where the skipped stretch ends, the ticks in between are inferred from it
+                    self.telemetry.record(
+                        next_time - 1, self.elevators, self.waiting_room
+                    )
+                if self.stats is not None:
+                    self.stats.phases[ADVANCE_PHASE].record(perf_counter() - started)
+                    self.stats.skipped_ticks += next_time - current_time - 1
+            current_time = next_time
+            self.next_time = next_time
+            self._maybe_checkpoint()
+
+    def _maybe_checkpoint(self) -> None:
+        """
+        Save a checkpoint once checkpoint_every ticks have passed since the last one
+        """
+        if (
+            self.checkpoint_every is not None
+            and self.next_time >= self._next_checkpoint
+        ):
+            save_checkpoint(self, self.checkpoint_path)
+            self._next_checkpoint = self.next_time + self.checkpoint_every
+
+    def _next_event_time(self, current_time: int, max_time: int) -> int:
+        """
+        Earliest time after current_time at which an arrival happens or an elevator reaches its target
+        Returns max_time if nothing will ever happen again
+        """
+        candidates: List[int] = [max_time]
+        next_arrival = self.schedule.next_arrival_time()
+        if next_arrival is not None:
+            candidates.append(next_arrival)
+        if self.parking is not None:
+            candidates.append(self.parking.next_replan)
+        if self.zoning is not None:
+            candidates.append(self.zoning.next_replan)
+        for elevator in self.elevators:
+            ticks = elevator.ticks_to_next_event()
+            if ticks is not None:
+                candidates.append(current_time + 1 + ticks)
+        return min(candidates)
+
+    def _route_signature(self) -> Tuple:
+        """
+        Everything in the system except elevator floors, used to detect ticks where only travel happened
+        """
+        return self.assignments, tuple(
+            (
+                e.state,
+                e.direction,
+                tuple(e.pickups),
+                tuple(e.destinations),
+                len(e.passengers),
+                e.zone_start,
+                e.zone_end,
+            )
+            for e in self.elevators
+        )
+
+
+def simulate_elevator_system(
+    requests: Union[Iterable[tuple], str, os.PathLike],
+    zone_map: dict,
+    max_time: int,
+    time_advance: str = "tick",
+    event_sink: Optional[EventSink] = None,
+    max_capacity: Optional[int] = None,
+    profile: bool = False,
+    checkpoint_every: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    assignment: str = "greedy",
+    journey_stats: Optional[JourneyStats] = None,
+    telemetry: Optional[TelemetrySink] = None,
+    parking: Optional[DemandParking] = None,
+    zoning: Optional[ZoneController] = None,
+) -> ElevatorSimulation:
+    """
+    Function to simulate elevator system
+
+    :param requests: Passenger requests, details are extracted from run_config. A list is sorted by time
+        up front, any other iterable (e.g. generate_traffic) must yield requests in time order and is read lazily.
+        A path to a CSV or JSONL request file is streamed the same way, see utils/request_file.py
+    :param zone_map: Zone map for the elevators
+    :param max_time: Max time for the simulation
+    :param time_advance: "tick" to step through every time unit, "event" to skip idle stretches
+    :param event_sink: Optional sink receiving assignment, boarding, exit, zone and state events
+    :param max_capacity: Elevator max capacity, defaults to simulation_config["max_capacity"]
+    :param profile: Time every phase of every tick, the result is in simulation.stats
+    :param checkpoint_every: Save a checkpoint every this many simulated ticks, see checkpoint.py
+    :param checkpoint_path: Checkpoint file, overwritten by every new checkpoint
+    :param assignment: "greedy" assigns waiting passengers one by one in arrival order, "batch"
+        matches all of them to the elevators at once at the lowest total pickup distance
+    :param journey_stats: Accumulates wait and journey time percentiles during the run
+    :param telemetry: Receives the floor, state, load and queue lengths of every elevator on every simulated tick,
+        a TelemetryRecorder (Parquet) or a TelemetryBuffer (queryable, in memory)
+    :param parking: Parks idle elevators near the recent calls instead of their original floor, see parking.py
+    :param zoning: Moves the zone boundaries so every elevator serves the same share of the recent calls,
+        idle elevators park at the bottom of their new zone unless parking is set, see zoning.py
+    :return: The finished simulation, passengers hold their boarding and exit times
+    """
+    simulation = ElevatorSimulation(
+        requests,
+        zone_map,
+        event_sink,
+        max_capacity,
+        profile,
+        assignment,
+        journey_stats,
+        telemetry,
+        parking,
+        zoning,
+    )
+    simulation.run(max_time, time_advance, checkpoint_every, checkpoint_path)
+    return simulation
@@ -0,0 +1,404 @@
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Tuple
+
+from elevator.elevator_system.elevator import IDLE, Elevator
+from elevator.elevator_system.waiting_room import WaitingRoom
+
+if TYPE_CHECKING:
+    from utils.columnar_output import ColumnarWriter
+
+# Telemetry columns and their array typecodes, one row per elevator per simulated tick
+TELEMETRY_COLUMNS: Dict[str, str] = {
+    "time": "q",
+    "elevator": "i",
+    "floor": "i",
+    # State and direction codes, see STATE_NAMES and DIRECTION_NAMES in elevator.py
+    "state": "b",
+    "direction": "b",
+    # Passengers on board
+    "load": "i",
+    # Queue lengths: pickup and destination stops, and waiting passengers assigned to the elevator
+    "pickups": "i",
+    "destinations": "i",
+    "waiting": "i",
+}
+
+# Rows handed to the writer at once
+DEFAULT_TELEMETRY_BATCH_ROWS = 65536
+
+
+class TelemetrySink:
+    """
+    Receives the status of every elevator at the end of every simulated tick, the base sink discards it
+    """
+
+    def record(
+        self,
+        current_time: int,
+        elevators: Iterable[Elevator],
+        waiting_room: WaitingRoom,
+    ) -> None:
+        pass
+
+
+class TelemetryRecorder(TelemetrySink):
+    """
+    Elevator telemetry of every simulated tick, recorded into typed column arrays
+
+    With a writer the columns are handed over every batch_rows rows and then cleared, so memory
+    stays bounded however long the run. Without one every row is kept in columns.
+    In event time advance, of each stretch of ticks skipped while elevators only travel only the last
+    tick is recorded.
+    """
+
+    def __init__(
+        self,
+        writer: Optional["ColumnarWriter"] = None,
+        batch_rows: int = DEFAULT_TELEMETRY_BATCH_ROWS,
+    ) -> None:
+        """
+        :param writer: Receives the recorded columns batch by batch, see utils/columnar_output.py
+        :param batch_rows: Number of rows per batch, only used with a writer
+        """
+        if batch_rows <= 0:
+            raise ValueError("batch_rows must be positive")
+        self.writer: Optional["ColumnarWriter"] = writer
+        self.batch_rows: int = batch_rows
+        self.columns: Dict[str, array] = self._new_columns()
+        self.rows: int = 0
+
+    @staticmethod
+    def _new_columns() -> Dict[str, array]:
+        return {name: array(code) for name, code in TELEMETRY_COLUMNS.items()}
+
+    def record(
+        self,
+        current_time: int,
+        elevators: Iterable[Elevator],
+        waiting_room: WaitingRoom,
+    ) -> None:
+        """
+        Record one row per elevator, the status at the end of the tick
+        """
+        columns = self.columns
+        time, eid, floor, state, direction, load, pickups, destinations, waiting = (
+            columns[name] for name in TELEMETRY_COLUMNS
+        )
+        for elevator in elevators:
+            time.append(current_time)
+            eid.append(elevator.eid)
+            floor.append(elevator.current_floor)
+            state.append(elevator.state)
+            direction.append(elevator.direction)
+            load.append(len(elevator.passengers))
+            pickups.append(len(elevator.pickups))
+            destinations.append(len(elevator.destinations))
+            waiting.append(waiting_room.assigned_count(elevator.eid))
+            self.rows += 1
+        if self.writer is not None and len(time) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Hand the rows recorded since the last flush to the writer
+        """
+        if self.writer is None or not len(self.columns["time"]):
+            return
+        self.writer.write_batch(self.columns)
+        self.columns = self._new_columns()
+
+
+class CarTrack:
+    """
+    Floor, state and load history of one elevator, delta and run-length encoded
+
+    A run is a stretch of ticks with the same state and load during which the floor changes by the
+    same step every tick: 0 while parked, loading or idle, +1/-1 while travelling. The floor at
+    tick t of a run is floor + step * (t - start), so a parked stretch or a whole trip between two
+    stops is a single run whatever its length. Runs are stored in fixed-width typed arrays.
+
+    With max_runs the arrays are a ring buffer: once full, each new run overwrites the oldest one
+    and the history starts at the oldest run kept.
+    """
+
+    __slots__ = (
+        "eid",
+        "max_runs",
+        "start",
+        "floor",
+        "step",
+        "state",
+        "load",
+        "head",
+        "count",
+        "last_time",
+        "dropped",
+    )
+
+    def __init__(self, eid: int, max_runs: Optional[int] = None) -> None:
+        """
+        :param eid: Elevator id
+        :param max_runs: Number of runs kept, None keeps every run
+        """
+        if max_runs is not None and max_runs <= 0:
+            raise ValueError("max_runs must be positive")
+        self.eid: int = eid
+        self.max_runs: Optional[int] = max_runs
+        size = max_runs or 0
+        self.start: array = array("q", bytes(8 * size))
+        self.floor: array = array("i", bytes(4 * size))
+        self.step: array = array("b", bytes(size))
+        self.state: array = array("b", bytes(size))
+        self.load: array = array("i", bytes(4 * size))
+        # Slot of the oldest run and number of runs held
+        self.head: int = 0
+        self.count: int = 0
+        # Last recorded tick, -1 before the first one
+        self.last_time: int = -1
+        # Runs overwritten by the ring buffer
+        self.dropped: int = 0
+
+    def _slot(self, idx: int) -> int:
+        """
+        Array slot of the idx-th oldest run held
+        """
+        if self.max_runs is None:
+            return idx
+        return (self.head + idx) % self.max_runs
+
+    def record(self, current_time: int, floor: int, state: int, load: int) -> None:
+        """
+        Extend the last run with the status at current_time, or start a new run
+
+        Ticks between two records (skipped by the event time advance) must have the state and load of
+        the second record, with the elevator either parked or travelling one floor per tick all along.
+        """
+        if self.count:
+            last = self._slot(self.count - 1)
+            if self.state[last] == state and self.load[last] == load:
+                elapsed = current_time - self.start[last]
+                if self.floor[last] + self.step[last] * elapsed == floor:
+                    self.last_time = current_time
+                    return
+                # The step of a run is only known from its second recorded tick
+                if self.start[last] == self.last_time:
+                    step, remainder = divmod(floor - self.floor[last], elapsed)
+                    if not remainder and -1 <= step <= 1:
+                        self.step[last] = step
+                        self.last_time = current_time
+                        return
+                # A stretch of skipped ticks in which the elevator stopped or started travelling
+                gap = current_time - self.last_time
+                previous = self.floor[last] + self.step[last] * (
+                    self.last_time - self.start[last]
+                )
+                moved = floor - previous
+                if gap > 1 and (moved == 0 or abs(moved) == gap):
+                    step = (moved > 0) - (moved < 0)
+                    self._append(self.last_time + 1, previous + step, state, load, step)
+                    self.last_time = current_time
+                    return
+        self._append(current_time, floor, state, load)
+        self.last_time = current_time
+
+    def _append(
+        self, current_time: int, floor: int, state: int, load: int, step: int = 0
+    ) -> None:
+        if self.max_runs is None:
+            self.start.append(current_time)
+            self.floor.append(floor)
+            self.step.append(step)
+            self.state.append(state)
+            self.load.append(load)
+            self.count += 1
+            return
+        if self.count == self.max_runs:
+            slot = self.head
+            self.head = (self.head + 1) % self.max_runs
+            self.dropped += 1
+        else:
+            slot = self._slot(self.count)
+            self.count += 1
+        self.start[slot] = current_time
+        self.floor[slot] = floor
+        self.step[slot] = step
+        self.state[slot] = state
+        self.load[slot] = load
+
+    @property
+    def first_time(self) -> Optional[int]:
+        """
+        First tick still held, None before the first record
+        """
+        return self.start[self._slot(0)] if self.count else None
+
+    def _find(self, current_time: int) -> Optional[int]:
+        """
+        Index (oldest first) of the run covering current_time, None outside the recorded history
+        """
+        if not self.count or not self.first_time <= current_time <= self.last_time:
+            return None
+        lo, hi = 0, self.count
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self.start[self._slot(mid)] <= current_time:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def status_at(self, current_time: int) -> Optional[Tuple[int, int, int]]:
+        """
+        (floor, state, load) at the end of tick current_time, None outside the recorded history
+        """
+        idx = self._find(current_time)
+        if idx is None:
+            return None
+        slot = self._slot(idx)
+        floor = self.floor[slot] + self.step[slot] * (current_time - self.start[slot])
+        return floor, self.state[slot], self.load[slot]
+
+    def runs(self) -> Iterator[Tuple[int, int, int, int, int, int]]:
+        """
+        (start, end, floor, step, state, load) of every run held, oldest first, end excluded
+        """
+        for idx in range(self.count):
+            slot = self._slot(idx)
+            end = (
+                self.start[self._slot(idx + 1)]
+                if idx + 1 < self.count
+                else self.last_time + 1
+            )
+            yield (
+                self.start[slot],
+                end,
+                self.floor[slot],
+                self.step[slot],
+                self.state[slot],
+                self.load[slot],
+            )
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.start, self.floor, self.step, self.state, self.load)
+        return sum(len(values) * values.itemsize for values in arrays)
+
+
+class TelemetryBuffer(TelemetrySink):
+    """
+    Compact in-memory telemetry of every elevator, queryable while and after the simulation runs
+
+    Each elevator gets a CarTrack, see there for the encoding. Memory grows with the number of
+    stops and state changes rather than with the number of ticks, and max_runs bounds it for
+    runs of any length, keeping the most recent history.
+    """
+
+    def __init__(self, max_runs: Optional[int] = None) -> None:
+        """
+        :param max_runs: Number of runs kept per elevator, None keeps the whole run
+        """
+        if max_runs is not None and max_runs <= 0:
+            raise ValueError("max_runs must be positive")
+        self.max_runs: Optional[int] = max_runs
+        self.tracks: Dict[int, CarTrack] = {}
+
+    def record(
+        self,
+        current_time: int,
+        elevators: Iterable[Elevator],
+        waiting_room: WaitingRoom,
+    ) -> None:
+        tracks = self.tracks
+        for elevator in elevators:
+            track = tracks.get(elevator.eid)
+            if track is None:
+                track = tracks[elevator.eid] = CarTrack(elevator.eid, self.max_runs)
+            track.record(
+                current_time,
+                elevator.current_floor,
+                elevator.state,
+                len(elevator.passengers),
+            )
+
+    def track(self, eid: int) -> CarTrack:
+        if eid not in self.tracks:
+            raise ValueError(f"No telemetry for elevator {eid}")
+        return self.tracks[eid]
+
+    def positions(self, current_time: int) -> Dict[int, Optional[int]]:
+        """
+        Floor of every elevator at the end of tick current_time, None where it is outside the history
+        """
+        positions: Dict[int, Optional[int]] = {}
+        for eid, track in self.tracks.items():
+            status = track.status_at(current_time)
+            positions[eid] = status[0] if status is not None else None
+        return positions
+
+    def status(self, eid: int, current_time: int) -> Optional[Tuple[int, int, int]]:
+        """
+        (floor, state, load) of an elevator at the end of tick current_time, see CarTrack.status_at
+        """
+        return self.track(eid).status_at(current_time)
+
+    def utilization(
+        self, eid: int, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Optional[float]:
+        """
+        Share of the ticks in [start, end) an elevator was not idle, over the recorded history
+
+        :param eid: Elevator id
+        :param start: First tick, defaults to the first tick held
+        :param end: Tick after the last one, defaults to the tick after the last one recorded
+        :return: Busy ticks over recorded ticks in the range, None when none of it was recorded
+        """
+        busy = total = 0
+        for run_start, run_end, _, _, state, _ in self.track(eid).runs():
+            lo = run_start if start is None else max(run_start, start)
+            hi = run_end if end is None else min(run_end, end)
+            if hi <= lo:
+                continue
+            total += hi - lo
+            if state != IDLE:
+                busy += hi - lo
+        return busy / total if total else None
+
+    def mean_load(
+        self, eid: int, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Optional[float]:
+        """
+        Mean number of passengers on board of an elevator over the ticks in [start, end), see utilization
+        """
+        load_ticks = total = 0
+        for run_start, run_end, _, _, _, load in self.track(eid).runs():
+            lo = run_start if start is None else max(run_start, start)
+            hi = run_end if end is None else min(run_end, end)
+            if hi <= lo:
+                continue
+            total += hi - lo
+            load_ticks += load * (hi - lo)
+        return load_ticks / total if total else None
+
+    @property
+    def run_count(self) -> int:
+        return sum(track.count for track in self.tracks.values())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(track.nbytes for track in self.tracks.values())
+
+    def report(self) -> str:
+        """
+        Utilization, mean load and storage of every elevator over the history held
+        """
+        lines = [f"{'elevator':<9} {'ticks':>9} {'runs':>8} {'busy':>7} {'load':>6}"]
+        for eid, track in sorted(self.tracks.items()):
+            ticks = track.last_time - track.first_time + 1 if track.count else 0
+            utilization = self.utilization(eid)
+            mean_load = self.mean_load(eid)
+            lines.append(
+                f"{eid:<9} {ticks:>9} {track.count:>8} "
+                f"{(utilization or 0) * 100:>6.1f}% {mean_load or 0:>6.2f}"
+            )
+        lines.append(f"{self.run_count} runs in {self.nbytes} bytes")
+        return "\n".join(lines)
@@ -0,0 +1,98 @@
+from bisect import insort
+from typing import Dict, List, Optional, Tuple
+
+from elevator.elevator_system.passenger import Passenger
+
+
+class WaitingRoom:
+    def __init__(self) -> None:
+        # Every passenger gets a sequence number on arrival so that waiters are always
+        # handled in arrival order, the same order as a single waiting queue
+        self._next_seq: int = 0
+        self._unassigned: Dict[Passenger, int] = {}
+        # elevator id -> source floor -> [(seq, passenger)] sorted by seq
+        self._assigned: Dict[int, Dict[int, List[Tuple[int, Passenger]]]] = {}
+        self._assigned_counts: Dict[int, int] = {}
+        self._size: int = 0
+
+    def add(self, passenger: Passenger) -> None:
+        """
+        Add a newly arrived passenger, not yet assigned to any elevator
+        """
+        self._unassigned[passenger] = self._next_seq
+        self._next_seq += 1
+        self._size += 1
+
+    def unassigned(self) -> List[Passenger]:
+        """
+        Passengers still waiting for an elevator assignment, in arrival order
+        """
+        return list(self._unassigned)
+
+    def unassigned_count(self) -> int:
+        """
+        Number of passengers still waiting for an elevator assignment
+        """
+        return len(self._unassigned)
+
+    def assign(self, passenger: Passenger, eid: int) -> None:
+        """
+        Index an unassigned passenger under the elevator it was assigned to
+
+        :param passenger: Waiting passenger
+        :param eid: Id of the assigned elevator
+        """
+        seq = self._unassigned.pop(passenger)
+        floors = self._assigned.setdefault(eid, {})
+        insort(floors.setdefault(passenger.source, []), (seq, passenger))
+        self._assigned_counts[eid] = self._assigned_counts.get(eid, 0) + 1
+
+    def assigned_count(self, eid: int) -> int:
+        """
+        Number of waiting passengers assigned to the elevator
+        """
+        return self._assigned_counts.get(eid, 0)
+
+    def source_range(self, eid: int) -> Optional[Tuple[int, int]]:
+        """
+        Lowest and highest pickup floor of the passengers waiting for the elevator, None if there are none
+        """
+        floors = self._assigned.get(eid)
+        if not floors:
+            return None
+        return min(floors), max(floors)
+
+    def nearest_source(self, eid: int, floor: int) -> Optional[int]:
+        """
+        Pickup floor closest to `floor` among the passengers waiting for the elevator
+        Ties go to the floor with the earliest arrival, None if nobody is waiting for the elevator
+        """
+        floors = self._assigned.get(eid)
+        if not floors:
+            return None
+        return min(
+            floors.items(), key=lambda item: (abs(floor - item[0]), item[1][0][0])
+        )[0]
+
+    def board(self, eid: int, floor: int, limit: int) -> List[Passenger]:
+        """
+        Remove and return up to `limit` passengers waiting for the elevator at the floor, in arrival order
+
+        :param eid: Id of the elevator
+        :param floor: Floor the elevator is loading at
+        :param limit: Free capacity of the elevator
+        """
+        floors = self._assigned.get(eid)
+        if not floors or floor not in floors or limit <= 0:
+            return []
+        waiters = floors[floor]
+        boarding = [p for _, p in waiters[:limit]]
+        del waiters[:limit]
+        if not waiters:
+            del floors[floor]
+        self._assigned_counts[eid] -= len(boarding)
+        self._size -= len(boarding)
+        return boarding
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,146 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from elevator.config_options import ZONING_MODES
+from elevator.elevator_system.call_window import CallWindow
+from elevator.elevator_system.elevator import Elevator
+from elevator.elevator_system.load_balancer import LoadBalancer
+
+logger = logging.getLogger("ElevatorLogger")
+
+
+def balanced_zone_starts(
+    lowest: int, highest: int, counts: Dict[int, int], k: int
+) -> Optional[List[int]]:
+    """
+    First floors of k contiguous zones over lowest..highest with about the same number of calls each
+
+    Every boundary goes to the floor edge where the calls below it are closest to its share of the total,
+    each zone keeps at least one floor. Takes O(n + k) for n floors.
+
+    :param lowest: Lowest floor of the first zone
+    :param highest: Highest floor of the last zone
+    :param counts: Number of calls of every floor
+    :param k: Number of zones
+    :return: k zone start floors, ascending, None if there are fewer floors than zones or no calls
+    """
+    total = sum(counts.get(floor, 0) for floor in range(lowest, highest + 1))
+    if highest - lowest + 1 < k or not total:
+        return None
+    starts = [lowest]
+    seen = 0
+    j = 1
+    for floor in range(lowest, highest + 1):
+        before = seen
+        seen += counts.get(floor, 0)
+        # Compared times k to stay in integers
+        while j < k and seen * k >= total * j:
+            target = total * j
+            start = floor + 1 if seen * k - target <= target - before * k else floor
+            start = max(start, starts[-1] + 1)
+            start = min(start, highest + 1 - (k - j))
+            starts.append(start)
+            j += 1
+    return starts
+
+
+class ZoneController:
+    """
+    Moves the zone boundaries so that every elevator serves about the same share of the recent calls
+
+    The calls are counted by pickup floor in a CallWindow, destinations are left out as during down peak they
+    would pull every boundary down to the lobby. Every replan_every ticks, if the counts changed, the floors are
+    split again with balanced_zone_starts and the new zones are set on the elevators (in the order of their
+    original zones) and on the load balancer together. Idle elevators go back to the bottom of their new zone,
+    unless a parking strategy places them. Elevator.adjust_zone still expands the zones between two replans, the
+    next replan shrinks them back. With no calls in the window the zones are left as they are.
+    """
+
+    def __init__(self, window: int = 900, replan_every: int = 60) -> None:
+        """
+        :param window: Number of ticks of calls the zones follow
+        :param replan_every: Number of ticks between two zone updates
+        """
+        self.demand: CallWindow = CallWindow(window, replan_every)
+        self.replans: int = 0
+
+    @property
+    def next_replan(self) -> int:
+        return self.demand.next_replan
+
+    def observe(self, current_time: int, source: int) -> None:
+        """
+        Count a call made from source at current_time
+        """
+        self.demand.observe(current_time, source)
+
+    def update(
+        self,
+        current_time: int,
+        elevators: List[Elevator],
+        load_balancer: LoadBalancer,
+        park: bool = True,
+    ) -> List[Tuple[Elevator, Tuple[int, int]]]:
+        """
+        Rebalance the zones when a replan is due
+
+        :param park: Move the park floor of the elevators to the bottom of their new zone
+        :return: Elevators whose zone changed, with their previous (zone_start, zone_end)
+        """
+        demand = self.demand
+        if not demand.replan_due(current_time):
+            return []
+        counts = demand.counts
+        if not demand.changed or not counts or not load_balancer.zone_starts:
+            return []
+        demand.changed = False
+
+        lowest = min(load_balancer.zone_starts[0], min(counts))
+        highest = max(load_balancer.zone_stop - 1, max(counts))
+        starts = balanced_zone_starts(lowest, highest, counts, len(elevators))
+        if starts is None or (
+            load_balancer.custom_zones
+            and starts == load_balancer.zone_starts
+            and highest + 1 == load_balancer.zone_stop
+        ):
+            return []
+        self.replans += 1
+        load_balancer.set_zones(starts, highest + 1)
+
+        changed = []
+        bounds = starts + [highest + 1]
+        ordered = sorted(elevators, key=lambda e: (e.original_floor, e.eid))
+        for elevator, start, stop in zip(ordered, bounds, bounds[1:]):
+            previous = (elevator.zone_start, elevator.zone_end)
+            if previous != (start, stop - 1):
+                logger.info(
+                    "Elevator %s: Rebalancing zone from %s-%s to %s-%s",
+                    elevator.eid,
+                    previous[0],
+                    previous[1],
+                    start,
+                    stop - 1,
+                )
+                elevator.zone_start = start
+                elevator.zone_end = stop - 1
+                if park:
+                    elevator.park_floor = start
+                changed.append((elevator, previous))
+        return changed
+
+
+def create_zone_controller(
+    mode: str, window: int = 900, replan_every: int = 60
+) -> Optional[ZoneController]:
+    """
+    Zone controller for ElevatorSimulation, None for "static"
+
+    :param mode: One of ZONING_MODES
+    :param window: See CallWindow
+    :param replan_every: See CallWindow
+    """
+    if mode not in ZONING_MODES:
+        raise ValueError(f"zoning must be one of {ZONING_MODES}, got {mode!r}")
+    if mode == "static":
+        return None
+    return ZoneController(window, replan_every)
@@ -1,28 +1,154 @@
+import os
+from typing import Dict, Optional
+
+from elevator.elevator_system.checkpoint import load_checkpoint
+from elevator.elevator_system.journey_stats import JourneyStats
+from elevator.elevator_system.parking import create_parking
+from elevator.elevator_system.zoning import create_zone_controller
+from elevator.elevator_system.passenger import PassengerTable
+from elevator.elevator_system.result_cache import (
+    CachedResult,
+    ResultCache,
+    config_fingerprint,
+)
 from elevator.elevator_system.simulate_elevator import simulate_elevator_system
-from utils.get_logger import get_logger
-from utils.summary_table import parse_logs_to_csv
+from elevator.elevator_system.telemetry import TelemetryBuffer, TelemetryRecorder
+from utils.columnar_output import open_telemetry_writer, write_passenger_parquet
+from utils.get_logger import close_logger, get_logger
+from utils.summary_table import write_passenger_summary, write_percentile_summary
+from utils.traffic_generator import generate_traffic
 from run_config import run_config, simulation_config
 from validations.config_validation import validate_config
 
-logger = get_logger(log_path=run_config["simulation_logs_path"])
+logger = get_logger(
+    log_path=run_config["simulation_logs_path"],
+    verbosity=simulation_config.get("log_verbosity", "trace"),
+)
+
+
+def write_results(
+    passengers: PassengerTable, journey_stats: Optional[JourneyStats]
+) -> Dict[str, float]:
+    """
+    Write the passenger summary (CSV or Parquet, see output_format), and the percentile summary
+    when journey stats were collected
+
+    :return: Overall wait and total time stats, see summary_stats
+    """
+    if simulation_config.get("output_format", "csv") == "parquet":
+        stats = write_passenger_parquet(
+            passengers, run_config["passenger_parquet_path"]
+        )
+    else:
+        stats = write_passenger_summary(passengers, run_config["passenger_logs_path"])
+    if journey_stats is not None:
+        logger.info("Wait and journey times:\n%s", journey_stats.report())
+        write_percentile_summary(journey_stats, run_config["percentile_summary_path"])
+    return stats
 
 
 def main():
 
+    telemetry_writer = None
     try:
         validate_config(simulation_config)
-        simulate_elevator_system(
-            simulation_config["passenger_requests"],
-            simulation_config["default_zone_mapping"],
-            simulation_config["max_time"],
-        )
-        parse_logs_to_csv(
-            run_config["simulation_logs_path"],
-            run_config["passenger_logs_path"],
-            simulation_config["passenger_requests"],
-        )
+        cache = cache_key = None
+        # A resumed, profiled or telemetry run is always simulated
+        if (
+            simulation_config.get("result_cache", False)
+            and simulation_config.get("resume_from") is None
+            and not simulation_config.get("profile", False)
+            and not simulation_config.get("telemetry", False)
+            and not simulation_config.get("telemetry_buffer", False)
+        ):
+            cache = ResultCache(
+                run_config["result_cache_dir"], run_config["result_cache_max_bytes"]
+            )
+            cache_key = config_fingerprint(simulation_config)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("Results of config %s read from the cache", cache_key)
+                write_results(cached.passengers, cached.journey_stats)
+                return
+
+        requests = simulation_config.get("passenger_requests_path")
+        if requests is None:
+            requests = simulation_config["passenger_requests"]
+        traffic = simulation_config.get("traffic")
+        if traffic:
+            requests = generate_traffic(
+                zone_mapping=simulation_config["default_zone_mapping"], **traffic
+            )
+        checkpoint_every = simulation_config.get("checkpoint_every")
+        checkpoint_path = None
+        if checkpoint_every is not None:
+            checkpoint_path = run_config["checkpoint_path"]
+            os.makedirs(os.path.dirname(checkpoint_path) or ".", exist_ok=True)
+        journey_stats = None
+        if simulation_config.get("journey_stats", False):
+            journey_stats = JourneyStats(
+                simulation_config.get("journey_stats_floor_band", 10)
+            )
+        telemetry = None
+        if simulation_config.get("telemetry", False):
+            telemetry_writer = open_telemetry_writer(run_config["telemetry_path"])
+            telemetry = TelemetryRecorder(telemetry_writer)
+        elif simulation_config.get("telemetry_buffer", False):
+            telemetry = TelemetryBuffer(
+                simulation_config.get("telemetry_buffer_max_runs")
+            )
+        if simulation_config.get("resume_from") is not None:
+            logger.info("Resuming from %s", simulation_config["resume_from"])
+            simulation = load_checkpoint(simulation_config["resume_from"], requests)
+            simulation.telemetry = telemetry
+            simulation.run(
+                simulation_config["max_time"],
+                simulation_config.get("time_advance", "tick"),
+                checkpoint_every,
+                checkpoint_path,
+            )
+        else:
+            simulation = simulate_elevator_system(
+                requests,
+                simulation_config["default_zone_mapping"],
+                simulation_config["max_time"],
+                simulation_config.get("time_advance", "tick"),
+                max_capacity=simulation_config["max_capacity"],
+                profile=simulation_config.get("profile", False),
+                checkpoint_every=checkpoint_every,
+                checkpoint_path=checkpoint_path,
+                assignment=simulation_config.get("assignment", "greedy"),
+                journey_stats=journey_stats,
+                telemetry=telemetry,
+                parking=create_parking(
+                    simulation_config.get("parking", "home"),
+                    simulation_config.get("parking_window", 600),
+                    simulation_config.get("parking_replan_every", 30),
+                ),
+                zoning=create_zone_controller(
+                    simulation_config.get("zoning", "static"),
+                    simulation_config.get("zoning_window", 900),
+                    simulation_config.get("zoning_replan_every", 60),
+                ),
+            )
+        if telemetry_writer is not None:
+            telemetry.flush()
+        if isinstance(telemetry, TelemetryBuffer):
+            logger.info("Elevator telemetry:\n%s", telemetry.report())
+        if simulation.stats is not None:
+            logger.info("Simulation profile:\n%s", simulation.stats.report())
+        stats = write_results(simulation.passengers, simulation.journey_stats)
+        if cache is not None:
+            cache.put(
+                cache_key,
+                CachedResult(simulation.passengers, stats, simulation.journey_stats),
+            )
     except Exception as e:
         logger.exception(e)
+    finally:
+        if telemetry_writer is not None:
+            telemetry_writer.close()
+        close_logger()
 
 
 if __name__ == "__main__":
@@ -6,6 +6,16 @@ any changes in simulation_config should meet all the validations requirements un
 run_config = {
     "simulation_logs_path": "logs/simulation_logs.txt",
     "passenger_logs_path": "summary/passenger_summary.csv",
+    "percentile_summary_path": "summary/percentile_summary.csv",
+    # Written instead of passenger_logs_path when simulation_config output_format is "parquet"
+    "passenger_parquet_path": "summary/passenger_summary.parquet",
+    "telemetry_path": "summary/elevator_telemetry.parquet",
+    "sweep_output_dir": "sweep",
+    "campus_output_dir": "campus",
+    "checkpoint_path": "checkpoints/simulation.ckpt",
+    # Results cache shared by main.py and sweep.py, least recently used entries are evicted over the budget
+    "result_cache_dir": "cache",
+    "result_cache_max_bytes": 256 * 1024 * 1024,
 }
 
 simulation_config = {
@@ -27,7 +37,117 @@ simulation_config = {
         (16, "p8", 45, 1),
         (20, "p9", 1, 50),
     ],
+    # CSV or JSONL file of requests sorted by time, streamed instead of passenger_requests when set,
+    # see utils/request_file.py
+    "passenger_requests_path": None,
     "max_time": 10000,
     # Elevator max capacity
     "max_capacity": 4,
+    # "tick" steps through every time unit, "event" skips stretches where elevators only travel
+    "time_advance": "tick",
+    # Synthetic traffic used instead of passenger_requests when set, e.g.
+    # {"pattern": "up_peak", "rate": 0.5, "seed": 1, "duration": 3600}, see utils/traffic_generator.py
+    "traffic": None,
+    # "greedy" assigns waiting passengers one by one in arrival order, "batch" matches every waiting
+    # passenger to the elevators at once at the lowest total pickup distance (better for lobby bursts)
+    "assignment": "greedy",
+    # Where idle elevators wait: "home" at the bottom of their zone, "demand" spread over the floors the calls
+    # of the last parking_window ticks came from, updated every parking_replan_every ticks
+    "parking": "home",
+    "parking_window": 600,
+    "parking_replan_every": 30,
+    # "static" keeps the zones of default_zone_mapping, "adaptive" splits the floors again every zoning_replan_every
+    # ticks so that each elevator gets the same share of the calls of the last zoning_window ticks
+    "zoning": "static",
+    "zoning_window": 900,
+    "zoning_replan_every": 60,
+    # Accumulate p50/p90/p99/p99.9 wait and journey times while the run goes, overall, per elevator
+    # and per band of journey_stats_floor_band origin floors, written to percentile_summary_path
+    "journey_stats": False,
+    "journey_stats_floor_band": 10,
+    # "csv" writes passenger_logs_path, "parquet" writes the typed passenger table to passenger_parquet_path
+    # (zstd compressed, needs pyarrow)
+    "output_format": "csv",
+    # Record floor, state, direction, load and queue lengths of every elevator on every simulated tick to
+    # telemetry_path in run_config, needs output_format "parquet"
+    "telemetry": False,
+    # Keep the floor, state and load history of every elevator in memory, run-length encoded, instead of
+    # writing it to the trace logs (see TelemetryBuffer in elevator_system/telemetry.py), the utilization
+    # and mean load of every elevator are logged at the end. Cannot be combined with telemetry
+    "telemetry_buffer": False,
+    # Number of runs (stretches of constant state, load and travel) kept per elevator, oldest first out,
+    # None keeps the whole history
+    "telemetry_buffer_max_runs": None,
+    # Time every phase of every tick and log the per-phase report at the end of the run
+    "profile": False,
+    # Log detail: "off" (errors only), "events" (assignments, boardings, exits...) or "trace"
+    # (events plus the status of every elevator on every tick)
+    "log_verbosity": "trace",
+    # Save a checkpoint to run_config checkpoint_path every this many ticks, None disables checkpoints
+    "checkpoint_every": None,
+    # Answer a run from run_config result_cache_dir when the same config (requests, zone mapping, max_time,
+    # max_capacity...) was simulated before, instead of simulating it again. Summaries are written as
+    # usual but the simulation logs only note the cache hit. Resumed and profiled runs are always simulated
+    "result_cache": False,
+    # Checkpoint file to resume the simulation from instead of starting it at time 0,
+    # the requests must be the same as in the checkpointed run
+    "resume_from": None,
+}
+
+# Parameter sweep, every combination of the lists below is simulated once (see sweep.py)
+sweep_config = {
+    # Named default_zone_mapping variants
+    "zone_mappings": {"default": simulation_config["default_zone_mapping"]},
+    # None keeps the zone mapping as it is, a number splits its floors equally between that many elevators
+    "elevator_counts": [None, 4],
+    "max_capacities": [4, 8],
+    # None runs simulation_config passenger_requests, a seed generates traffic over the mapping floors
+    "traffic_seeds": [None, 1, 2],
+    "traffic_pattern": "uniform",
+    "passengers_per_seed": 100,
+    "traffic_duration": 300,
+    "max_time": 10000,
+    # Number of worker processes, None uses one per CPU
+    "workers": None,
+    # Verbosity of the per run logs, see simulation_config
+    "log_verbosity": "trace",
+    # Reuse the results of runs simulated before, see simulation_config
+    "result_cache": False,
+}
+
+# Campus of independent buildings simulated in parallel (see campus.py), one worker process per building
+campus_config = {
+    # Building name: default_zone_mapping plus passenger_requests, passenger_requests_path or traffic
+    # (see simulation_config), and optionally max_capacity and assignment
+    "buildings": {
+        f"tower_{idx}": {
+            "default_zone_mapping": {
+                1: list(range(1, 16)),
+                2: list(range(16, 31)),
+                3: list(range(31, 46)),
+            },
+            "traffic": {"pattern": "up_peak", "rate": 0.2, "seed": idx, "count": 200},
+            "max_capacity": 8,
+        }
+        for idx in range(1, 5)
+    },
+    "max_time": 10000,
+    "time_advance": "tick",
+    # Number of worker processes, None uses one per CPU
+    "workers": None,
+    # Verbosity of the per building logs, see simulation_config
+    "log_verbosity": "off",
+}
+
+# Real-time dispatch service (see serve.py), simulation_config default_zone_mapping and max_capacity are used
+service_config = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    # Wall time of one simulation tick in seconds
+    "tick_seconds": 0.1,
+    # Number of most recent assignment latencies the p50/p99 metrics are computed over
+    "latency_window": 10000,
+    # Log the latency metrics every this many seconds, None disables it
+    "metrics_interval": 10,
+    "log_verbosity": "events",
 }
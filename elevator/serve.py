@@ -0,0 +1,61 @@
+import asyncio
+import signal
+
+from elevator.elevator_system.dispatch_service import DispatchService
+from utils.get_logger import close_logger, get_logger
+from run_config import run_config, service_config, simulation_config
+from validations.config_validation import validate_config
+
+logger = get_logger(
+    log_path=run_config["simulation_logs_path"],
+    verbosity=service_config.get("log_verbosity", "events"),
+)
+
+
+async def log_metrics(service: DispatchService, interval: float) -> None:
+    """
+    Log the assignment latency metrics of the service every interval seconds
+    """
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("Assignment latency: %s", service.latency.as_dict())
+
+
+async def serve() -> None:
+    service = DispatchService(
+        simulation_config["default_zone_mapping"],
+        service_config["tick_seconds"],
+        simulation_config["max_capacity"],
+        service_config["host"],
+        service_config["port"],
+        service_config["latency_window"],
+    )
+    await service.start()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, service.shutdown)
+    reporter = None
+    if service_config.get("metrics_interval"):
+        reporter = asyncio.create_task(
+            log_metrics(service, service_config["metrics_interval"])
+        )
+    try:
+        await service.serve_forever()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+
+
+def main():
+
+    try:
+        validate_config(simulation_config)
+        asyncio.run(serve())
+    except Exception as e:
+        logger.exception(e)
+    finally:
+        close_logger()
+
+
+if __name__ == "__main__":
+    main()
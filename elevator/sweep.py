@@ -0,0 +1,208 @@
+import csv
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from elevator.elevator_system.result_cache import (
+    CachedResult,
+    ResultCache,
+    config_fingerprint,
+)
+from elevator.elevator_system.simulate_elevator import simulate_elevator_system
+from utils.get_logger import close_logger, get_logger
+from utils.summary_table import summarize_passengers, write_summary_csv
+from utils.traffic_generator import generate_traffic
+from utils.utils import split_zones
+from run_config import run_config, simulation_config, sweep_config
+from validations.config_validation import validate_config
+
+logger = logging.getLogger("ElevatorLogger")
+
+RESULT_FIELDS = [
+    "run",
+    "zone_mapping",
+    "elevators",
+    "max_capacity",
+    "traffic_seed",
+    "passengers",
+    "served",
+    "wait_min",
+    "wait_max",
+    "wait_mean",
+    "total_min",
+    "total_max",
+    "total_mean",
+    "elapsed_seconds",
+    "cached",
+    "error",
+]
+
+
+def build_sweep_points(sweep: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand the sweep grid into one settings dict per run
+
+    :param sweep: Sweep configuration, see sweep_config in run_config
+    """
+    points: List[Dict[str, Any]] = []
+    for mapping_name, zone_map in sweep["zone_mappings"].items():
+        for elevator_count in sweep["elevator_counts"]:
+            for max_capacity in sweep["max_capacities"]:
+                for seed in sweep["traffic_seeds"]:
+                    points.append(
+                        {
+                            "run": len(points) + 1,
+                            "zone_mapping": mapping_name,
+                            "default_zone_mapping": zone_map,
+                            "elevators": elevator_count,
+                            "max_capacity": max_capacity,
+                            "traffic_seed": seed,
+                            "traffic_pattern": sweep["traffic_pattern"],
+                            "passengers_per_seed": sweep["passengers_per_seed"],
+                            "traffic_duration": sweep["traffic_duration"],
+                            "max_time": sweep["max_time"],
+                            "log_verbosity": sweep.get("log_verbosity", "trace"),
+                            "result_cache": sweep.get("result_cache", False),
+                        }
+                    )
+    return points
+
+
+def build_run_config(point: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the simulation config of a single sweep run
+
+    :param point: Settings of the run, see build_sweep_points
+    """
+    floors = [f for zone in point["default_zone_mapping"].values() for f in zone]
+    zone_map = point["default_zone_mapping"]
+    if point["elevators"] is not None:
+        zone_map = split_zones(min(floors), max(floors), point["elevators"])
+    if point["traffic_seed"] is None:
+        requests = simulation_config["passenger_requests"]
+    else:
+        requests = list(
+            generate_traffic(
+                point["traffic_pattern"],
+                zone_map,
+                rate=point["passengers_per_seed"] / point["traffic_duration"],
+                seed=point["traffic_seed"],
+                count=point["passengers_per_seed"],
+            )
+        )
+    return {
+        "default_zone_mapping": zone_map,
+        "passenger_requests": requests,
+        "max_time": point["max_time"],
+        "max_capacity": point["max_capacity"],
+        "time_advance": simulation_config.get("time_advance", "tick"),
+    }
+
+
+def run_sweep_point(point: Dict[str, Any], output_dir: str) -> Dict[str, Any]:
+    """
+    Simulate a single sweep run, runs inside a worker process
+    Each run logs to its own file and writes its own passenger summary
+
+    :param point: Settings of the run, see build_sweep_points
+    :param output_dir: Directory for the run logs and summaries
+    :return: Row of the sweep results table
+    """
+    run_name = f"run_{point['run']}"
+    run_logger = get_logger(
+        log_path=os.path.join(output_dir, "logs", f"{run_name}.txt"),
+        verbosity=point.get("log_verbosity", "trace"),
+    )
+    row = {field: point.get(field) for field in RESULT_FIELDS}
+    try:
+        sim_config = build_run_config(point)
+        validate_config(sim_config)
+        row["elevators"] = len(sim_config["default_zone_mapping"])
+        row["passengers"] = len(sim_config["passenger_requests"])
+
+        start = time.perf_counter()
+        cache = cached = None
+        if point.get("result_cache", False):
+            cache = ResultCache(
+                run_config["result_cache_dir"], run_config["result_cache_max_bytes"]
+            )
+            cache_key = config_fingerprint(sim_config)
+            cached = cache.get(cache_key)
+        row["cached"] = cached is not None
+        if cached is not None:
+            passengers = cached.passengers
+        else:
+            passengers = simulate_elevator_system(
+                sim_config["passenger_requests"],
+                sim_config["default_zone_mapping"],
+                sim_config["max_time"],
+                sim_config["time_advance"],
+                max_capacity=sim_config["max_capacity"],
+            ).passengers
+        row["elapsed_seconds"] = round(time.perf_counter() - start, 4)
+
+        passenger_data = summarize_passengers(passengers)
+        stats = write_summary_csv(
+            passenger_data, os.path.join(output_dir, "summary", f"{run_name}.csv")
+        )
+        if cache is not None and cached is None:
+            cache.put(cache_key, CachedResult(passengers, stats))
+        row.update(stats)
+        row["served"] = sum(
+            1 for pdata in passenger_data.values() if pdata["exited_time"] is not None
+        )
+    except Exception as e:
+        run_logger.exception(e)
+        row["error"] = repr(e)
+    finally:
+        close_logger()
+    return row
+
+
+def run_sweep(
+    sweep: Dict[str, Any], output_dir: str, results_csv: str
+) -> List[Dict[str, Any]]:
+    """
+    Run every combination of the sweep grid over a process pool and collect the results table
+
+    :param sweep: Sweep configuration, see sweep_config in run_config
+    :param output_dir: Directory for the per run logs and summaries
+    :param results_csv: Path to the CSV file with one row per run
+    :return: Rows of the results table, in run order
+    """
+    os.makedirs(os.path.join(output_dir, "logs"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "summary"), exist_ok=True)
+    points = build_sweep_points(sweep)
+    logger.info("Running %s sweep runs", len(points))
+
+    with ProcessPoolExecutor(max_workers=sweep.get("workers")) as executor:
+        rows = list(executor.map(run_sweep_point, points, [output_dir] * len(points)))
+
+    with open(results_csv, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+    logger.info("Sweep results written to %s", results_csv)
+    return rows
+
+
+def main():
+    output_dir = run_config["sweep_output_dir"]
+    os.makedirs(output_dir, exist_ok=True)
+    sweep_logger = get_logger(log_path=os.path.join(output_dir, "sweep_logs.txt"))
+    try:
+        run_sweep(
+            sweep_config, output_dir, os.path.join(output_dir, "sweep_results.csv")
+        )
+    except Exception as e:
+        sweep_logger.exception(e)
+    finally:
+        close_logger()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The engine is imported as elevator.elevator_system, the scripts' helpers as utils and validations
+ELEVATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.dirname(ELEVATOR_DIR), ELEVATOR_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,62 @@
+import pytest
+
+from elevator.elevator_system.simulate_elevator import simulate_elevator_system
+from utils.traffic_generator import generate_traffic
+from utils.utils import split_zones
+
+pytest.importorskip("numpy")
+
+from elevator.elevator_system.batch_engine import simulate_buildings_batched
+
+MAX_TIME = 10**6
+
+
+def timeline(passengers):
+    return (
+        list(passengers.ids),
+        list(passengers.assigned_elevator),
+        list(passengers.board_time),
+        list(passengers.exit_time),
+    )
+
+
+def building(pattern, seed, floors, elevators, capacity):
+    zone_map = split_zones(1, floors, elevators)
+    requests = list(
+        generate_traffic(pattern, zone_map, rate=0.05, seed=seed, count=300)
+    )
+    return {
+        "default_zone_mapping": zone_map,
+        "passenger_requests": requests,
+        "max_capacity": capacity,
+    }
+
+
+def expected(config):
+    simulation = simulate_elevator_system(
+        config["passenger_requests"],
+        config["default_zone_mapping"],
+        MAX_TIME,
+        max_capacity=config["max_capacity"],
+    )
+    return timeline(simulation.passengers)
+
+
+@pytest.mark.parametrize("pattern", ["up_peak", "lunch", "down_peak", "uniform"])
+@pytest.mark.parametrize("seed", [1, 2])
+def test_batch_engine_matches_the_simulation(pattern, seed):
+    config = building(pattern, seed, floors=40, elevators=4, capacity=8)
+    (passengers,) = simulate_buildings_batched([config], MAX_TIME)
+    assert timeline(passengers) == expected(config)
+
+
+def test_buildings_of_one_batch_do_not_interfere():
+    configs = [
+        building("up_peak", 3, floors=30, elevators=3, capacity=4),
+        building("uniform", 4, floors=60, elevators=5, capacity=8),
+        building("down_peak", 5, floors=20, elevators=2, capacity=6),
+    ]
+    results = simulate_buildings_batched(configs, MAX_TIME)
+    assert [timeline(passengers) for passengers in results] == [
+        expected(config) for config in configs
+    ]
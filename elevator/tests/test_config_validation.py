@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from validations import config_validation
+from validations.config_validation import (
+    _request_errors_by_row,
+    _request_errors_vectorized,
+    find_request_errors,
+)
+
+MIN_FLOOR, MAX_FLOOR = 1, 20
+
+
+def random_requests(rng, count):
+    requests = []
+    for i in range(count):
+        time = rng.choice([rng.randint(0, 100), -rng.randint(1, 5)])
+        pid = f"P{rng.randint(0, count // 2)}"
+        source = rng.choice([rng.randint(MIN_FLOOR, MAX_FLOOR), -1, 0, 25])
+        dest = rng.choice([rng.randint(MIN_FLOOR, MAX_FLOOR), -3, 0, 30])
+        requests.append((time, pid, source, dest))
+    return requests
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_vectorized_errors_match_row_by_row(seed):
+    pytest.importorskip("numpy")
+    requests = random_requests(random.Random(seed), 200)
+    expected = _request_errors_by_row(requests, range(MIN_FLOOR, MAX_FLOOR + 1))
+    assert expected
+    assert _request_errors_vectorized(requests, MIN_FLOOR, MAX_FLOOR) == expected
+
+
+def test_only_the_first_error_of_a_request_is_reported():
+    pytest.importorskip("numpy")
+    requests = [(0, "A", 1, 2), (-1, "A", -1, 99), (3, "A", 50, 99)]
+    assert _request_errors_vectorized(requests, MIN_FLOOR, MAX_FLOOR) == [
+        (1, "Passenger request A: time must be a non negative integer"),
+        (2, "Duplicate passenger id found: A"),
+    ]
+
+
+def test_same_errors_without_numpy(monkeypatch):
+    requests = random_requests(random.Random(0), 100)
+    with_numpy = find_request_errors(requests, MIN_FLOOR, MAX_FLOOR)
+    monkeypatch.setattr(config_validation, "np", None)
+    assert find_request_errors(requests, MIN_FLOOR, MAX_FLOOR) == with_numpy
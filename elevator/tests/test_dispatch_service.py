@@ -0,0 +1,69 @@
+import asyncio
+
+from elevator.elevator_system.dispatch_service import DispatchService
+from utils.dispatch_client import request
+
+ZONE_MAP = {1: list(range(1, 11)), 2: list(range(11, 21))}
+
+
+async def with_service(scenario):
+    service = DispatchService(ZONE_MAP, tick_seconds=0.005, max_capacity=4, port=0)
+    await service.start()
+    try:
+        return await asyncio.wait_for(scenario(service), timeout=10)
+    finally:
+        await service.stop()
+
+
+def test_rejected_call_can_be_retried():
+    async def scenario(service):
+        call = {"passenger_id": "p1", "source": 999, "destination": 5}
+        rejected = await request(service.host, service.port, call)
+        call["source"] = 3
+        accepted = await request(service.host, service.port, call)
+        return rejected, accepted
+
+    rejected, accepted = asyncio.run(with_service(scenario))
+    assert rejected == {
+        "error": "Passenger p1: source floor 999 is not defined in default_zone_mapping"
+    }
+    assert accepted["passenger_id"] == "p1"
+    assert accepted["elevator"] in ZONE_MAP
+
+
+def test_bad_passenger_id_is_reported_without_the_table_row():
+    async def scenario(service):
+        call = {"passenger_id": 7, "source": 1, "destination": 5}
+        return await request(service.host, service.port, call)
+
+    answer = asyncio.run(with_service(scenario))
+    assert answer == {"error": "passenger_id must be a string"}
+
+
+def test_duplicate_id_is_rejected():
+    async def scenario(service):
+        call = {"passenger_id": "p1", "source": 1, "destination": 5}
+        first = await request(service.host, service.port, call)
+        second = await request(service.host, service.port, call)
+        return first, second
+
+    first, second = asyncio.run(with_service(scenario))
+    assert "error" not in first
+    assert second == {"error": "Duplicate passenger id found: p1"}
+
+
+def test_future_resolves_on_assignment():
+    async def scenario(service):
+        future = service.call("p1", 12, 2)
+        assert not future.done()
+        answer = await future
+        return service, answer
+
+    service, answer = asyncio.run(with_service(scenario))
+    passenger = service.simulation.passengers[0]
+    assert passenger.is_assigned
+    assert answer["passenger_id"] == "p1"
+    assert answer["elevator"] == passenger.assigned_elevator
+    assert answer["time"] >= passenger.arrival_time
+    assert answer["latency_ms"] >= 0
+    assert service.latency.count == 1
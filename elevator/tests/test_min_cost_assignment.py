@@ -0,0 +1,93 @@
+import random
+from itertools import permutations
+
+import pytest
+
+from utils.utils import min_cost_assignment
+
+
+def total(cost, columns):
+    return sum(cost[row][col] for row, col in enumerate(columns))
+
+
+def brute_force(cost):
+    """
+    Lowest total cost over every matching of the rows to distinct columns
+    """
+    m = len(cost[0])
+    return min(total(cost, columns) for columns in permutations(range(m), len(cost)))
+
+
+def random_matrix(rng, n, m, high=20):
+    return [[rng.randint(0, high) for _ in range(m)] for _ in range(n)]
+
+
+def check_matching(cost, columns):
+    assert len(columns) == len(cost)
+    assert len(set(columns)) == len(columns)
+    assert all(0 <= col < len(cost[0]) for col in columns)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_brute_force_on_rectangular_matrices(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 5)
+    m = rng.randint(n, 7)
+    cost = random_matrix(rng, n, m)
+    columns = min_cost_assignment(cost)
+    check_matching(cost, columns)
+    assert total(cost, columns) == brute_force(cost)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_brute_force_on_float_costs(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 4)
+    m = rng.randint(n, 6)
+    cost = [[rng.uniform(-5, 5) for _ in range(m)] for _ in range(n)]
+    columns = min_cost_assignment(cost)
+    check_matching(cost, columns)
+    assert total(cost, columns) == pytest.approx(brute_force(cost))
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_no_fit_cost_maximizes_the_real_matches(seed):
+    # Same construction as LoadBalancer.assign_batch: entries that cannot be matched cost no_fit,
+    # higher than any total of real costs
+    rng = random.Random(seed)
+    n = rng.randint(1, 5)
+    m = rng.randint(n, 7)
+    highest_floor = 20
+    no_fit = (highest_floor + 1) * (n + 1)
+    cost = [
+        [
+            no_fit if rng.random() < 0.5 else rng.randint(0, highest_floor)
+            for _ in range(m)
+        ]
+        for _ in range(n)
+    ]
+    columns = min_cost_assignment(cost)
+    check_matching(cost, columns)
+
+    def real_matches(matching):
+        return sum(1 for row, col in enumerate(matching) if cost[row][col] != no_fit)
+
+    best = max(
+        (real_matches(matching), -total(cost, matching))
+        for matching in permutations(range(m), n)
+    )
+    assert (real_matches(columns), -total(cost, columns)) == best
+
+
+def test_square_identity_prefers_the_diagonal():
+    cost = [[0 if row == col else 1 for col in range(4)] for row in range(4)]
+    assert min_cost_assignment(cost) == [0, 1, 2, 3]
+
+
+def test_empty_matrix():
+    assert min_cost_assignment([]) == []
+
+
+def test_more_rows_than_columns_is_rejected():
+    with pytest.raises(ValueError, match="Cannot match 3 rows to 2 columns"):
+        min_cost_assignment([[1, 2], [3, 4], [5, 6]])
@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+from elevator.elevator_system.elevator import MOVING_TO_PICKUP, Elevator
+from elevator.elevator_system.parking import (
+    DemandParking,
+    create_parking,
+    demand_quantile_floors,
+)
+
+
+def brute_force_quantiles(floors, weights, k):
+    """
+    Lowest floor whose share of calls at or below it reaches (2i + 1) / 2k, for every i
+    """
+    total = sum(weights)
+    spots = []
+    for i in range(k):
+        seen = 0
+        for floor, weight in zip(floors, weights):
+            seen += weight
+            if seen / total >= (2 * i + 1) / (2 * k):
+                spots.append(floor)
+                break
+    return spots
+
+
+def test_quantile_floors():
+    assert demand_quantile_floors([1, 5, 9], [8, 1, 1], 4) == [1, 1, 1, 5]
+    assert demand_quantile_floors([1, 2, 3, 4], [1, 1, 1, 1], 4) == [1, 2, 3, 4]
+    assert demand_quantile_floors([1, 2, 3, 4], [1, 1, 1, 1], 2) == [1, 3]
+
+
+def test_more_elevators_than_call_floors():
+    assert demand_quantile_floors([3], [2], 2) == [3, 3]
+    spots = demand_quantile_floors([2, 7, 20], [1, 1, 1], 10)
+    assert len(spots) == 10
+    assert spots == sorted(spots)
+    assert set(spots) == {2, 7, 20}
+
+
+def test_every_call_on_one_floor():
+    assert demand_quantile_floors([1], [50], 6) == [1] * 6
+    # Floors without calls are never chosen
+    assert demand_quantile_floors([1, 8, 30], [0, 50, 0], 3) == [8, 8, 8]
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(500):
+        floors = sorted(rng.sample(range(1, 80), rng.randint(1, 12)))
+        weights = [rng.randint(0, 20) for _ in floors]
+        if not any(weights):
+            weights[-1] = 1
+        k = rng.randint(1, 16)
+        spots = demand_quantile_floors(floors, weights, k)
+        assert spots == brute_force_quantiles(floors, weights, k)
+        assert spots == sorted(spots)
+
+
+def elevators():
+    return [
+        Elevator(1, 1, 1, 10),
+        Elevator(2, 11, 11, 20),
+        Elevator(3, 21, 21, 30),
+    ]
+
+
+def test_idle_elevators_follow_the_calls():
+    parking = DemandParking(window=100, replan_every=10)
+    cars = elevators()
+    parking.update(0, cars)
+    for t in range(1, 10):
+        parking.observe(t, 25)
+    parking.observe(9, 4)
+    parking.update(5, cars)
+    assert [e.park_floor for e in cars] == [1, 11, 21]
+    parking.update(10, cars)
+    assert [e.park_floor for e in cars] == [25, 25, 25]
+    assert parking.next_replan == 20
+    assert parking.call_rates() == {4: 0.01, 25: 0.09}
+
+
+def test_elevators_go_home_once_the_window_empties():
+    parking = DemandParking(window=100, replan_every=10)
+    cars = elevators()
+    for t in range(5):
+        parking.observe(t, 15)
+    parking.update(10, cars)
+    assert [e.park_floor for e in cars] == [15, 15, 15]
+    # The calls made at 1 to 4 are still in the window at 100
+    parking.update(100, cars)
+    assert [e.park_floor for e in cars] == [15, 15, 15]
+    parking.update(110, cars)
+    assert [e.park_floor for e in cars] == [1, 11, 21]
+    assert parking.demand.counts == {}
+    assert parking.call_rates() == {}
+
+
+def test_busy_elevators_keep_their_park_floor():
+    parking = DemandParking(window=100, replan_every=10)
+    cars = elevators()
+    cars[1].state = MOVING_TO_PICKUP
+    for t in range(5):
+        parking.observe(t, 30)
+    parking.update(10, cars)
+    assert [e.park_floor for e in cars] == [30, 11, 30]
+
+
+def test_replans_only_when_calls_or_idle_elevators_change():
+    parking = DemandParking(window=100, replan_every=10)
+    cars = elevators()
+    parking.observe(0, 30)
+    parking.update(0, cars)
+    assert parking.replans == 1
+    parking.update(10, cars)
+    assert parking.replans == 1
+    cars[0].state = MOVING_TO_PICKUP
+    parking.update(20, cars)
+    assert parking.replans == 2
+
+
+def test_create_parking():
+    assert create_parking("home") is None
+    parking = create_parking("demand", window=50, replan_every=5)
+    assert isinstance(parking, DemandParking)
+    assert (parking.demand.window, parking.demand.replan_every) == (50, 5)
+    with pytest.raises(ValueError, match="parking must be one of"):
+        create_parking("nearest")
+    with pytest.raises(ValueError, match="window must be positive"):
+        DemandParking(window=0)
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from elevator.elevator_system.dispatch_service import LatencyTracker
+from elevator.elevator_system.journey_stats import (
+    QuantileSketch,
+    nearest_rank,
+    percentile,
+)
+
+
+def nearest_rank_by_definition(values, pct):
+    """
+    Smallest value with at least pct percent of the values at or below it
+    """
+    ordered = sorted(values)
+    for value in ordered:
+        if 100 * sum(1 for v in ordered if v <= value) >= pct * len(ordered):
+            return value
+
+
+@pytest.mark.parametrize("seed", range(50))
+@pytest.mark.parametrize("pct", [1, 7, 25, 50, 90, 99, 99.9, 100])
+def test_percentile_follows_the_nearest_rank_rule(seed, pct):
+    rng = random.Random(seed)
+    values = [rng.randint(0, 1000) for _ in range(rng.randint(1, 150))]
+    assert percentile(values, pct) == nearest_rank_by_definition(values, pct)
+
+
+def test_percentile_of_no_values():
+    assert percentile([], 50) is None
+
+
+def test_nearest_rank_bounds():
+    assert nearest_rank(1, 0) == 0
+    assert nearest_rank(1, 1) == 0
+    assert nearest_rank(100, 0.07) == 6
+    assert nearest_rank(10, 0.99) == 9
+
+
+def test_latency_tracker_and_sketch_share_the_rule():
+    values = [float(v) for v in range(1, 101)]
+    tracker = LatencyTracker(window=100)
+    sketch = QuantileSketch(relative_accuracy=0.001)
+    for value in values:
+        tracker.record(value)
+        sketch.add(value)
+    for pct in (50, 90, 99):
+        assert tracker.percentile(pct) == percentile(values, pct) == pct
+        assert sketch.quantile(pct / 100) == pytest.approx(pct, rel=0.002)
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from utils.request_file import read_request_file
+
+ZONE_MAP = {1: [1, 2, 3], 2: [4, 5, 6]}
+REQUESTS = [(0, "P1", 1, 5), (0, "P2", 6, 2), (3, "P3", 4, 1), (7, "P4", 2, 3)]
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def csv_text(requests, header=True):
+    lines = ["time,passenger_id,source,destination"] if header else []
+    lines += [",".join(map(str, req)) for req in requests]
+    return "\n".join(lines) + "\n"
+
+
+def read(path):
+    return list(read_request_file(path, ZONE_MAP))
+
+
+@pytest.mark.parametrize("header", [True, False])
+def test_csv_with_or_without_header(tmp_path, header):
+    path = write(tmp_path, "requests.csv", csv_text(REQUESTS, header))
+    assert read(path) == REQUESTS
+
+
+def test_csv_skips_blank_and_trailing_lines(tmp_path):
+    text = "time,passenger_id,source,destination\n\n0,P1,1,5\n \n0, P2 ,6,2\n"
+    text += "3,P3,4,1\n7,P4,2,3"  # no newline after the last row
+    path = write(tmp_path, "requests.csv", text + "\n\n\n")
+    assert read(path) == REQUESTS
+    path = write(tmp_path, "requests.csv", text)
+    assert read(path) == REQUESTS
+
+
+def test_jsonl_skips_blank_and_trailing_lines(tmp_path):
+    lines = [json.dumps(list(req)) for req in REQUESTS]
+    path = write(tmp_path, "requests.jsonl", "\n" + "\n\n".join(lines) + "\n  \n")
+    assert read(path) == REQUESTS
+
+
+def test_empty_files(tmp_path):
+    assert read(write(tmp_path, "requests.csv", "")) == []
+    assert read(write(tmp_path, "requests.jsonl", "")) == []
+    assert read(write(tmp_path, "requests.csv", csv_text([]))) == []
+
+
+def test_jsonl_and_csv_give_the_same_requests(tmp_path):
+    fields = ("time", "passenger_id", "source", "destination")
+    objects = write(
+        tmp_path,
+        "objects.jsonl",
+        "".join(json.dumps(dict(zip(fields, req))) + "\n" for req in REQUESTS),
+    )
+    lists = write(
+        tmp_path,
+        "lists.ndjson",
+        "".join(json.dumps(list(req)) + "\n" for req in REQUESTS),
+    )
+    rows = write(tmp_path, "rows.csv", csv_text(REQUESTS))
+    assert read(objects) == read(lists) == read(rows) == REQUESTS
+
+
+@pytest.mark.parametrize(
+    "name, text, line, message",
+    [
+        # line 1 is the header, line 3 is blank
+        (
+            "bad.csv",
+            csv_text(REQUESTS[:1]) + "\n0,P2,6\n",
+            4,
+            "Expected 4 columns, got 3",
+        ),
+        ("bad.csv", csv_text(REQUESTS[:2]) + "x,P3,4,1\n", 4, "must be integers"),
+        (
+            "bad.csv",
+            csv_text(REQUESTS[:2]) + "3,P3,4,9\n",
+            4,
+            "destination floor 9 is not defined",
+        ),
+        ("bad.csv", csv_text(REQUESTS[:2]) + "3,P1,4,1\n", 4, "Duplicate"),
+        (
+            "bad.csv",
+            csv_text(REQUESTS[:1], header=False) + "\n\n0,P2,6\n",
+            4,
+            "Expected 4 columns, got 3",
+        ),
+        ("bad.jsonl", '[0, "P1", 1, 5]\n\n{"time": 1}\n', 3, "missing"),
+        ("bad.jsonl", '[0, "P1", 1, 5]\n[0, "P2", 1\n', 2, "Invalid JSON"),
+        ("bad.jsonl", '\n[0, "P1", 1, 5]\n[-1, "P2", 1, 5]\n', 3, "non negative"),
+    ],
+)
+def test_bad_request_reports_its_line(tmp_path, name, text, line, message):
+    path = write(tmp_path, name, text)
+    with pytest.raises(ValueError, match=message) as error:
+        read(path)
+    assert str(error.value).startswith(f"{path}, line {line}: ")
+
+
+def test_requests_before_a_bad_row_are_read(tmp_path):
+    path = write(tmp_path, "bad.csv", csv_text(REQUESTS[:2]) + "x,P3,4,1\n")
+    requests = read_request_file(path, ZONE_MAP)
+    assert [next(requests), next(requests)] == REQUESTS[:2]
+    with pytest.raises(ValueError, match="line 4"):
+        next(requests)
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported request file"):
+        read(write(tmp_path, "requests.txt", csv_text(REQUESTS)))
@@ -0,0 +1,170 @@
+import os
+import time
+
+import pytest
+
+from elevator.elevator_system.passenger import PassengerTable
+from elevator.elevator_system.result_cache import (
+    CachedResult,
+    ResultCache,
+    config_fingerprint,
+    dumps_result,
+)
+
+BASE_CONFIG = {
+    "default_zone_mapping": {1: [1, 2, 3], 2: [4, 5, 6]},
+    "max_time": 1000,
+    "max_capacity": 4,
+    "passenger_requests": [(0, "P1", 1, 5), (2, "P2", 6, 1)],
+}
+
+
+def result(passengers=1):
+    table = PassengerTable()
+    for i in range(passengers):
+        table.add(i, f"P{i}", 1, 5)
+    return CachedResult(table, {"wait_mean": 1.5, "total_mean": 4.0})
+
+
+def set_last_use(cache, key, timestamp):
+    os.utime(cache.path(key), (timestamp, timestamp))
+
+
+def test_hit_returns_the_stored_result(tmp_path):
+    cache = ResultCache(str(tmp_path), 1 << 20)
+    assert cache.get("a") is None
+    cache.put("a", result(3))
+    hit = cache.get("a")
+    assert list(hit.passengers.ids) == ["P0", "P1", "P2"]
+    assert hit.stats == {"wait_mean": 1.5, "total_mean": 4.0}
+    assert hit.journey_stats is None
+
+
+def test_get_touches_the_entry(tmp_path):
+    cache = ResultCache(str(tmp_path), 1 << 20)
+    cache.put("a", result())
+    set_last_use(cache, "a", 1000)
+    cache.get("a")
+    assert os.stat(cache.path("a")).st_mtime > 1000
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    entry_size = len(dumps_result(result()))
+    cache = ResultCache(str(tmp_path), 3 * entry_size)
+    for timestamp, key in enumerate(["a", "b", "c"], start=1000):
+        cache.put(key, result())
+        set_last_use(cache, key, timestamp)
+    # Reading "a" makes "b" the least recently used entry
+    cache.get("a")
+    cache.put("d", result())
+    assert sorted(os.path.basename(path) for _, _, path in cache.entries()) == [
+        "a.res",
+        "c.res",
+        "d.res",
+    ]
+    assert cache.size() <= cache.max_bytes
+
+
+def test_entry_just_written_survives_eviction(tmp_path):
+    small = len(dumps_result(result()))
+    cache = ResultCache(str(tmp_path), small + len(dumps_result(result(200))) - 1)
+    cache.put("old", result())
+    # "old" looks more recently used than the entry written next
+    set_last_use(cache, "old", time.time() + 1000)
+    cache.put("new", result(200))
+    assert cache.get("new") is not None
+    assert cache.get("old") is None
+
+
+def test_result_over_the_budget_is_not_cached(tmp_path):
+    cache = ResultCache(str(tmp_path), 10)
+    cache.put("a", result())
+    assert cache.get("a") is None
+    assert cache.entries() == []
+
+
+@pytest.mark.parametrize("data", [b"", b"garbage", b"ELVRES\x01\x00not zlib"])
+def test_unreadable_entry_is_removed(tmp_path, data):
+    cache = ResultCache(str(tmp_path), 1 << 20)
+    with open(cache.path("bad"), "wb") as f:
+        f.write(data)
+    assert cache.get("bad") is None
+    assert not os.path.exists(cache.path("bad"))
+
+
+def test_clear(tmp_path):
+    cache = ResultCache(str(tmp_path), 1 << 20)
+    cache.put("a", result())
+    cache.put("b", result())
+    cache.clear()
+    assert cache.entries() == []
+
+
+def test_budget_must_be_positive(tmp_path):
+    with pytest.raises(ValueError, match="max_bytes must be positive"):
+        ResultCache(str(tmp_path), 0)
+
+
+@pytest.mark.parametrize(
+    "defaults",
+    [
+        {"time_advance": "tick"},
+        {"assignment": "greedy"},
+        {"parking": "home"},
+        {"parking": "home", "parking_window": 10, "parking_replan_every": 5},
+        {"zoning": "static", "zoning_window": 10},
+        {"journey_stats": False, "journey_stats_floor_band": 3},
+        {"log_verbosity": "off", "profile": True},
+    ],
+)
+def test_fingerprint_ignores_defaults_and_unused_keys(defaults):
+    assert config_fingerprint({**BASE_CONFIG, **defaults}) == config_fingerprint(
+        BASE_CONFIG
+    )
+
+
+def test_fingerprint_max_capacity_none_is_the_default():
+    from elevator.run_config import simulation_config
+
+    assert config_fingerprint(
+        {**BASE_CONFIG, "max_capacity": None}
+    ) == config_fingerprint(
+        {**BASE_CONFIG, "max_capacity": simulation_config["max_capacity"]}
+    )
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"assignment": "batch"},
+        {"time_advance": "event"},
+        {"parking": "demand"},
+        {"zoning": "adaptive"},
+        {"journey_stats": True},
+        {"max_capacity": 5},
+        {"max_time": 999},
+        {"passenger_requests": [(0, "P1", 1, 6)]},
+    ],
+)
+def test_fingerprint_changes_with_the_results(changes):
+    assert config_fingerprint({**BASE_CONFIG, **changes}) != config_fingerprint(
+        BASE_CONFIG
+    )
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ({"parking": "demand"}, {"parking": "demand", "parking_window": 60}),
+        ({"parking": "demand"}, {"parking": "demand", "parking_replan_every": 5}),
+        ({"zoning": "adaptive"}, {"zoning": "adaptive", "zoning_window": 60}),
+        ({"zoning": "adaptive"}, {"zoning": "adaptive", "zoning_replan_every": 5}),
+    ],
+)
+def test_fingerprint_covers_the_controller_settings(first, second):
+    assert config_fingerprint({**BASE_CONFIG, **first}) != config_fingerprint(
+        {**BASE_CONFIG, **second}
+    )
+    assert config_fingerprint({**BASE_CONFIG, **first}) == config_fingerprint(
+        {**BASE_CONFIG, **first, "parking_window": 600, "zoning_window": 900}
+    )
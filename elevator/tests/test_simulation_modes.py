@@ -0,0 +1,162 @@
+import pytest
+
+from elevator.elevator_system.checkpoint import (
+    CHECKPOINT_MAGIC,
+    CHECKPOINT_VERSION,
+    _HEADER,
+    dumps_checkpoint,
+    load_checkpoint,
+    loads_checkpoint,
+    save_checkpoint,
+)
+from elevator.elevator_system.parking import DemandParking
+from elevator.elevator_system.simulate_elevator import ElevatorSimulation
+from elevator.elevator_system.zoning import ZoneController
+from utils.traffic_generator import TRAFFIC_PATTERNS, generate_traffic
+
+ZONE_MAP = {
+    1: list(range(1, 11)),
+    2: list(range(11, 21)),
+    3: list(range(21, 31)),
+    4: list(range(31, 41)),
+}
+MAX_TIME = 10**6
+PASSENGERS = 300
+
+
+def traffic(pattern="up_peak", seed=7):
+    return generate_traffic(pattern, ZONE_MAP, rate=0.05, seed=seed, count=PASSENGERS)
+
+
+def new_simulation(requests, controllers=None):
+    parking = zoning = None
+    if controllers in ("parking", "both"):
+        parking = DemandParking(window=300, replan_every=20)
+    if controllers in ("zoning", "both"):
+        zoning = ZoneController(window=300, replan_every=20)
+    return ElevatorSimulation(
+        requests, ZONE_MAP, max_capacity=8, parking=parking, zoning=zoning
+    )
+
+
+def timeline(simulation):
+    passengers = simulation.passengers
+    return (
+        list(passengers.ids),
+        list(passengers.assigned_elevator),
+        list(passengers.board_time),
+        list(passengers.exit_time),
+    )
+
+
+def run(requests, time_advance, controllers=None):
+    simulation = new_simulation(requests, controllers)
+    simulation.run(MAX_TIME, time_advance)
+    assert simulation.is_complete()
+    return simulation
+
+
+@pytest.mark.parametrize("pattern", sorted(TRAFFIC_PATTERNS))
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_event_advance_matches_tick_advance(pattern, seed):
+    tick = run(traffic(pattern, seed), "tick")
+    event = run(traffic(pattern, seed), "event")
+    assert timeline(event) == timeline(tick)
+    assert event.current_time <= tick.current_time
+
+
+@pytest.mark.parametrize("controllers", ["parking", "zoning", "both"])
+def test_event_advance_matches_tick_advance_with_controllers(controllers):
+    tick = run(traffic("lunch"), "tick", controllers)
+    event = run(traffic("lunch"), "event", controllers)
+    assert timeline(event) == timeline(tick)
+
+
+def test_checkpoint_round_trip_mid_run(tmp_path):
+    simulation = new_simulation(traffic())
+    simulation.run(1500, "tick")
+    assert not simulation.is_complete()
+
+    path = str(tmp_path / "run.ckpt")
+    save_checkpoint(simulation, path)
+    restored = load_checkpoint(path, traffic())
+
+    assert restored.next_time == simulation.next_time == 1500
+    assert timeline(restored) == timeline(simulation)
+    assert [str(e) for e in restored.elevators] == [
+        str(e) for e in simulation.elevators
+    ]
+    assert not (tmp_path / "run.ckpt.tmp").exists()
+
+
+def test_checkpoint_needs_the_requests_of_an_unread_stream():
+    simulation = new_simulation(traffic())
+    simulation.run(100, "tick")
+    with pytest.raises(ValueError, match="pass the requests"):
+        loads_checkpoint(dumps_checkpoint(simulation))
+
+
+@pytest.mark.parametrize("controllers", [None, "parking", "zoning", "both"])
+@pytest.mark.parametrize("time_advance", ["tick", "event"])
+def test_resumed_run_matches_uninterrupted_run(controllers, time_advance):
+    expected = run(traffic("lunch"), time_advance, controllers)
+
+    simulation = new_simulation(traffic("lunch"), controllers)
+    simulation.run(2000, time_advance)
+    resumed = loads_checkpoint(dumps_checkpoint(simulation), traffic("lunch"))
+    resumed.run(MAX_TIME, time_advance)
+
+    assert resumed.is_complete()
+    assert timeline(resumed) == timeline(expected)
+
+
+def test_periodic_checkpoints_resume_to_the_same_result(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    expected = run(traffic(), "event")
+
+    simulation = new_simulation(traffic())
+    simulation.run(3000, "event", checkpoint_every=500, checkpoint_path=path)
+    resumed = load_checkpoint(path, traffic())
+    assert 2500 <= resumed.next_time <= 3000
+    resumed.run(MAX_TIME, "event")
+    assert timeline(resumed) == timeline(expected)
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        (b"", "Not a simulation checkpoint"),
+        (b"ELV", "Not a simulation checkpoint"),
+        (b"NOTACKPT" + bytes(16), "Not a simulation checkpoint"),
+        (
+            _HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION + 1) + bytes(16),
+            "Unsupported checkpoint version",
+        ),
+    ],
+)
+def test_rejects_bad_header_or_version(data, message):
+    with pytest.raises(ValueError, match=message):
+        loads_checkpoint(data)
+
+
+def run_with_live_calls(simulation, start, stop, requests=None):
+    """
+    Run from start to stop adding a live call every 100 ticks, ahead of the stream, and
+    resume from a checkpoint at 1000 when requests are given
+    """
+    for time in range(start, stop, 100):
+        if requests is not None and time == 1000:
+            simulation = loads_checkpoint(dumps_checkpoint(simulation), requests())
+        simulation.add_call(time + 50, f"live{time}", 40 - time // 100 % 30, 1)
+        simulation.run(time + 100, "tick")
+    simulation.run(MAX_TIME, "tick")
+    return simulation
+
+
+def test_resume_with_live_calls_keeps_the_stream_position():
+    expected = run_with_live_calls(new_simulation(traffic()), 0, 2000)
+    resumed = run_with_live_calls(new_simulation(traffic()), 0, 2000, traffic)
+
+    assert resumed.is_complete()
+    assert timeline(resumed) == timeline(expected)
+    assert len(resumed.passengers) == PASSENGERS + 20
@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from elevator.elevator_system.elevator import Elevator
+from elevator.elevator_system.load_balancer import LoadBalancer
+from elevator.elevator_system.zoning import (
+    ZoneController,
+    balanced_zone_starts,
+    create_zone_controller,
+)
+
+
+def check_partition(starts, lowest, highest, k):
+    """
+    k zones starting at lowest, each with at least one floor up to highest
+    """
+    assert len(starts) == k
+    assert starts[0] == lowest
+    assert all(a < b for a, b in zip(starts, starts[1:]))
+    assert starts[-1] <= highest
+
+
+def test_zone_starts():
+    counts = {1: 100, **{floor: 2 for floor in range(2, 61)}}
+    assert balanced_zone_starts(1, 60, counts, 4) == [1, 2, 7, 34]
+    uniform = {floor: 1 for floor in range(1, 61)}
+    assert balanced_zone_starts(1, 60, uniform, 4) == [1, 16, 31, 46]
+
+
+def test_more_zones_than_floors():
+    assert balanced_zone_starts(1, 3, {1: 5, 2: 1}, 4) is None
+    assert balanced_zone_starts(1, 4, {1: 5, 2: 1}, 4) == [1, 2, 3, 4]
+
+
+def test_no_calls():
+    assert balanced_zone_starts(1, 40, {}, 4) is None
+    # Calls outside lowest..highest are not counted
+    assert balanced_zone_starts(1, 40, {41: 3}, 4) is None
+
+
+@pytest.mark.parametrize("floor", [1, 2, 20, 39, 40])
+def test_every_call_on_one_floor(floor):
+    starts = balanced_zone_starts(1, 40, {floor: 30}, 4)
+    check_partition(starts, 1, 40, 4)
+    assert balanced_zone_starts(1, 4, {floor % 4 + 1: 30}, 4) == [1, 2, 3, 4]
+
+
+def test_zones_keep_at_least_one_floor():
+    rng = random.Random(11)
+    for _ in range(1000):
+        lowest = rng.randint(0, 5)
+        highest = lowest + rng.randint(0, 30)
+        k = rng.randint(1, 10)
+        span = range(lowest, highest + 1)
+        floors = rng.sample(span, rng.randint(1, min(len(span), 8)))
+        counts = {floor: rng.randint(1, 100) for floor in floors}
+        starts = balanced_zone_starts(lowest, highest, counts, k)
+        if highest - lowest + 1 < k:
+            assert starts is None
+        else:
+            check_partition(starts, lowest, highest, k)
+
+
+def building():
+    elevators = [Elevator(i + 1, 1 + 10 * i, 1 + 10 * i, 10 + 10 * i) for i in range(4)]
+    return elevators, LoadBalancer(elevators)
+
+
+def test_zones_follow_the_calls():
+    zoning = ZoneController(window=100, replan_every=10)
+    elevators, load_balancer = building()
+    for t in range(10):
+        zoning.observe(t, 1)
+    zoning.observe(5, 35)
+    changed = zoning.update(10, elevators, load_balancer)
+    assert zoning.replans == 1
+    assert load_balancer.custom_zones
+    starts = load_balancer.zone_starts
+    check_partition(starts, 1, 40, 4)
+    assert load_balancer.zone_stop == 41
+    assert [(e.zone_start, e.zone_end + 1) for e in elevators] == list(
+        zip(starts, starts[1:] + [41])
+    )
+    assert [e.park_floor for e in elevators] == starts
+    original = [(1, 10), (11, 20), (21, 30), (31, 40)]
+    assert changed == [
+        (e, zone)
+        for e, zone in zip(elevators, original)
+        if (e.zone_start, e.zone_end) != zone
+    ]
+    assert changed
+
+
+def test_zones_stay_once_the_window_empties():
+    zoning = ZoneController(window=100, replan_every=10)
+    elevators, load_balancer = building()
+    for t in range(10):
+        zoning.observe(t, 1)
+    zoning.update(10, elevators, load_balancer, park=False)
+    zones = [(e.zone_start, e.zone_end) for e in elevators]
+    assert [e.park_floor for e in elevators] == [1, 11, 21, 31]
+    assert zoning.update(110, elevators, load_balancer) == []
+    assert zoning.demand.counts == {}
+    assert [(e.zone_start, e.zone_end) for e in elevators] == zones
+    assert zoning.replans == 1
+
+
+def test_no_replan_before_it_is_due_or_when_nothing_changed():
+    zoning = ZoneController(window=100, replan_every=10)
+    elevators, load_balancer = building()
+    zoning.observe(0, 1)
+    assert zoning.update(0, elevators, load_balancer)
+    zoning.observe(5, 1)
+    assert zoning.update(5, elevators, load_balancer) == []
+    # Same boundaries as the last replan
+    assert zoning.update(10, elevators, load_balancer) == []
+    assert zoning.replans == 1
+
+
+def test_create_zone_controller():
+    assert create_zone_controller("static") is None
+    zoning = create_zone_controller("adaptive", window=50, replan_every=5)
+    assert isinstance(zoning, ZoneController)
+    assert (zoning.demand.window, zoning.demand.replan_every) == (50, 5)
+    with pytest.raises(ValueError, match="zoning must be one of"):
+        create_zone_controller("dynamic")
+    with pytest.raises(ValueError, match="replan_every must be positive"):
+        ZoneController(replan_every=0)
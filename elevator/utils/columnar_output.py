@@ -0,0 +1,222 @@
+import json
+import logging
+from array import array
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # only the parquet outputs need pyarrow
+    pa = pc = pq = None
+
+from elevator.elevator_system.elevator import STATE_NAMES
+from elevator.elevator_system.passenger import ASSIGNED, NOT_SET, PassengerTable
+from elevator.elevator_system.telemetry import TELEMETRY_COLUMNS
+
+logger = logging.getLogger("ElevatorLogger")
+
+DEFAULT_COMPRESSION = "zstd"
+# Rows per Parquet row group of the passenger table
+DEFAULT_PASSENGER_BATCH_ROWS = 65536
+
+# Array typecode -> Arrow type name, the typed arrays are handed to Arrow without copying
+_ARROW_TYPES = {"q": "int64", "i": "int32", "b": "int8", "B": "uint8"}
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise ValueError(
+            "Parquet outputs need pyarrow, install it with pip install pyarrow"
+        )
+
+
+def _arrow_column(values: array) -> "pa.Array":
+    """
+    Arrow view over a typed array, without copying it
+    """
+    arrow_type = getattr(pa, _ARROW_TYPES[values.typecode])()
+    return pa.Array.from_buffers(arrow_type, len(values), [None, pa.py_buffer(values)])
+
+
+def passenger_schema() -> "pa.Schema":
+    """
+    Schema of the passenger table, the columns of the summary CSV with nulls for unset values
+    """
+    require_pyarrow()
+    return pa.schema(
+        [
+            ("passenger_id", pa.string()),
+            ("source", pa.int32()),
+            ("destination", pa.int32()),
+            ("assigned_elevator", pa.int32()),
+            ("assigned_time", pa.int64()),
+            ("boarding_time", pa.int64()),
+            ("exited_time", pa.int64()),
+            ("wait_time", pa.int64()),
+            ("total_time", pa.int64()),
+        ]
+    )
+
+
+def telemetry_schema() -> "pa.Schema":
+    """
+    Schema of the elevator telemetry table, see TELEMETRY_COLUMNS. The state is stored
+    dictionary encoded with its name, the direction as -1 (down), 0 or 1 (up)
+    """
+    require_pyarrow()
+    fields = []
+    for name, typecode in TELEMETRY_COLUMNS.items():
+        if name == "state":
+            fields.append((name, pa.dictionary(pa.int8(), pa.string())))
+        else:
+            fields.append((name, getattr(pa, _ARROW_TYPES[typecode])()))
+    return pa.schema(fields)
+
+
+class ColumnarWriter:
+    """
+    Writes batches of typed columns to a compressed Parquet file, one row group per batch
+    """
+
+    def __init__(
+        self,
+        path: str,
+        schema: "pa.Schema",
+        compression: str = DEFAULT_COMPRESSION,
+        dictionaries: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> None:
+        """
+        :param path: Parquet file to write
+        :param schema: Schema of the table
+        :param compression: Parquet compression codec, e.g. "zstd", "snappy" or "none"
+        :param dictionaries: Values of the dictionary encoded columns, whose batches hold the value indices
+        """
+        require_pyarrow()
+        self.path: str = path
+        self.schema: "pa.Schema" = schema
+        self.dictionaries: Dict[str, "pa.Array"] = {
+            name: pa.array(values, pa.string())
+            for name, values in (dictionaries or {}).items()
+        }
+        self.rows: int = 0
+        self._writer = pq.ParquetWriter(path, schema, compression=compression)
+
+    def write_batch(self, columns: Dict[str, Any]) -> None:
+        """
+        Write one batch, each column is a typed array or an Arrow array
+        """
+        arrays = []
+        for field in self.schema:
+            column = columns[field.name]
+            if isinstance(column, array):
+                column = _arrow_column(column)
+            if field.name in self.dictionaries:
+                column = pa.DictionaryArray.from_arrays(
+                    column, self.dictionaries[field.name]
+                )
+            arrays.append(column)
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+        logger.info("%s rows written to %s", self.rows, self.path)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_telemetry_writer(
+    path: str, compression: str = DEFAULT_COMPRESSION
+) -> ColumnarWriter:
+    """
+    Writer for the batches of a TelemetryRecorder
+    """
+    return ColumnarWriter(
+        path, telemetry_schema(), compression, dictionaries={"state": STATE_NAMES}
+    )
+
+
+def _unset_to_null(column: "pa.Array") -> "pa.Array":
+    return pc.if_else(pc.equal(column, NOT_SET), pa.scalar(None, column.type), column)
+
+
+def _stats(column: "pa.Array") -> Dict[str, float]:
+    """
+    min, max and mean of the non null values, 0 when there are none (as summary_stats)
+    """
+    if column.null_count == len(column):
+        return {"min": 0, "max": 0, "mean": 0}
+    min_max = pc.min_max(column)
+    return {
+        "min": min_max["min"].as_py(),
+        "max": min_max["max"].as_py(),
+        "mean": pc.mean(column).as_py(),
+    }
+
+
+def write_passenger_parquet(
+    passengers: PassengerTable,
+    output_path: str,
+    compression: str = DEFAULT_COMPRESSION,
+    batch_rows: int = DEFAULT_PASSENGER_BATCH_ROWS,
+) -> Dict[str, float]:
+    """
+    Write the typed passenger table to a Parquet file, the columnar counterpart of write_passenger_summary
+
+    The columns are built straight from the PassengerTable arrays. Times that are not set (not boarded,
+    not exited, never assigned) are nulls, and the overall stats go to the file metadata
+    ("summary_stats") instead of footer rows.
+
+    :param passengers: Passengers returned by the simulation
+    :param output_path: Path to the Parquet file to write
+    :param compression: Parquet compression codec
+    :param batch_rows: Number of rows per row group
+    :return: Overall stats, see summary_stats
+    """
+    require_pyarrow()
+    arrival = _arrow_column(passengers.arrival_time)
+    boarding = _unset_to_null(_arrow_column(passengers.board_time))
+    exited = _unset_to_null(_arrow_column(passengers.exit_time))
+    unassigned = pc.equal(
+        pc.bit_wise_and(
+            _arrow_column(passengers.flags), pa.scalar(ASSIGNED, pa.uint8())
+        ),
+        0,
+    )
+    elevator = pc.cast(_arrow_column(passengers.assigned_elevator), pa.int32())
+    wait = pc.subtract(boarding, arrival)
+    total = pc.subtract(exited, arrival)
+    columns = {
+        "passenger_id": pa.array(passengers.ids, pa.string()),
+        "source": pc.cast(_arrow_column(passengers.source), pa.int32()),
+        "destination": pc.cast(_arrow_column(passengers.dest), pa.int32()),
+        "assigned_elevator": pc.if_else(
+            unassigned, pa.scalar(None, pa.int32()), elevator
+        ),
+        "assigned_time": arrival,
+        "boarding_time": boarding,
+        "exited_time": exited,
+        "wait_time": wait,
+        "total_time": total,
+    }
+
+    wait_stats, total_stats = _stats(wait), _stats(total)
+    stats = {f"wait_{key}": value for key, value in wait_stats.items()}
+    stats.update({f"total_{key}": value for key, value in total_stats.items()})
+    schema = passenger_schema().with_metadata({"summary_stats": json.dumps(stats)})
+
+    with ColumnarWriter(output_path, schema, compression) as writer:
+        for start in range(0, len(passengers), batch_rows):
+            writer.write_batch(
+                {
+                    name: column.slice(start, batch_rows)
+                    for name, column in columns.items()
+                }
+            )
+    return stats
@@ -0,0 +1,125 @@
+"""
+Load test client for the dispatch service (serve.py)
+
+Opens several connections, sends random passenger calls over the floors of the default zone
+mapping and prints the client-side round trip latencies next to the service metrics.
+
+    python -m utils.dispatch_client --calls 1000 --connections 50
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from elevator.elevator_system.journey_stats import percentile
+from run_config import service_config, simulation_config
+
+
+async def request(
+    host: str, port: int, message: Dict[str, object]
+) -> Dict[str, object]:
+    """
+    Send one message on a new connection and return the answer
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await writer.drain()
+        return _read_answer(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def send_calls(
+    host: str, port: int, calls: List[Tuple[str, int, int]], delay: float = 0.0
+) -> List[Tuple[Dict[str, object], float]]:
+    """
+    Send calls on one connection, delay seconds apart, and wait for every answer
+
+    :param calls: (passenger_id, source, destination) of every call
+    :return: (answer, round trip seconds) of every call, in answer order
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    sent: Dict[str, float] = {}
+    try:
+        for pid, source, dest in calls:
+            message = {"passenger_id": pid, "source": source, "destination": dest}
+            sent[pid] = perf_counter()
+            writer.write(json.dumps(message).encode("utf-8") + b"\n")
+            await writer.drain()
+            if delay:
+                await asyncio.sleep(delay)
+        results = []
+        for _ in calls:
+            answer = _read_answer(await reader.readline())
+            started = sent.get(answer.get("passenger_id"), perf_counter())
+            results.append((answer, perf_counter() - started))
+        return results
+    finally:
+        writer.close()
+
+
+def _read_answer(line: bytes) -> Dict[str, object]:
+    if not line:
+        raise ConnectionError("The dispatch service closed the connection")
+    return json.loads(line)
+
+
+async def run_load(
+    host: str, port: int, calls: int, connections: int, delay: float, seed: int
+) -> Dict[str, object]:
+    """
+    Send calls random calls spread over connections concurrent connections
+
+    :return: Client-side latency summary and the service metrics
+    """
+    rng = random.Random(seed)
+    zone_map = simulation_config["default_zone_mapping"]
+    floors = sorted({floor for zone in zone_map.values() for floor in zone})
+    per_connection: List[List[Tuple[str, int, int]]] = [[] for _ in range(connections)]
+    for idx in range(calls):
+        source, dest = rng.sample(floors, 2)
+        per_connection[idx % connections].append((f"c{seed}_{idx}", source, dest))
+
+    results = await asyncio.gather(
+        *(send_calls(host, port, batch, delay) for batch in per_connection if batch)
+    )
+    answers = [result for batch in results for result in batch]
+    round_trips = [seconds for answer, seconds in answers if "error" not in answer]
+    errors = [answer["error"] for answer, _ in answers if "error" in answer]
+    p50 = percentile(round_trips, 50)
+    p99 = percentile(round_trips, 99)
+    return {
+        "answered": len(round_trips),
+        "errors": len(errors),
+        "client_p50_ms": p50 * 1000 if p50 is not None else None,
+        "client_p99_ms": p99 * 1000 if p99 is not None else None,
+        "service": await request(host, port, {"command": "metrics"}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dispatch service load test client")
+    parser.add_argument("--host", default=service_config["host"])
+    parser.add_argument("--port", type=int, default=service_config["port"])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="Seconds between calls on a connection"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    summary = asyncio.run(
+        run_load(
+            args.host, args.port, args.calls, args.connections, args.delay, args.seed
+        )
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
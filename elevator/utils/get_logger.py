@@ -1,15 +1,55 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict
 
+# Simulation log verbosity -> logger level
+#   off: only errors
+#   events: assignments, boardings, exits, zone and route changes
+#   trace: events plus the per-tick elevator snapshot and failed assignment attempts
+LOG_VERBOSITY: Dict[str, int] = {
+    "off": logging.ERROR,
+    "events": logging.INFO,
+    "trace": logging.DEBUG,
+}
 
-def get_logger(name: str = "ElevatorLogger", log_path: str = None) -> logging.Logger:
+# Background writer of every logger configured by get_logger, by logger name
+_listeners: Dict[str, QueueListener] = {}
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves the message formatting to the listener thread
+
+    The stock QueueHandler merges the message with its args before queueing the record, which
+    keeps the formatting cost on the logging thread. Records are queued as they are instead,
+    so log calls must only pass args that are not modified afterwards (ints, strings, tuples).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def get_logger(
+    name: str = "ElevatorLogger", log_path: str = None, verbosity: str = "trace"
+) -> logging.Logger:
     """
     Configure and return a logger with the given name.
+    Records are handed to a queue and written to log_path by a background thread, so the
+    file I/O never runs on the simulation thread. Call close_logger to flush the file.
+
+    :param name: Logger name
+    :param log_path: Path to the log file, overwritten
+    :param verbosity: One of LOG_VERBOSITY
     """
+    if verbosity not in LOG_VERBOSITY:
+        raise ValueError(
+            f"Log verbosity must be one of {list(LOG_VERBOSITY)}, got {verbosity!r}"
+        )
+    close_logger(name)
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-
-    if logger.hasHandlers():
-        logger.handlers.clear()
+    logger.setLevel(LOG_VERBOSITY[verbosity])
 
     file_handler = logging.FileHandler(log_path, mode="w")
     file_handler.setLevel(logging.DEBUG)
@@ -19,5 +59,31 @@ def get_logger(name: str = "ElevatorLogger", log_path: str = None) -> logging.Lo
     )
     file_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    _listeners[name] = listener
+
+    logger.addHandler(DeferredQueueHandler(log_queue))
     return logger
+
+
+def close_logger(name: str = "ElevatorLogger") -> None:
+    """
+    Write out the queued records, stop the writer thread and close the log file of the logger
+    """
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    logger = logging.getLogger(name)
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+
+
+@atexit.register
+def _close_all_loggers() -> None:
+    for name in list(_listeners):
+        close_logger(name)
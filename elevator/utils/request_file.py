@@ -0,0 +1,127 @@
+import csv
+import json
+import mmap
+import os
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from validations.config_validation import validate_request
+
+# Column order of a CSV request file, the header line is optional
+REQUEST_FIELDS = ("time", "passenger_id", "source", "destination")
+REQUEST_FILE_FORMATS: Dict[str, str] = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def request_file_format(path: Union[str, os.PathLike]) -> str:
+    """
+    Format of a request file, "csv" or "jsonl", from its extension
+    """
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    if ext not in REQUEST_FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported request file {path}, expected one of {list(REQUEST_FILE_FORMATS)}"
+        )
+    return REQUEST_FILE_FORMATS[ext]
+
+
+def _mapped_lines(path: Union[str, os.PathLike]) -> Iterator[bytes]:
+    """
+    Lines of the file read through a memory map, the OS pages the file in as it is read
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from iter(mapped.readline, b"")
+
+
+def _csv_records(lines: Iterator[bytes]) -> Iterator[Tuple[int, tuple]]:
+    """
+    (line number, request) of every CSV row, errors name the line of the row
+    """
+    reader = csv.reader(line.decode("utf-8") for line in lines)
+    for row in reader:
+        fields = tuple(field.strip() for field in row)
+        # Blank and whitespace only lines, as in JSONL files
+        if not any(fields):
+            continue
+        if fields == REQUEST_FIELDS:
+            continue
+        # Last line of the row, a quoted field can span several lines
+        line_num = reader.line_num
+        if len(row) != 4:
+            raise ValueError(
+                f"line {line_num}: Expected {len(REQUEST_FIELDS)} columns, got {len(row)}"
+            )
+        time, pid, source, dest = fields
+        try:
+            record = (int(time), pid, int(source), int(dest))
+        except ValueError:
+            raise ValueError(
+                f"line {line_num}: Passenger request {pid}: "
+                "time, source and destination must be integers"
+            ) from None
+        yield line_num, record
+
+
+def _jsonl_records(lines: Iterator[bytes]) -> Iterator[Tuple[int, tuple]]:
+    """
+    (line number, request) of every JSONL line, errors name the line
+    """
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {line_num}: Invalid JSON: {e}") from None
+        if isinstance(record, dict):
+            missing = [field for field in REQUEST_FIELDS if field not in record]
+            if missing:
+                raise ValueError(
+                    f"line {line_num}: Passenger request is missing {missing}"
+                )
+            record = [record[field] for field in REQUEST_FIELDS]
+        yield line_num, tuple(record) if isinstance(record, list) else record
+
+
+def read_request_file(
+    path: Union[str, os.PathLike],
+    zone_mapping: Optional[Dict[int, List[int]]] = None,
+    check_unique_ids: bool = True,
+) -> Iterator[Tuple[int, str, int, int]]:
+    """
+    Lazily yield the passenger requests of a CSV or JSONL file, validating each one as it is read
+
+    CSV rows are `time,passenger_id,source,destination`, JSONL lines are either
+    {"time": ..., "passenger_id": ..., "source": ..., "destination": ...} objects or 4-element lists.
+    The requests must be sorted by time, the simulation reads them as time advances. Errors name the file and
+    the line of the bad request, counting the header and blank lines.
+
+    :param path: Path to a .csv, .jsonl or .ndjson file
+    :param zone_mapping: Zone map for the elevators, when set sources and destinations must be on its floors
+    :param check_unique_ids: Reject repeated passenger ids, keeps every id seen in memory
+    :return: Iterator of (time, passenger_id, source, destination)
+    """
+    file_format = request_file_format(path)
+    all_floors = None
+    if zone_mapping is not None:
+        all_floors = {floor for zone in zone_mapping.values() for floor in zone}
+    seen_ids = set() if check_unique_ids else None
+
+    lines = _mapped_lines(path)
+    records = _csv_records(lines) if file_format == "csv" else _jsonl_records(lines)
+    idx = 0
+    try:
+        for line_num, req in records:
+            try:
+                validate_request(req, idx, all_floors, seen_ids)
+            except ValueError as e:
+                raise ValueError(f"line {line_num}: {e}") from e
+            yield req
+            idx += 1
+    except ValueError as e:
+        raise ValueError(f"{os.fspath(path)}, {e}") from e
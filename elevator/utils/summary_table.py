@@ -1,10 +1,12 @@
 import csv
 import logging
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
+
+from elevator.elevator_system.journey_stats import REPORTED_PERCENTILES, JourneyStats
+from elevator.elevator_system.passenger import Passenger
 
 logger = logging.getLogger("ElevatorLogger")
-logger.setLevel(logging.DEBUG)
 
 
 def parse_logs_to_csv(log_file: str, output_csv: str, requests: List[tuple]) -> None:
@@ -61,6 +63,52 @@ def parse_logs_to_csv(log_file: str, output_csv: str, requests: List[tuple]) ->
                     passenger_data[passenger_id]["exited_time"] = int(time_str)
                 continue
 
+    write_summary_csv(passenger_data, output_csv)
+
+
+def summarize_passengers(passengers: Iterable[Passenger]) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the per passenger summary straight from the simulated passengers, no log parsing needed
+
+    :param passengers: Passengers returned by the simulation, in request order
+    :return: Summary rows keyed by passenger id
+    """
+    passenger_data: Dict[str, Dict[str, Any]] = {}
+    for p in passengers:
+        passenger_data[p.id] = {
+            "passenger_id": p.id,
+            "source": p.source,
+            "destination": p.dest,
+            "assigned_elevator": p.assigned_elevator,
+            "assigned_time": p.arrival_time,
+            "boarding_time": p.board_time,
+            "exited_time": p.exit_time,
+            "wait_time": None,
+            "total_time": None,
+        }
+    return passenger_data
+
+
+def write_passenger_summary(
+    passengers: Iterable[Passenger], output_csv: str
+) -> Dict[str, float]:
+    """
+    Generate summary report for each passenger, and overall simulation summary, from the simulated passengers
+
+    :param passengers: Passengers returned by the simulation, in request order
+    :param output_csv: Path to the CSV file to write
+    :return: Overall stats, see summary_stats
+    """
+    return write_summary_csv(summarize_passengers(passengers), output_csv)
+
+
+def summary_stats(passenger_data: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Fill in wait and total times of every summary row and compute the overall min/max/mean
+
+    :param passenger_data: Summary rows keyed by passenger id
+    :return: wait_min, wait_max, wait_mean, total_min, total_max and total_mean
+    """
     wait_times: List[int] = []
     total_times: List[int] = []
     for pdata in passenger_data.values():
@@ -71,6 +119,42 @@ def parse_logs_to_csv(log_file: str, output_csv: str, requests: List[tuple]) ->
             pdata["total_time"] = pdata["exited_time"] - pdata["assigned_time"]
             total_times.append(pdata["total_time"])
 
+    if wait_times:
+        wait_min = min(wait_times)
+        wait_max = max(wait_times)
+        wait_mean = sum(wait_times) / len(wait_times)
+    else:
+        wait_min = wait_max = wait_mean = 0
+
+    if total_times:
+        total_min = min(total_times)
+        total_max = max(total_times)
+        total_mean = sum(total_times) / len(total_times)
+    else:
+        total_min = total_max = total_mean = 0
+
+    return {
+        "wait_min": wait_min,
+        "wait_max": wait_max,
+        "wait_mean": wait_mean,
+        "total_min": total_min,
+        "total_max": total_max,
+        "total_mean": total_mean,
+    }
+
+
+def write_summary_csv(
+    passenger_data: Dict[str, Dict[str, Any]], output_csv: str
+) -> Dict[str, float]:
+    """
+    Fill in wait and total times and write the summary report
+
+    :param passenger_data: Summary rows keyed by passenger id
+    :param output_csv: Path to the CSV file to write
+    :return: Overall stats, see summary_stats
+    """
+    stats = summary_stats(passenger_data)
+
     with open(output_csv, "w", newline="") as csvfile:
         fieldnames = [
             "passenger_id",
@@ -91,29 +175,36 @@ def parse_logs_to_csv(log_file: str, output_csv: str, requests: List[tuple]) ->
 
         writer.writerow({})
 
-        if wait_times:
-            wait_min = min(wait_times)
-            wait_max = max(wait_times)
-            wait_mean = sum(wait_times) / len(wait_times)
-        else:
-            wait_min = wait_max = wait_mean = 0
-
-        if total_times:
-            total_min = min(total_times)
-            total_max = max(total_times)
-            total_mean = sum(total_times) / len(total_times)
-        else:
-            total_min = total_max = total_mean = 0
-
         writer.writerow(
             {
-                "passenger_id": f"Wait Times: Min={wait_min}, Max={wait_max}, Mean={round(wait_mean)}"
+                "passenger_id": f"Wait Times: Min={stats['wait_min']}, Max={stats['wait_max']}, Mean={round(stats['wait_mean'])}"
             }
         )
         writer.writerow(
             {
-                "passenger_id": f"Total Times: Min={total_min}, Max={total_max}, Mean={round(total_mean)}"
+                "passenger_id": f"Total Times: Min={stats['total_min']}, Max={stats['total_max']}, Mean={round(stats['total_mean'])}"
             }
         )
 
-    logger.info(f"Summary written to {output_csv}")
+    logger.info("Summary written to %s", output_csv)
+    return stats
+
+
+def write_percentile_summary(journey_stats: JourneyStats, output_csv: str) -> None:
+    """
+    Write the wait and journey time percentiles accumulated during the run, overall, per elevator
+    and per origin floor band
+
+    :param journey_stats: Percentile accumulators filled by the simulation
+    :param output_csv: Path to the CSV file to write
+    """
+    fieldnames = ["scope", "key", "metric", "count", "mean", "max"] + [
+        f"p{pct:g}" for pct in REPORTED_PERCENTILES
+    ]
+    with open(output_csv, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in journey_stats.rows():
+            writer.writerow(row)
+
+    logger.info("Percentile summary written to %s", output_csv)
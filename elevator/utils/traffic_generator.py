@@ -0,0 +1,88 @@
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Share of passengers per trip type: (from the lobby, to the lobby, between any two floors).
+# The last share picks both floors uniformly, the lobby included, so uniform traffic still uses it
+TRAFFIC_PATTERNS: Dict[str, Tuple[float, float, float]] = {
+    "up_peak": (0.85, 0.05, 0.10),
+    "lunch": (0.40, 0.40, 0.20),
+    "down_peak": (0.05, 0.85, 0.10),
+    "uniform": (0.0, 0.0, 1.0),
+}
+
+
+def floors_from_zone_mapping(zone_mapping: Dict[int, List[int]]) -> Tuple[int, int]:
+    """
+    Lowest and highest floor covered by a default_zone_mapping
+
+    :param zone_mapping: Zone map for the elevators
+    """
+    floors = [floor for zone in zone_mapping.values() for floor in zone]
+    return min(floors), max(floors)
+
+
+def generate_traffic(
+    pattern: str,
+    zone_mapping: Dict[int, List[int]],
+    rate: float,
+    seed: int,
+    duration: Optional[int] = None,
+    count: Optional[int] = None,
+    start_time: int = 0,
+    lobby: Optional[int] = None,
+) -> Iterator[Tuple[int, str, int, int]]:
+    """
+    Lazily yield reproducible synthetic passenger requests, sorted by time
+
+    Arrivals follow a Poisson process with `rate` passengers per tick. Each passenger
+    travels from the lobby, to the lobby, or between any two floors, with the shares
+    given by TRAFFIC_PATTERNS:
+      - up_peak: morning, most passengers leave the lobby for the upper floors
+      - lunch: two-way, passengers go down to the lobby and come back up
+      - down_peak: evening, most passengers head down to the lobby
+      - uniform: inter-floor traffic between uniformly picked floors
+
+    :param pattern: One of TRAFFIC_PATTERNS
+    :param zone_mapping: Zone map for the elevators, the traffic covers all its floors
+    :param rate: Mean number of arrivals per tick
+    :param seed: Random seed, the same seed always yields the same requests
+    :param duration: Stop before this many ticks after start_time, None for no time limit
+    :param count: Stop after this many passengers, None for no limit
+    :param start_time: Time of the first possible arrival
+    :param lobby: Lobby floor, defaults to the lowest floor
+    :return: Iterator of (time, passenger_id, source, destination)
+    """
+    if pattern not in TRAFFIC_PATTERNS:
+        raise ValueError(
+            f"Unknown traffic pattern '{pattern}', expected one of {list(TRAFFIC_PATTERNS)}"
+        )
+    if rate <= 0:
+        raise ValueError("Traffic rate must be greater than 0")
+
+    low, high = floors_from_zone_mapping(zone_mapping)
+    if high == low:
+        raise ValueError("Traffic needs at least two floors")
+    lobby = low if lobby is None else lobby
+    upper_floors = [floor for floor in range(low, high + 1) if floor != lobby]
+    from_lobby, to_lobby, _ = TRAFFIC_PATTERNS[pattern]
+
+    rng = random.Random(seed)
+    clock = float(start_time)
+    generated = 0
+    while count is None or generated < count:
+        clock += rng.expovariate(rate)
+        time = int(clock)
+        if duration is not None and time >= start_time + duration:
+            return
+        trip = rng.random()
+        if trip < from_lobby:
+            source, dest = lobby, rng.choice(upper_floors)
+        elif trip < from_lobby + to_lobby:
+            source, dest = rng.choice(upper_floors), lobby
+        else:
+            source = rng.randint(low, high)
+            dest = rng.randint(low, high - 1)
+            if dest >= source:
+                dest += 1
+        generated += 1
+        yield time, f"p{generated}", source, dest
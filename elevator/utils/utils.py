@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List
 
 
 def create_zones(t1: int, t2: int, div: int) -> Dict[str, range]:
@@ -37,3 +37,78 @@ def find_zone_for_number(num: int, zones: Dict[str, range]) -> str:
         if num in r:
             return zone
     return "Not found"
+
+
+def split_zones(t1: int, t2: int, div: int) -> Dict[int, List[int]]:
+    """
+    Func to build a default_zone_mapping with `div` elevators sharing the floors equally
+
+    :param t1: min floor value
+    :param t2: max floor value
+    :param div: Number of elevators
+    :return: A dict with elevator number and the list of floors it covers
+    """
+    zones = create_zones(t1, t2, div)
+    return {eid: list(r) for eid, r in enumerate(zones.values(), start=1)}
+
+
+def min_cost_assignment(cost: List[List[float]]) -> List[int]:
+    """
+    Hungarian algorithm, match every row to a distinct column with the lowest total cost
+
+    :param cost: Cost matrix with no more rows than columns
+    :return: Column matched to each row
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    if n > m:
+        raise ValueError(f"Cannot match {n} rows to {m} columns")
+    inf = float("inf")
+    # Row and column potentials, row matched to each column (1-based, 0 is unmatched)
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        match[0] = row
+        col = 0
+        min_slack = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[col] = True
+            current_row = match[col]
+            row_cost = cost[current_row - 1]
+            row_potential = u[current_row]
+            delta = inf
+            next_col = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    slack = row_cost[j - 1] - row_potential - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = col
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        next_col = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            col = next_col
+            if match[col] == 0:
+                break
+        # Flip the augmenting path
+        while col:
+            prev_col = way[col]
+            match[col] = match[prev_col]
+            col = prev_col
+
+    result = [0] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            result[match[j] - 1] = j - 1
+    return result
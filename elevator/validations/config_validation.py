@@ -1,4 +1,15 @@
-from typing import Any, Dict, List, Tuple
+import os
+from operator import itemgetter
+from typing import Any, Container, Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # requests are validated row by row without numpy
+    np = None
+
+from elevator.config_options import OUTPUT_FORMATS, PARKING_STRATEGIES, ZONING_MODES
+from utils.get_logger import LOG_VERBOSITY
+from utils.traffic_generator import TRAFFIC_PATTERNS
 
 
 def validate_config(sim_config: Dict[str, Any]) -> None:
@@ -10,7 +21,8 @@ def validate_config(sim_config: Dict[str, Any]) -> None:
          - Each key is an int
          - Each value is a list of ints
          - The union of all these lists forms a continuous range (i.e. no gaps)
-      2. The "passenger_requests" key must exist and be a list
+      2. The "passenger_requests" key must exist and be a list, unless "passenger_requests_path" points
+         to a CSV or JSONL request file (its requests are checked the same way while they are read)
          - Each request must be a tuple of exactly 4 elements:
               (time, passenger_id, source, destination)
          - time: int >= 0 (no decimals)
@@ -18,6 +30,29 @@ def validate_config(sim_config: Dict[str, Any]) -> None:
          - source: int >= 0 and within the floors under default_zone_mapping
          - destination: int and within the floors under default_zone_mapping
       3. The "max_time" key must exist and be an int
+      4. The optional "time_advance" key must be either "tick" or "event"
+      5. The optional "traffic" key must be None or a dict with:
+         - pattern: one of the patterns in utils/traffic_generator.py
+         - rate: number > 0
+         - seed: int
+         - duration/count (optional): int > 0
+      6. The optional "profile" key must be a bool
+      7. The optional "log_verbosity" key must be one of LOG_VERBOSITY in utils/get_logger.py
+      8. The optional "checkpoint_every" key must be None or an int > 0
+      9. The optional "resume_from" key must be None or the path of an existing checkpoint file
+      10. The optional "assignment" key must be either "greedy" or "batch"
+      11. The optional "journey_stats" key must be a bool and "journey_stats_floor_band" an int > 0
+      12. The optional "result_cache" key must be a bool
+      13. The optional "output_format" key must be one of OUTPUT_FORMATS in config_options.py, "parquet"
+          needs pyarrow. The optional "telemetry" key must be a bool, telemetry needs the "parquet" output_format
+      14. The optional "telemetry_buffer" key must be a bool, not set together with "telemetry", and
+          "telemetry_buffer_max_runs" None or an int > 0
+      15. The optional "parking" key must be one of PARKING_STRATEGIES in config_options.py,
+          "parking_window" and "parking_replan_every" ints > 0
+      16. The optional "zoning" key must be one of ZONING_MODES in config_options.py,
+          "zoning_window" and "zoning_replan_every" ints > 0
+
+    Every invalid passenger request is reported in the error, not only the first one.
 
     :param sim_config: simulation run configuration
     """
@@ -47,58 +82,296 @@ def validate_config(sim_config: Dict[str, Any]) -> None:
 
     min_floor = min(all_floors)
     max_floor = max(all_floors)
-    expected_floors = set(range(min_floor, max_floor + 1))
-    if all_floors != expected_floors:
+    # Distinct floors are continuous exactly when there are as many as floors in the range
+    if len(all_floors) != max_floor - min_floor + 1:
+        expected_floors = set(range(min_floor, max_floor + 1))
         missing = expected_floors - all_floors
         extra = all_floors - expected_floors
         msg = f"Default zone mapping floors are not continuous. Missing: {missing}, Extra: {extra}"
         raise ValueError(msg)
 
-    if "passenger_requests" not in sim_config:
-        raise ValueError("Missing passenger_requests in config")
-    pr_list = sim_config["passenger_requests"]
-    if not isinstance(pr_list, list):
-        raise ValueError("passenger_requests must be a list")
-
-    seen_ids = set()
-    for idx, req in enumerate(pr_list):
-        # Check that each request is a tuple (or set, but we expect tuple per sample)
-        if not isinstance(req, tuple):
-            raise ValueError(f"Passenger request at index {idx} is not a tuple")
-        if len(req) != 4:
-            raise ValueError(
-                f"Passenger request at index {idx} must have exactly 4 elements"
-            )
-        time, pid, source, dest = req
+    requests_path = sim_config.get("passenger_requests_path")
+    if requests_path is not None:
+        # Requests in a file are validated one by one as the simulation streams them
+        if not isinstance(requests_path, (str, os.PathLike)):
+            raise ValueError("passenger_requests_path must be a path")
+        if not os.path.isfile(requests_path):
+            raise ValueError(f"Passenger request file {requests_path} does not exist")
+    else:
+        if "passenger_requests" not in sim_config:
+            raise ValueError("Missing passenger_requests in config")
+        pr_list = sim_config["passenger_requests"]
+        if not isinstance(pr_list, list):
+            raise ValueError("passenger_requests must be a list")
 
-        if not isinstance(time, int) or time < 0:
-            raise ValueError(
-                f"Passenger request {pid}: time must be a non negative integer"
-            )
-        if not isinstance(pid, str):
-            raise ValueError(
-                f"Passenger request at index {idx}: passenger id must be a string"
-            )
-        if pid in seen_ids:
-            raise ValueError(f"Duplicate passenger id found: {pid}")
-        seen_ids.add(pid)
-
-        if not isinstance(source, int) or source < 0:
-            raise ValueError(f"Passenger {pid}: source must be a non-negative integer")
-        if source not in all_floors:
-            raise ValueError(
-                f"Passenger {pid}: source floor {source} is not defined in default_zone_mapping"
-            )
-
-        if not isinstance(dest, int):
-            raise ValueError(f"Passenger {pid}: destination must be an integer")
-        if dest not in all_floors:
-            raise ValueError(
-                f"Passenger {pid}: destination floor {dest} is not defined in default_zone_mapping"
-            )
+        errors = find_request_errors(pr_list, min_floor, max_floor)
+        if errors:
+            raise ValueError(format_request_errors(errors))
 
     if "max_time" not in sim_config:
         raise ValueError("Missing max_time in configuration")
     max_time = sim_config["max_time"]
     if not isinstance(max_time, int):
         raise ValueError("max_time must be an integer")
+
+    time_advance = sim_config.get("time_advance", "tick")
+    if time_advance not in ("tick", "event"):
+        raise ValueError("time_advance must be either 'tick' or 'event'")
+
+    traffic = sim_config.get("traffic")
+    if traffic is not None:
+        if not isinstance(traffic, dict):
+            raise ValueError("traffic must be a dict")
+        if traffic.get("pattern") not in TRAFFIC_PATTERNS:
+            raise ValueError(f"traffic pattern must be one of {list(TRAFFIC_PATTERNS)}")
+        rate = traffic.get("rate")
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError("traffic rate must be a number greater than 0")
+        if not isinstance(traffic.get("seed"), int):
+            raise ValueError("traffic seed must be an integer")
+        for key in ("duration", "count"):
+            value = traffic.get(key)
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                raise ValueError(f"traffic {key} must be a positive integer")
+        if traffic.get("duration") is None and traffic.get("count") is None:
+            raise ValueError("traffic needs a duration or a count")
+
+    if not isinstance(sim_config.get("profile", False), bool):
+        raise ValueError("profile must be a bool")
+
+    if sim_config.get("log_verbosity", "trace") not in LOG_VERBOSITY:
+        raise ValueError(f"log_verbosity must be one of {list(LOG_VERBOSITY)}")
+
+    checkpoint_every = sim_config.get("checkpoint_every")
+    if checkpoint_every is not None and (
+        not isinstance(checkpoint_every, int) or checkpoint_every <= 0
+    ):
+        raise ValueError("checkpoint_every must be a positive integer")
+
+    if not isinstance(sim_config.get("journey_stats", False), bool):
+        raise ValueError("journey_stats must be a bool")
+    floor_band = sim_config.get("journey_stats_floor_band", 10)
+    if not isinstance(floor_band, int) or floor_band <= 0:
+        raise ValueError("journey_stats_floor_band must be a positive integer")
+
+    if not isinstance(sim_config.get("result_cache", False), bool):
+        raise ValueError("result_cache must be a bool")
+
+    output_format = sim_config.get("output_format", "csv")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {list(OUTPUT_FORMATS)}")
+    if output_format == "parquet":
+        # Only Parquet runs pay for importing pyarrow
+        from utils.columnar_output import require_pyarrow
+
+        require_pyarrow()
+    telemetry = sim_config.get("telemetry", False)
+    if not isinstance(telemetry, bool):
+        raise ValueError("telemetry must be a bool")
+    if telemetry and output_format != "parquet":
+        raise ValueError("telemetry needs output_format 'parquet'")
+    telemetry_buffer = sim_config.get("telemetry_buffer", False)
+    if not isinstance(telemetry_buffer, bool):
+        raise ValueError("telemetry_buffer must be a bool")
+    if telemetry_buffer and telemetry:
+        raise ValueError("telemetry and telemetry_buffer cannot be set together")
+    max_runs = sim_config.get("telemetry_buffer_max_runs")
+    if max_runs is not None and (not isinstance(max_runs, int) or max_runs <= 0):
+        raise ValueError("telemetry_buffer_max_runs must be a positive integer")
+
+    if sim_config.get("parking", "home") not in PARKING_STRATEGIES:
+        raise ValueError(f"parking must be one of {list(PARKING_STRATEGIES)}")
+    for key in ("parking_window", "parking_replan_every"):
+        value = sim_config.get(key, 1)
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{key} must be a positive integer")
+
+    if sim_config.get("zoning", "static") not in ZONING_MODES:
+        raise ValueError(f"zoning must be one of {list(ZONING_MODES)}")
+    for key in ("zoning_window", "zoning_replan_every"):
+        value = sim_config.get(key, 1)
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{key} must be a positive integer")
+
+    if sim_config.get("assignment", "greedy") not in ("greedy", "batch"):
+        raise ValueError("assignment must be either 'greedy' or 'batch'")
+
+    resume_from = sim_config.get("resume_from")
+    if resume_from is not None and not os.path.isfile(resume_from):
+        raise ValueError(f"Checkpoint file {resume_from} does not exist")
+
+
+def validate_request(
+    req: Any,
+    idx: int,
+    all_floors: Optional[Container[int]],
+    seen_ids: Optional[Set[str]] = None,
+) -> None:
+    """
+    Validation for a single passenger request, see validate_config item 2
+
+    :param req: The request, (time, passenger_id, source, destination)
+    :param idx: Position of the request, used in error messages
+    :param all_floors: Floors under default_zone_mapping, None skips the floor checks
+    :param seen_ids: Passenger ids of the requests validated so far, the id of this request is added
+    """
+    # Check that each request is a tuple (or set, but we expect tuple per sample)
+    if not isinstance(req, tuple):
+        raise ValueError(f"Passenger request at index {idx} is not a tuple")
+    if len(req) != 4:
+        raise ValueError(
+            f"Passenger request at index {idx} must have exactly 4 elements"
+        )
+    time, pid, source, dest = req
+
+    if not isinstance(time, int) or time < 0:
+        raise ValueError(
+            f"Passenger request {pid}: time must be a non negative integer"
+        )
+    if not isinstance(pid, str):
+        raise ValueError(
+            f"Passenger request at index {idx}: passenger id must be a string"
+        )
+    if seen_ids is not None:
+        if pid in seen_ids:
+            raise ValueError(f"Duplicate passenger id found: {pid}")
+        seen_ids.add(pid)
+
+    if not isinstance(source, int) or source < 0:
+        raise ValueError(f"Passenger {pid}: source must be a non-negative integer")
+    if all_floors is not None and source not in all_floors:
+        raise ValueError(
+            f"Passenger {pid}: source floor {source} is not defined in default_zone_mapping"
+        )
+
+    if not isinstance(dest, int):
+        raise ValueError(f"Passenger {pid}: destination must be an integer")
+    if all_floors is not None and dest not in all_floors:
+        raise ValueError(
+            f"Passenger {pid}: destination floor {dest} is not defined in default_zone_mapping"
+        )
+
+
+# Number of invalid requests listed in the validate_config error, the rest are counted
+MAX_REPORTED_REQUEST_ERRORS = 20
+
+
+def format_request_errors(errors: List[Tuple[int, str]]) -> str:
+    """
+    Error message listing the invalid requests found by find_request_errors
+    """
+    if len(errors) == 1:
+        return errors[0][1]
+    lines = [f"{len(errors)} invalid passenger requests:"]
+    lines.extend(msg for _, msg in errors[:MAX_REPORTED_REQUEST_ERRORS])
+    if len(errors) > MAX_REPORTED_REQUEST_ERRORS:
+        lines.append(f"... and {len(errors) - MAX_REPORTED_REQUEST_ERRORS} more")
+    return "\n".join(lines)
+
+
+def find_request_errors(
+    requests: Sequence[Any], min_floor: int, max_floor: int
+) -> List[Tuple[int, str]]:
+    """
+    Check every passenger request against validate_config item 2 and return all the problems found
+
+    The floors of default_zone_mapping must already be known to be continuous, so a floor is valid
+    when it lies within [min_floor, max_floor]. With numpy the checks run in vectorized passes over
+    the request columns, without it every request goes through validate_request.
+
+    :param requests: Passenger requests, (time, passenger_id, source, destination)
+    :param min_floor: Lowest floor under default_zone_mapping
+    :param max_floor: Highest floor under default_zone_mapping
+    :return: (index, message) of every invalid request, sorted by index
+    """
+    if np is None:
+        return _request_errors_by_row(requests, range(min_floor, max_floor + 1))
+    return _request_errors_vectorized(requests, min_floor, max_floor)
+
+
+def _request_errors_by_row(
+    requests: Sequence[Any], floors: range
+) -> List[Tuple[int, str]]:
+    errors: List[Tuple[int, str]] = []
+    seen_ids: Set[str] = set()
+    for idx, req in enumerate(requests):
+        try:
+            validate_request(req, idx, floors, seen_ids)
+        except ValueError as e:
+            errors.append((idx, str(e)))
+    return errors
+
+
+def _column(requests: Sequence[tuple], idx: int, value_type: type) -> Optional[list]:
+    """
+    Field idx of every request, None if any value is not exactly of value_type
+    """
+    column = list(map(itemgetter(idx), requests))
+    if set(map(type, column)) - {value_type}:
+        return None
+    return column
+
+
+def _request_errors_vectorized(
+    requests: Sequence[Any], min_floor: int, max_floor: int
+) -> List[Tuple[int, str]]:
+    errors: List[Tuple[int, str]] = []
+    if not requests:
+        return errors
+    if set(map(type, requests)) != {tuple} or set(map(len, requests)) != {4}:
+        # Malformed rows are rare, such request lists are checked row by row
+        return _request_errors_by_row(requests, range(min_floor, max_floor + 1))
+
+    times = _column(requests, 0, int)
+    pids = _column(requests, 1, str)
+    sources = _column(requests, 2, int)
+    dests = _column(requests, 3, int)
+    if times is None or pids is None or sources is None or dests is None:
+        # Same for values of the wrong type
+        return _request_errors_by_row(requests, range(min_floor, max_floor + 1))
+    try:
+        time_col, source_col, dest_col = (
+            np.fromiter(column, dtype=np.int64, count=len(column))
+            for column in (times, sources, dests)
+        )
+    except OverflowError:
+        return _request_errors_by_row(requests, range(min_floor, max_floor + 1))
+    pid_col = np.array(pids)
+    # Only the first problem of a request is reported, checked in the order of validate_request
+    reported = np.zeros(len(requests), dtype=bool)
+
+    def report(mask, message) -> None:
+        new = mask & ~reported
+        reported[new] = True
+        errors.extend((i, message(i)) for i in np.flatnonzero(new).tolist())
+
+    bad_time = time_col < 0
+    report(
+        bad_time,
+        lambda i: f"Passenger request {pids[i]}: time must be a non negative integer",
+    )
+
+    # validate_request only records the id of a request with a valid time, every later
+    # occurrence of such an id is a duplicate
+    valid = np.flatnonzero(~bad_time)
+    order = valid[np.argsort(pid_col[valid], kind="stable")]
+    sorted_ids = pid_col[order]
+    duplicate = np.zeros(len(requests), dtype=bool)
+    duplicate[order[1:][sorted_ids[1:] == sorted_ids[:-1]]] = True
+    report(duplicate, lambda i: f"Duplicate passenger id found: {pids[i]}")
+
+    report(
+        source_col < 0,
+        lambda i: f"Passenger {pids[i]}: source must be a non-negative integer",
+    )
+    report(
+        (source_col < min_floor) | (source_col > max_floor),
+        lambda i: f"Passenger {pids[i]}: source floor {sources[i]} is not defined in default_zone_mapping",
+    )
+    report(
+        (dest_col < min_floor) | (dest_col > max_floor),
+        lambda i: f"Passenger {pids[i]}: destination floor {dests[i]} is not defined in default_zone_mapping",
+    )
+
+    errors.sort(key=lambda error: error[0])
+    return errors